@@ -0,0 +1,204 @@
+"""Micro-benchmarks of every registered strategy across deck sizes.
+
+Run the suite and store a baseline, then compare a later run against it:
+
+    python benchmarks/strategies.py run --output baseline.json
+    python benchmarks/strategies.py run --compare baseline.json
+
+Each result is the best per-call time in seconds over the repeats.
+"""
+
+import argparse
+import json
+import math
+import platform
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from itertools import cycle
+from pathlib import Path
+from typing import Any
+
+from hifz.learning_strategies import STRATEGY_NAME_TO_CLASS, CardStrategy
+from hifz.models import Card
+from hifz.utils import CardSession
+
+DECK_SIZES = [10, 100, 1_000, 10_000, 100_000, 1_000_000]
+LARGE_DECK = 100_000
+
+
+def per_call(run: Callable[[], object], calls: int, repeat: int) -> float:
+    """Returns the best mean seconds per call of run over repeat rounds of calls."""
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(calls):
+            run()
+        best = min(best, (time.perf_counter() - start) / calls)
+    return best
+
+
+def bench_strategy(
+    name: str, size: int, calls: int, repeat: int, directory: Path
+) -> dict[str, float]:
+    """Times every operation for the strategy name on a synthetic deck of size cards."""
+    cards = [Card(f"Front{i}", f"Back{i}") for i in range(size)]
+    strategy: CardStrategy = STRATEGY_NAME_TO_CLASS[name]()
+    session = CardSession(cards, strategy)
+
+    answers = []
+    for correct in (True, False):
+        feedback = strategy.create_feedback()
+        feedback.data["correct"] = correct
+        answers.append(feedback)
+    feedbacks = cycle(answers)
+    targets = cycle(cards[:: max(size // calls, 1)])
+
+    timings = {
+        "get_next_card": per_call(lambda: strategy.get_next_card(cards), calls, repeat),
+        "process_feedback": per_call(
+            lambda: strategy.process_feedback(next(targets), next(feedbacks)),
+            calls,
+            repeat,
+        ),
+        "aggregate_statistics": per_call(
+            lambda: strategy.aggregate_statistics(cards), calls, repeat
+        ),
+    }
+
+    file_path = directory / f"{name}-{size}.json"
+    whole_deck_repeat = 1 if size >= LARGE_DECK else repeat
+    timings["save_progress"] = per_call(
+        lambda: session.save_progress(file_path), 1, whole_deck_repeat
+    )
+    timings["load_progress"] = per_call(
+        lambda: CardSession.load_progress(file_path), 1, whole_deck_repeat
+    )
+    return timings
+
+
+def run(args: argparse.Namespace) -> int:
+    """Runs the benchmarks, then stores and compares the results as asked."""
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            for name in args.strategies:
+                timings = bench_strategy(
+                    name, size, args.calls, args.repeat, Path(directory)
+                )
+                for operation, seconds in timings.items():
+                    results.append(
+                        {
+                            "strategy": name,
+                            "size": size,
+                            "operation": operation,
+                            "seconds": seconds,
+                        }
+                    )
+                    line = (
+                        f"{name:<20} {size:>9} {operation:<22} {seconds * 1e6:>14.2f}us"
+                    )
+                    print(line)  # noqa: T201
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        return compare_reports(baseline, report, args.tolerance)
+    return 0
+
+
+def compare_reports(
+    baseline: dict[str, Any], current: dict[str, Any], tolerance: float
+) -> int:
+    """Prints how current compares to baseline.
+
+    Returns:
+        int: 1 if any operation got slower than the tolerance allows, else 0.
+    """
+    expected = {
+        (result["strategy"], result["size"], result["operation"]): result["seconds"]
+        for result in baseline["results"]
+    }
+    regressions = 0
+    for result in current["results"]:
+        key = (result["strategy"], result["size"], result["operation"])
+        if key not in expected:
+            continue
+        ratio = result["seconds"] / expected[key]
+        flag = ""
+        if ratio > 1 + tolerance:
+            flag = "REGRESSION"
+            regressions += 1
+        elif ratio < 1 / (1 + tolerance):
+            flag = "improved"
+        name, size, operation = key
+        print(f"{name:<20} {size:>9} {operation:<22} {ratio:>8.2f}x {flag}")  # noqa: T201
+    print(f"{regressions} regression(s) beyond {tolerance:.0%}.")  # noqa: T201
+    return 1 if regressions else 0
+
+
+def compare(args: argparse.Namespace) -> int:
+    """Compares two stored reports."""
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    current = json.loads(args.current.read_text(encoding="utf-8"))
+    return compare_reports(baseline, current, args.tolerance)
+
+
+def get_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Returns the parsed arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    tolerance = argparse.ArgumentParser(add_help=False)
+    tolerance.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Relative slowdown beyond which an operation is flagged.",
+    )
+
+    run_parser = commands.add_parser(
+        "run", parents=[tolerance], help="Run the benchmarks."
+    )
+    run_parser.add_argument(
+        "--sizes", type=int, nargs="+", default=DECK_SIZES, help="Deck sizes."
+    )
+    run_parser.add_argument(
+        "--strategies",
+        nargs="+",
+        choices=list(STRATEGY_NAME_TO_CLASS),
+        default=list(STRATEGY_NAME_TO_CLASS),
+        help="Strategies to benchmark.",
+    )
+    run_parser.add_argument(
+        "--calls", type=int, default=1000, help="Calls per timed round."
+    )
+    run_parser.add_argument(
+        "--repeat", type=int, default=3, help="Timed rounds per operation."
+    )
+    run_parser.add_argument("--output", type=Path, help="Where to store the results.")
+    run_parser.add_argument(
+        "--compare", type=Path, help="A stored baseline to compare the results to."
+    )
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = commands.add_parser(
+        "compare", parents=[tolerance], help="Compare two stored results."
+    )
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    compare_parser.set_defaults(handler=compare)
+
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    arguments = get_args()
+    sys.exit(arguments.handler(arguments))
@@ -12,6 +12,13 @@ def tests(session: nox.Session) -> None:
     session.run("pytest", *session.posargs)
 
 
+@nox.session
+def benchmarks(session: nox.Session) -> None:
+    """Run the strategy benchmarks. Pass arguments after --, e.g. -- run --output baseline.json."""
+    session.install(".")
+    session.run("python", "benchmarks/strategies.py", *(session.posargs or ["run"]))
+
+
 @nox.session(reuse_venv=True)
 def docs(session: nox.Session) -> None:
     """Build API docs and the main docs. Pass --non-interactive to avoid serving. First positional argument is the target directory."""
@@ -1,64 +1,224 @@
 """This represents the application entrypoint."""
 
 import argparse
+import contextlib
+import locale
+import sys
+from collections.abc import Iterable
+from datetime import timedelta
 from pathlib import Path
 
+from hifz.binary_deck import write_binary_deck
 from hifz.card_engine import CardEngine
+from hifz.dataserver import DataServer
+from hifz.deck_cache import DeckCache
 from hifz.learning_strategies import (
+    COLLATION_KEYS,
     STRATEGY_NAME_TO_CLASS,
+    AlphabeticalStrategy,
     CardStrategy,
 )
+from hifz.models import Card
+from hifz.session_store import is_sqlite_session
 from hifz.visualizers import Visualizer
 from hifz.visualizers.cli import CLIVisualizer
 
 
-def get_args() -> argparse.Namespace:
+def get_args(argv: list[str] | None = None) -> argparse.Namespace:
     """Returns the parsed arguments."""
     parser = argparse.ArgumentParser(description="A flashcard memorization program.")
-
-    parser.add_argument(
-        "visualizer",
-        choices=["cli", "gui", "tui"],
-        help="The type of visualizer to use.",
+    commands = parser.add_subparsers(
+        dest="command",
+        required=True,
+        help="The type of visualizer to use, or replay to apply a review log.",
     )
-    parser.add_argument(
+
+    session_parser = argparse.ArgumentParser(add_help=False)
+    session_parser.add_argument(
         "strategy",
         choices=list(STRATEGY_NAME_TO_CLASS.keys()),
         help=f"The card memorization strategy to use. Options: {', '.join(STRATEGY_NAME_TO_CLASS.keys())}.",
     )
-    parser.add_argument(
-        "--save",
-        type=Path,
-        help="Optional: Path to save progress after the session ends.",
+    session_parser.add_argument(
+        "--collation",
+        choices=list(COLLATION_KEYS),
+        help=f"Optional: How the alphabetical strategy orders the fronts. Options: {', '.join(COLLATION_KEYS)}. The locale collation follows LC_ALL, LC_COLLATE or LANG.",
     )
-    parser.add_argument(
+    session_parser.add_argument(
         "--reverse",
         action="store_true",
-        help="Optional: Path to save progress after the session ends.",
+        help="Optional: Swap the front and the back of the cards.",
+    )
+    session_parser.add_argument(
+        "--columnar",
+        action="store_true",
+        help="Optional: Keep card statistics in a NumPy-backed columnar store.",
+    )
+    session_parser.add_argument(
+        "--intern-text",
+        action="store_true",
+        help="Optional: Keep card text in a deduplicated UTF-8 arena.",
+    )
+    session_parser.add_argument(
+        "--no-deck-cache",
+        action="store_true",
+        help="Optional: Parse the decks on every load instead of caching them.",
+    )
+    session_parser.add_argument(
+        "--deck-cache-size",
+        type=int,
+        default=512,
+        help="Optional: The size in MiB the cached decks on disk are kept under.",
+    )
+    session_parser.add_argument(
+        "--source-timeout",
+        type=float,
+        help="Optional: Seconds after which a source that is still loading fails.",
+    )
+    session_parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=1,
+        help="Optional: Parse CSV, TSV and NDJSON decks across this many processes.",
     )
 
-    group = parser.add_mutually_exclusive_group(required=True)
+    group = session_parser.add_mutually_exclusive_group(required=True)
     group.add_argument(
         "--source",
         type=str,
-        help="The source of the desired card collection, either a URL or a file path (e.g., .csv or .json).",
+        nargs="+",
+        help="The sources of the desired card collection, each either a URL or a file path (e.g., .csv or .json).",
     )
     group.add_argument(
         "--resume",
+        type=Path,
+        help="Path to a saved session file to resume progress, replaying the reviews in its journal.",
+    )
+
+    for visualizer in ["cli", "gui", "tui"]:
+        visualizer_parser = commands.add_parser(
+            visualizer,
+            parents=[session_parser],
+            help=f"Run a session in the {visualizer} visualizer.",
+        )
+        visualizer_parser.add_argument(
+            "--save",
+            type=Path,
+            help="Optional: Path to save progress to, compressed if it ends in .gz or .xz. Each review is saved as it happens, to a journal next to a JSON session or to the rows of a .sqlite, .sqlite3 or .db session.",
+        )
+        visualizer_parser.add_argument(
+            "--lookahead",
+            type=int,
+            default=0,
+            help="Optional: Number of upcoming cards to precompute in the background. Disabled by default.",
+        )
+        visualizer_parser.set_defaults(visualizer=visualizer)
+
+    replay_parser = commands.add_parser(
+        "replay",
+        parents=[session_parser],
+        help="Apply a review log to a session without a visualizer.",
+    )
+    replay_parser.add_argument(
+        "log",
+        type=Path,
+        help="Path to a newline-delimited JSON review log.",
+    )
+    replay_parser.add_argument(
+        "--save",
+        type=Path,
+        required=True,
+        help="Path to save progress after the log is applied.",
+    )
+
+    convert_parser = commands.add_parser(
+        "convert",
+        help="Convert a deck to the memory-mapped .hifzb format.",
+    )
+    convert_parser.add_argument(
+        "source",
         type=str,
-        help="Path to a saved session file to resume progress.",
+        help="The source of the card collection, either a URL or a file path (e.g., .csv or .json).",
+    )
+    convert_parser.add_argument(
+        "output", type=Path, help="Path of the .hifzb file to write."
+    )
+    convert_parser.add_argument(
+        "--reverse",
+        action="store_true",
+        help="Optional: Swap the front and the back of the cards.",
+    )
+    convert_parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=1,
+        help="Optional: Parse CSV, TSV and NDJSON decks across this many processes.",
     )
 
-    return parser.parse_args()
+    simulate_parser = commands.add_parser(
+        "simulate",
+        help="Compare strategies on synthetic learners.",
+    )
+    simulate_parser.add_argument(
+        "strategies",
+        nargs="+",
+        choices=list(STRATEGY_NAME_TO_CLASS.keys()),
+        help="The card memorization strategies to simulate.",
+    )
+    simulate_parser.add_argument(
+        "--learners", type=int, default=100, help="Number of synthetic learners."
+    )
+    simulate_parser.add_argument(
+        "--deck-size", type=int, default=100, help="Number of cards per learner."
+    )
+    simulate_parser.add_argument(
+        "--reviews", type=int, default=500, help="Number of reviews per learner."
+    )
+    simulate_parser.add_argument(
+        "--review-gap",
+        type=float,
+        default=10.0,
+        help="Synthetic minutes between two reviews.",
+    )
+    simulate_parser.add_argument(
+        "--stability",
+        type=float,
+        default=1.0,
+        help="Days until a newly learned card is recalled with probability 1/e.",
+    )
+    simulate_parser.add_argument(
+        "--growth",
+        type=float,
+        default=2.5,
+        help="Factor by which a correct answer stretches the memory of a card.",
+    )
+    simulate_parser.add_argument(
+        "--seed", type=int, default=0, help="Seed making the run reproducible."
+    )
+    simulate_parser.add_argument(
+        "--workers",
+        type=int,
+        help="Optional: Number of processes. Defaults to the number of CPUs. 1 runs the learners in this process.",
+    )
+
+    args = parser.parse_args(argv)
+    if getattr(args, "collation", None) and args.strategy != "alphabetical":
+        parser.error("--collation only applies to the alphabetical strategy.")
+    return args
 
 
-def get_strategy(strategy_name: str) -> CardStrategy:
-    """Returns the desired strategy."""
+def get_strategy(strategy_name: str, collation: str | None = None) -> CardStrategy:
+    """Returns the desired strategy, ordering fronts by collation if it is alphabetical."""
     strategy_cls = STRATEGY_NAME_TO_CLASS.get(strategy_name)
     if not strategy_cls:
         error_message = f"{strategy_name} is not a valid strategy. Supported strategies: {', '.join(STRATEGY_NAME_TO_CLASS.keys())}."
         raise ValueError(error_message)
-    return strategy_cls()
+    if collation is None:
+        return strategy_cls()
+    if strategy_cls is not AlphabeticalStrategy:
+        error_message = f"--collation only applies to the alphabetical strategy, not {strategy_name}."
+        raise ValueError(error_message)
+    return AlphabeticalStrategy(collation=collation)
 
 
 def get_visualizer(visualizer: str) -> Visualizer:
@@ -83,23 +243,111 @@ def get_visualizer(visualizer: str) -> Visualizer:
             raise ValueError(error_message)
 
 
-def main() -> None:
-    """The project entrypoint."""
-    args = get_args()
+def load_engine(args: argparse.Namespace) -> CardEngine:
+    """Returns an engine with the session described by the arguments."""
+    engine = CardEngine(
+        deck_cache=None
+        if args.no_deck_cache
+        else DeckCache(max_bytes=args.deck_cache_size << 20)
+    )
+    if args.resume:
+        engine.load_progress(
+            args.resume, columnar=args.columnar, intern_text=args.intern_text
+        )
+    else:
+        strategy = get_strategy(args.strategy, collation=args.collation)
+        loaded = engine.load_cards(
+            args.source,
+            strategy,
+            reverse=args.reverse,
+            columnar=args.columnar,
+            intern_text=args.intern_text,
+            parse_workers=args.parse_workers,
+            timeout=args.source_timeout,
+        )
+        if not loaded:
+            errors = "".join(
+                f"\n  {source}: {error}" for source, error in engine.load_errors.items()
+            )
+            sys.exit(f"Could not load the cards:{errors}")
+    return engine
 
-    strategy = get_strategy(args.strategy)
-    visualizer = get_visualizer(args.visualizer)
 
-    engine = CardEngine()
-    if args.resume:
-        engine.load_progress(args.resume)
+def replay(args: argparse.Namespace) -> None:
+    """Applies a review log to a session and saves the result."""
+    engine = load_engine(args)
+    applied = engine.replay_reviews(args.log)
+    engine.save_progress(args.save)
+    print(f"Applied {applied} reviews from {args.log}.")  # noqa: T201
+
+
+def convert(args: argparse.Namespace) -> None:
+    """Writes the deck at the source to a binary deck."""
+    data_server = DataServer()
+    cards: Iterable[Card]
+    if args.parse_workers > 1:
+        cards = data_server.read_cards(
+            args.source, reverse=args.reverse, workers=args.parse_workers
+        )
     else:
-        engine.load_cards(args.source, strategy, reverse=args.reverse)
+        cards = data_server.iter_cards(args.source, reverse=args.reverse)
+    written = write_binary_deck(cards, args.output)
+    print(f"Wrote {written} cards to {args.output}.")  # noqa: T201
+
+
+def simulate(args: argparse.Namespace) -> None:
+    """Runs synthetic learners through each strategy and prints the reports."""
+    from hifz.simulation import ForgettingModel, SimulationConfig, run_simulation
+
+    forgetting = ForgettingModel(initial_stability=args.stability, growth=args.growth)
+    for strategy in args.strategies:
+        config = SimulationConfig(
+            strategy=strategy,
+            learners=args.learners,
+            deck_size=args.deck_size,
+            reviews=args.reviews,
+            review_gap=timedelta(minutes=args.review_gap),
+            forgetting=forgetting,
+            seed=args.seed,
+        )
+        print(run_simulation(config, workers=args.workers))  # noqa: T201
 
-    visualizer.run_session(engine)
 
-    if args.save:
+def main() -> None:
+    """The project entrypoint."""
+    args = get_args()
+    # Lets the locale collation follow the environment instead of C.
+    with contextlib.suppress(locale.Error):
+        locale.setlocale(locale.LC_COLLATE, "")
+
+    if args.command == "replay":
+        replay(args)
+        return
+    if args.command == "convert":
+        convert(args)
+        return
+    if args.command == "simulate":
+        simulate(args)
+        return
+
+    visualizer = get_visualizer(args.visualizer)
+    engine = load_engine(args)
+    if args.save and is_sqlite_session(args.save):
+        # Binds the session to the store, which then saves every review.
         engine.save_progress(args.save)
+    elif args.save:
+        engine.start_journal(args.save)
+    if args.lookahead > 0:
+        engine.start_lookahead(args.lookahead)
+
+    try:
+        visualizer.run_session(engine)
+    finally:
+        engine.stop_lookahead()
+        # Folds the journal, unless a reload replaced the journaled session.
+        if args.save:
+            engine.save_progress(args.save)
+        engine.stop_journal()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,167 @@
+"""This module maintains deduplicated, arena-backed storage for card text."""
+
+from array import array
+from typing import Any
+
+from hifz.models import Card, FeedbackSummary
+
+
+class TextArena:
+    """Unique strings packed into one UTF-8 buffer.
+
+    Each distinct string is encoded once and appended to the buffer, and its
+    id indexes an offset array holding where it starts and ends. Strings are
+    deduplicated through an open-addressing table of ids kept in an array,
+    so memory grows with the unique text rather than with the number of
+    cards, at about 32 bytes of index per unique string.
+    """
+
+    EMPTY = -1
+
+    def __init__(self) -> None:
+        """Instantiates an empty arena."""
+        self._buffer = bytearray()
+        self._offsets = array("Q", [0])
+        self._hashes = array("q")
+        self._table = array("q", [self.EMPTY]) * 8
+
+    def __len__(self) -> int:
+        """Returns the number of unique strings stored."""
+        return len(self._hashes)
+
+    @property
+    def nbytes(self) -> int:
+        """Returns the size of the buffer, the offsets and the index in bytes."""
+        return len(self._buffer) + 8 * (
+            len(self._offsets) + len(self._hashes) + len(self._table)
+        )
+
+    @property
+    def buffer(self) -> bytes:
+        """The UTF-8 text of every string, back to back."""
+        return bytes(self._buffer)
+
+    @property
+    def offsets(self) -> "array[int]":
+        """Where each string starts in the buffer, followed by the end of the last."""
+        return self._offsets
+
+    def add(self, text: str) -> int:
+        """Stores text unless it is already stored.
+
+        Args:
+            text (str): The string to store.
+
+        Returns:
+            int: The id of the string in the arena.
+        """
+        key = hash(text)
+        encoded = text.encode("utf-8")
+        mask = len(self._table) - 1
+        slot = key & mask
+        while (text_id := self._table[slot]) != self.EMPTY:
+            if self._hashes[text_id] == key and self._slice(text_id) == encoded:
+                return text_id
+            slot = (slot + 1) & mask
+
+        text_id = len(self._hashes)
+        self._buffer += encoded
+        self._offsets.append(len(self._buffer))
+        self._hashes.append(key)
+        self._table[slot] = text_id
+        if 2 * len(self._hashes) > len(self._table):
+            self._grow()
+        return text_id
+
+    def _grow(self) -> None:
+        """Doubles the index table and reinserts every id."""
+        self._table = array("q", [self.EMPTY]) * (2 * len(self._table))
+        mask = len(self._table) - 1
+        for text_id, key in enumerate(self._hashes):
+            slot = key & mask
+            while self._table[slot] != self.EMPTY:
+                slot = (slot + 1) & mask
+            self._table[slot] = text_id
+
+    def _slice(self, text_id: int) -> bytes:
+        """Returns the UTF-8 bytes of the string with id text_id."""
+        return bytes(self._buffer[self._offsets[text_id] : self._offsets[text_id + 1]])
+
+    def get(self, text_id: int) -> str:
+        """Decodes the string with id text_id."""
+        return self._buffer[self._offsets[text_id] : self._offsets[text_id + 1]].decode(
+            "utf-8"
+        )
+
+    def card(self, front: str, back: str) -> "ArenaCard":
+        """Returns a card whose text is stored in the arena."""
+        return ArenaCard(self, self.add(front), self.add(back))
+
+
+class ArenaCard(Card):
+    """A card that references its text in a TextArena.
+
+    The ids of the front and back share one packed integer, and the text is
+    decoded from the arena each time it is read.
+    Arena cards compare equal to plain cards with the same text and
+    statistics, and pickle as plain cards.
+    """
+
+    __slots__ = ("_arena", "_ids")
+
+    ID_BITS = 32
+
+    def __init__(
+        self,
+        arena: TextArena,
+        front_id: int,
+        back_id: int,
+        statistics: FeedbackSummary | None = None,
+    ) -> None:
+        """Instantiates a card from the ids of its text.
+
+        Args:
+            arena (TextArena): The arena holding the text.
+            front_id (int): The id of the front text.
+            back_id (int): The id of the back text.
+            statistics (FeedbackSummary | None): The statistics of the card.
+        """
+        self._arena = arena
+        self._ids = front_id << self.ID_BITS | back_id
+        self.statistics = FeedbackSummary() if statistics is None else statistics
+
+    @property
+    def front(self) -> str:
+        """The front of the card."""
+        return self._arena.get(self._ids >> self.ID_BITS)
+
+    @front.setter
+    def front(self, value: str) -> None:
+        back_id = self._ids & ((1 << self.ID_BITS) - 1)
+        self._ids = self._arena.add(value) << self.ID_BITS | back_id
+
+    @property
+    def back(self) -> str:
+        """The back of the card."""
+        return self._arena.get(self._ids & ((1 << self.ID_BITS) - 1))
+
+    @back.setter
+    def back(self, value: str) -> None:
+        front_id = self._ids >> self.ID_BITS
+        self._ids = front_id << self.ID_BITS | self._arena.add(value)
+
+    def __eq__(self, other: object) -> bool:
+        """Compares the text and statistics with any card."""
+        if not isinstance(other, Card):
+            return NotImplemented
+        return (self.front, self.back, self.statistics) == (
+            other.front,
+            other.back,
+            other.statistics,
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Pickles the card as a plain Card, leaving the arena behind."""
+        return Card, (self.front, self.back, self.statistics)
@@ -0,0 +1,132 @@
+"""This module saves sessions in the background as they are reviewed."""
+
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from hifz.utils import write_progress
+
+SAVE_EVERY = 50
+SAVE_INTERVAL = 30.0
+
+
+class Autosaver:
+    """Saves a session on a background thread once it has unsaved reviews.
+
+    A save starts once every reviews are unsaved, or interval seconds after
+    the first unsaved review, whichever comes first. The thread copies the
+    session state through copy_state, then writes the copy to a temporary
+    file that replaces file_path, so the thread recording reviews never
+    waits for the disk. After a save fails, the next attempt waits another
+    interval.
+    """
+
+    def __init__(
+        self,
+        file_path: Path,
+        copy_state: Callable[[], dict[str, Any]],
+        every: int = SAVE_EVERY,
+        interval: float = SAVE_INTERVAL,
+    ) -> None:
+        """Starts the autosave thread.
+
+        Args:
+            file_path (Path): Where to save the session.
+            copy_state (Callable[[], dict[str, Any]]): Returns a consistent copy
+                of the session state, as CardSession.progress_data does.
+            every (int): The number of unsaved reviews that starts a save.
+            interval (float): Seconds after the first unsaved review that a
+                save starts.
+        """
+        if every < 1 or interval <= 0:
+            msg = f"Autosave needs a positive count and interval, got {every} and {interval}."
+            raise ValueError(msg)
+        self.file_path = file_path
+        self.every = every
+        self.interval = interval
+        self.saves = 0
+        self._copy_state = copy_state
+        self._unsaved = 0
+        self._unsaved_since = 0.0
+        self._retry_at = 0.0
+        self._stopping = False
+        self._error: Exception | None = None
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._run, name="hifz-autosave", daemon=True
+        )
+        self._thread.start()
+
+    def record(self, reviews: int = 1) -> None:
+        """Counts reviews that were applied to the session.
+
+        Args:
+            reviews (int): The number of reviews applied.
+        """
+        with self._condition:
+            if not self._unsaved:
+                self._unsaved_since = time.monotonic()
+            self._unsaved += reviews
+            self._condition.notify()
+
+    def stop(self) -> None:
+        """Saves the unsaved reviews and stops the thread.
+
+        Raises:
+            Exception: The error of the last save that failed, if any.
+        """
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def _run(self) -> None:
+        """Waits for unsaved reviews to come due and saves them."""
+        while True:
+            with self._condition:
+                while not self._stopping and not self._due():
+                    self._condition.wait(self._timeout())
+                if not self._unsaved:
+                    return
+                stopping = self._stopping
+                saving, self._unsaved = self._unsaved, 0
+            try:
+                write_progress(self._copy_state(), self.file_path)
+            except Exception as err:
+                # Retries the reviews after another interval, or reports them on stop.
+                self._error = err
+                with self._condition:
+                    self._retry_at = time.monotonic() + self.interval
+                self.record(saving)
+            else:
+                self._error = None
+                self._retry_at = 0.0
+                self.saves += 1
+            if stopping:
+                return
+
+    def _due(self) -> bool:
+        """Returns whether the unsaved reviews should be saved, with the lock held."""
+        now = time.monotonic()
+        return (
+            bool(self._unsaved)
+            and now >= self._retry_at
+            and (
+                self._unsaved >= self.every
+                or now - self._unsaved_since >= self.interval
+            )
+        )
+
+    def _timeout(self) -> float | None:
+        """Returns how long to wait for the next save, with the lock held."""
+        if not self._unsaved:
+            return None
+        if self._unsaved >= self.every:
+            due = self._retry_at
+        else:
+            due = max(self._unsaved_since + self.interval, self._retry_at)
+        return max(0.0, due - time.monotonic())
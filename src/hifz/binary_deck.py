@@ -0,0 +1,206 @@
+"""This module reads and writes the memory-mapped binary deck format (.hifzb).
+
+A .hifzb file holds, in order and little-endian:
+
+- a header: the magic bytes, the format version, the number of cards and
+  the number of unique strings;
+- the card index: a pair of uint32 string ids (front, back) per card;
+- the string offsets: string_count + 1 uint64 offsets into the text;
+- the text: the unique strings, UTF-8 encoded and packed back to back.
+
+Sections start on 8-byte boundaries.
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Iterable
+from pathlib import Path
+
+from hifz.arena import ArenaCard, TextArena
+from hifz.models import Card
+from hifz.utils import paused_gc, replacing_file
+
+MAGIC = b"HIFZB\x00\x00\x00"
+VERSION = 1
+HEADER = struct.Struct("<8sIIQQ")
+OFFSET = struct.Struct("<Q")
+MAX_STRINGS = 2**32
+
+
+def _aligned(position: int) -> int:
+    """Rounds position up to the next multiple of 8."""
+    return (position + 7) & ~7
+
+
+def _little_endian(values: "array[int]") -> "array[int]":
+    """Returns values in little-endian byte order."""
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+
+def write_binary_deck(cards: Iterable[Card], file_path: Path) -> int:
+    """Writes cards to file_path in the .hifzb format.
+
+    The cards are consumed one at a time; only their unique strings and
+    eight bytes per card are held in memory until the file is written. The
+    file is replaced only once it is complete.
+
+    Args:
+        cards (Iterable[Card]): The cards to write. Statistics are not stored.
+        file_path (Path): The path of the file to write.
+
+    Returns:
+        int: The number of cards written.
+    """
+    ids = array("I")
+    index: dict[str, int] = {}
+    text = bytearray()
+    offsets = array("Q", [0])
+    for card in cards:
+        for side in (card.front, card.back):
+            text_id = index.get(side)
+            if text_id is None:
+                text_id = index[side] = len(index)
+                text += side.encode("utf-8")
+                offsets.append(len(text))
+            ids.append(text_id)
+    if len(index) > MAX_STRINGS:
+        msg = f"Too many unique strings for a binary deck: {len(index)}"
+        raise ValueError(msg)
+
+    card_count = len(ids) // 2
+    with replacing_file(file_path) as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, card_count, len(index)))
+        for section in (_little_endian(ids), _little_endian(offsets)):
+            f.write(bytes(_aligned(f.tell()) - f.tell()))
+            section.tofile(f)
+        f.write(bytes(_aligned(f.tell()) - f.tell()))
+        f.write(text)
+    return card_count
+
+
+class MappedTextArena(TextArena):
+    """The strings of a .hifzb file, read from a memory map.
+
+    The strings of the file are decoded only when read. Strings added later,
+    for instance by editing a card, are kept in memory after them.
+    """
+
+    def __init__(
+        self, mapping: mmap.mmap, offsets_start: int, text_start: int, count: int
+    ) -> None:
+        """Instantiates the arena over the string section of a mapped file.
+
+        Args:
+            mapping (mmap.mmap): The mapped file.
+            offsets_start (int): Where the string offsets start in the file.
+            text_start (int): Where the text starts in the file.
+            count (int): The number of strings in the file.
+        """
+        super().__init__()
+        self._mapping = mapping
+        self._offsets_start = offsets_start
+        self._text_start = text_start
+        self._count = count
+
+    def __len__(self) -> int:
+        """Returns the number of strings, mapped and added."""
+        return self._count + super().__len__()
+
+    def add(self, text: str) -> int:
+        """Stores text in memory after the mapped strings and returns its id."""
+        return self._count + super().add(text)
+
+    def get(self, text_id: int) -> str:
+        """Decodes the string with id text_id."""
+        if text_id >= self._count:
+            return super().get(text_id - self._count)
+        position = self._offsets_start + OFFSET.size * text_id
+        start = OFFSET.unpack_from(self._mapping, position)[0]
+        end = OFFSET.unpack_from(self._mapping, position + OFFSET.size)[0]
+        return str(
+            self._mapping[self._text_start + start : self._text_start + end], "utf-8"
+        )
+
+
+def open_binary_deck(file_path: Path) -> tuple[MappedTextArena, "array[int]"]:
+    """Maps the .hifzb file at file_path.
+
+    Args:
+        file_path (Path): The path of the binary deck.
+
+    Returns:
+        tuple[MappedTextArena, array[int]]: The strings of the deck, and the
+        front and back string ids of each card, interleaved.
+    """
+    with file_path.open("rb") as f:
+        if file_path.stat().st_size < HEADER.size:
+            msg = f"Not a hifz binary deck: {file_path}"
+            raise ValueError(msg)
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, _, card_count, string_count = HEADER.unpack_from(mapping, 0)
+    if magic != MAGIC:
+        msg = f"Not a hifz binary deck: {file_path}"
+        raise ValueError(msg)
+    if version != VERSION:
+        msg = f"Unsupported binary deck version {version} in {file_path}"
+        raise ValueError(msg)
+
+    ids_start = _aligned(HEADER.size)
+    offsets_start = _aligned(ids_start + 8 * card_count)
+    text_start = _aligned(offsets_start + OFFSET.size * (string_count + 1))
+    if (
+        len(mapping) < text_start
+        or len(mapping)
+        < text_start
+        + OFFSET.unpack_from(mapping, offsets_start + OFFSET.size * string_count)[0]
+    ):
+        msg = f"Truncated binary deck: {file_path}"
+        raise ValueError(msg)
+
+    ids = array("I")
+    ids.frombytes(mapping[ids_start : ids_start + 8 * card_count])
+    ids = _little_endian(ids)
+    return MappedTextArena(mapping, offsets_start, text_start, string_count), ids
+
+
+def binary_deck_cards(
+    arena: TextArena, ids: "array[int]", reverse: bool = False
+) -> list[Card]:
+    """Builds the cards of a mapped binary deck.
+
+    Args:
+        arena (TextArena): The strings of the deck.
+        ids (array[int]): The front and back string ids of each card, interleaved.
+        reverse (bool): Swap the front and the back of the cards.
+
+    Returns:
+        list[Card]: The cards, whose text is decoded from arena when read.
+    """
+    front, back = (1, 0) if reverse else (0, 1)
+    with paused_gc():
+        return [
+            ArenaCard(arena, ids[index + front], ids[index + back])
+            for index in range(0, len(ids), 2)
+        ]
+
+
+def read_binary_deck(file_path: Path, reverse: bool = False) -> list[Card]:
+    """Opens the .hifzb file at file_path.
+
+    The file is memory-mapped and its text is decoded only when a card's
+    front or back is read. The mapping stays open as long as a card does.
+
+    Args:
+        file_path (Path): The path of the binary deck.
+        reverse (bool): Swap the front and the back of the cards.
+
+    Returns:
+        list[Card]: The cards of the deck.
+    """
+    return binary_deck_cards(*open_binary_deck(file_path), reverse=reverse)
@@ -1,22 +1,156 @@
 """The card engine maintains the logic associated with user interaction and content production."""
 
-from dataclasses import dataclass
+import copy
+import threading
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import partial
+from itertools import batched
 from pathlib import Path
 from typing import Any
 
-from hifz.dataserver import DataServer
+from hifz.arena import TextArena
+from hifz.autosave import SAVE_EVERY, SAVE_INTERVAL, Autosaver
+from hifz.dataserver import DataServer, SourceLoadError
+from hifz.deck_cache import DeckCache
+from hifz.journal import (
+    SYNC_EVERY,
+    SYNC_INTERVAL,
+    ReviewJournal,
+    journal_path,
+    replay_journal,
+)
 from hifz.learning_strategies import CardStrategy
-from hifz.models import Card, Feedback
-from hifz.utils import CardSession
+from hifz.models import Card, Feedback, to_epoch_seconds
+from hifz.session_store import SQLiteSessionStore, is_sqlite_session
+from hifz.utils import CardSession, read_review_log, write_progress
+
+COMPACT_AFTER = 10_000
 
 
 @dataclass
 class CardEngine:
-    """This class is responsible for running the main Hifz program."""
+    """This class is responsible for running the main Hifz program.
+
+    With lookahead started, every strategy call runs in order on a background
+    worker, which keeps the upcoming cards computed while the user looks at
+    the current one.
+
+    Once a session is saved to or loaded from an SQLite session store, the
+    card of every review is written to the store as the review is processed.
+    Once a journal is started for a JSON session, every review and every card
+    the strategy hands out is appended to it instead, and the journal is
+    folded into the snapshot in the background.
+    Once autosave is started, the session is saved whole on a background
+    thread after a number of reviews or seconds.
+
+    Attributes:
+        deck_cache (DeckCache | None): Where the decks loaded are cached, so
+            reloading an unchanged deck skips parsing. Decks are parsed on
+            every load when it is None.
+    """
+
+    deck_cache: DeckCache | None = field(default_factory=DeckCache)
 
     def __post_init__(self) -> None:
         """Instantiates the CardEngine."""
         self.session: CardSession
+        self._lookahead = 0
+        self._worker: ThreadPoolExecutor | None = None
+        self._pending: list[Future[None]] = []
+        self._upcoming: list[Card] = []
+        self._upcoming_key: tuple[int, int] | None = None
+        self._upcoming_expiry: int | None = None
+        self._arena: TextArena | None = None
+        self._store: SQLiteSessionStore | None = None
+        self._snapshot_path: Path | None = None
+        self._folded_sequence = 0
+        self._journal: ReviewJournal | None = None
+        self._journal_session: CardSession | None = None
+        self._compact_after = COMPACT_AFTER
+        self._compactor: ThreadPoolExecutor | None = None
+        self._compaction: Future[None] | None = None
+        self._autosaver: Autosaver | None = None
+        # The copy of the cards that autosave and compaction write, refreshed
+        # with the cards reviewed since the last write.
+        self._copied_cards: list[dict[str, Any]] = []
+        self._copied_positions: dict[int, int] = {}
+        self._touched: set[int] = set()
+        # Held while the strategy changes, so autosave copies a consistent state.
+        self._session_lock = threading.Lock()
+        self.load_errors: dict[str, Exception] = {}
+
+    def start_lookahead(self, k: int) -> None:
+        """Starts precomputing the next k cards in the background.
+
+        Args:
+            k (int): The number of upcoming cards to keep computed.
+        """
+        if k < 1:
+            msg = f"Lookahead must be at least 1, got {k}."
+            raise ValueError(msg)
+        self.stop_lookahead()
+        self._lookahead = k
+        self._worker = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="hifz-lookahead"
+        )
+        if hasattr(self, "session"):
+            self._submit(self._refresh_upcoming)
+
+    def stop_lookahead(self) -> None:
+        """Waits for the background work to finish and stops the worker."""
+        if self._worker is None:
+            return
+        try:
+            self._wait()
+        finally:
+            self._worker.shutdown()
+            self._worker = None
+            self._upcoming = []
+            self._upcoming_key = None
+
+    def _submit(self, task: Callable[[], None]) -> None:
+        """Queues task on the background worker."""
+        assert self._worker is not None
+        self._pending.append(self._worker.submit(task))
+
+    def _wait(self) -> None:
+        """Waits for the queued work, re-raising the first error it hit."""
+        pending, self._pending = self._pending, []
+        for future in pending:
+            future.result()
+
+    def _upcoming_is_current(self) -> bool:
+        """Returns whether the precomputed cards match the session as it stands."""
+        strategy = self.session.strategy
+        return self._upcoming_key == (id(self.session), strategy.revision) and (
+            self._upcoming_expiry is None
+            or to_epoch_seconds(strategy.clock()) < self._upcoming_expiry
+        )
+
+    def _refresh_upcoming(self) -> None:
+        """Recomputes the upcoming cards."""
+        strategy = self.session.strategy
+        # Taken first, so a card falling due during the peek expires it.
+        self._upcoming_expiry = strategy.peek_expiry(self.session.cards)
+        self._upcoming = strategy.peek_next(self.session.cards, self._lookahead)
+        self._upcoming_key = (id(self.session), strategy.revision)
+
+    def _advance(self) -> None:
+        """Moves the strategy past the card already handed out."""
+        with self._session_lock:
+            self._record_hand_outs([self.session.get_next_card()])
+        self._refresh_upcoming()
+
+    def _apply_feedback(self, card: Card, feedback: Feedback) -> None:
+        """Processes feedback, recomputing the upcoming cards only if it reordered them."""
+        with self._session_lock:
+            self.session.strategy.process_feedback(card, feedback)
+            self._record([(card, feedback)])
+        if not self._upcoming_is_current():
+            self._refresh_upcoming()
 
     def get_next_card(self) -> Card:
         """Returns the next card.
@@ -24,7 +158,61 @@ class CardEngine:
         Returns:
             Card: The next card.
         """
-        return self.session.get_next_card()
+        if self._worker is None:
+            with self._session_lock:
+                card = self.session.get_next_card()
+                self._record_hand_outs([card])
+            return card
+        self._wait()
+        # A card peeked before an expiry could fall due before the worker
+        # advances past it, so such strategies pick the card here.
+        if (
+            self._upcoming
+            and self._upcoming_expiry is None
+            and self._upcoming_is_current()
+        ):
+            card = self._upcoming[0]
+            self._submit(self._advance)
+            return card
+        with self._session_lock:
+            card = self.session.get_next_card()
+            self._record_hand_outs([card])
+        self._submit(self._refresh_upcoming)
+        return card
+
+    def get_next_cards(self, k: int) -> list[Card]:
+        """Returns the next k cards.
+
+        Args:
+            k (int): The number of cards to return.
+
+        Returns:
+            list[Card]: The next cards, in order.
+        """
+        if self._worker is None:
+            with self._session_lock:
+                cards = self.session.strategy.get_next_cards(self.session.cards, k)
+                self._record_hand_outs(cards)
+            return cards
+        return [self.get_next_card() for _ in range(k)]
+
+    def peek_next(self, k: int) -> list[Card]:
+        """Returns the next k cards without moving past them.
+
+        These are the cards get_next_card returns next, unless feedback in
+        between reorders them.
+
+        Args:
+            k (int): The number of cards to look ahead.
+
+        Returns:
+            list[Card]: The upcoming cards, in order.
+        """
+        if self._worker is not None:
+            self._wait()
+            if len(self._upcoming) >= k and self._upcoming_is_current():
+                return self._upcoming[:k]
+        return self.session.strategy.peek_next(self.session.cards, k)
 
     def process_feedback(self, card: Card, feedback: Feedback) -> None:
         """Processes the user feedback.
@@ -33,7 +221,273 @@ class CardEngine:
             card (Card): The card associated with the feedback.
             feedback (Feedback): The user feedback associated with the card.
         """
-        self.session.strategy.process_feedback(card, feedback)
+        if self._worker is None:
+            with self._session_lock:
+                self.session.strategy.process_feedback(card, feedback)
+                self._record([(card, feedback)])
+            return
+        feedback.validate()
+        snapshot = copy.copy(feedback)
+        snapshot.data = dict(feedback.data)
+        self._submit(lambda: self._apply_feedback(card, snapshot))
+
+    def process_feedback_batch(self, reviews: Iterable[tuple[Card, Feedback]]) -> int:
+        """Processes a sequence of reviews in one pass.
+
+        Args:
+            reviews (Iterable[tuple[Card, Feedback]]): The reviews, in the order they happened.
+
+        Returns:
+            int: The number of reviews applied.
+        """
+        self._wait()
+        reviews = list(reviews)
+        with self._session_lock:
+            applied = self.session.strategy.process_feedback_batch(reviews)
+            self._record(reviews)
+        return applied
+
+    def _record(self, reviews: list[tuple[Card, Feedback]]) -> None:
+        """Writes processed reviews to the session store or journal of the session.
+
+        Called with the session lock held.
+        """
+        if self._store is not None and self._store.holds(self.session):
+            self._store.save_cards(self.session, [card for card, _ in reviews])
+        if self._autosaver is not None:
+            self._touch(reviews)
+            self._autosaver.record(len(reviews))
+        if self._journal is None or self._journal_session is not self.session:
+            return
+        self._touch(reviews)
+        seconds = to_epoch_seconds(self.session.strategy.clock())
+        for card, feedback in reviews:
+            self._journal.append(card, feedback, seconds)
+        self._compact_if_due()
+
+    def _touch(self, reviews: list[tuple[Card, Feedback]]) -> None:
+        """Marks the cards of reviews for copying again, with the session lock held."""
+        self._touched.update(self._copied_positions[id(card)] for card, _ in reviews)
+
+    def _record_hand_outs(self, cards: list[Card]) -> None:
+        """Journals the cards the strategy handed out, as they move its cursor.
+
+        Called with the session lock held.
+        """
+        if self._journal is None or self._journal_session is not self.session:
+            return
+        seconds = to_epoch_seconds(self.session.strategy.clock())
+        for card in cards:
+            self._journal.hand_out(card, seconds)
+        self._compact_if_due()
+
+    def _compact_if_due(self) -> None:
+        """Starts a compaction once enough records are journaled since the last one."""
+        assert self._journal is not None
+        if self._journal.sequence - self._folded_sequence >= self._compact_after and (
+            self._compaction is None or self._compaction.done()
+        ):
+            if self._compaction is not None:
+                self._compaction.result()
+            self._compact()
+
+    def start_autosave(
+        self,
+        file_path: Path,
+        every: int = SAVE_EVERY,
+        interval: float = SAVE_INTERVAL,
+    ) -> None:
+        """Saves the session to file_path in the background as it is reviewed.
+
+        A save starts once every reviews are unsaved, or interval seconds
+        after the first unsaved review. It copies the session while no
+        feedback is being applied, then writes the copy on the autosave
+        thread, to a temporary file that replaces file_path. The cards are
+        copied once here, and later only those reviewed since the last copy.
+
+        Args:
+            file_path (Path): The JSON file to save the session to.
+            every (int): The number of unsaved reviews that starts a save.
+            interval (float): Seconds after the first unsaved review that a
+                save starts.
+        """
+        if is_sqlite_session(file_path):
+            msg = "SQLite sessions save every review already and need no autosave."
+            raise ValueError(msg)
+        if self._journal is not None:
+            msg = "A journaled session cannot be autosaved as well."
+            raise ValueError(msg)
+        self.stop_autosave()
+        self._wait()
+        self._copy_cards()
+        if self._snapshot_path != file_path:
+            # The snapshot autosave writes holds none of these reviews.
+            journal_path(file_path).unlink(missing_ok=True)
+        self._autosaver = Autosaver(
+            file_path,
+            partial(self._copy_progress, self.session),
+            every=every,
+            interval=interval,
+        )
+
+    def stop_autosave(self) -> None:
+        """Saves the reviews not autosaved yet and stops autosaving.
+
+        Raises:
+            Exception: The error of the last autosave that failed, if any.
+        """
+        if self._autosaver is None:
+            return
+        self._wait()
+        autosaver, self._autosaver = self._autosaver, None
+        try:
+            autosaver.stop()
+        finally:
+            self._drop_card_copy()
+
+    def _copy_cards(self) -> None:
+        """Copies every card of the session, for autosave or compaction to refresh."""
+        self._copied_cards = [card.to_dict() for card in self.session.cards]
+        self._copied_positions = {
+            id(card): position for position, card in enumerate(self.session.cards)
+        }
+        self._touched = set()
+
+    def _drop_card_copy(self) -> None:
+        """Releases the copy of the cards."""
+        self._copied_cards = []
+        self._copied_positions = {}
+        self._touched = set()
+
+    def _copy_progress(self, session: CardSession) -> dict[str, Any]:
+        """Returns a copy of the state of session, taken between reviews.
+
+        Only the cards reviewed since the last copy are copied again, so the
+        copy of the others is shared by the saves. A journaled session is
+        copied with the sequence number of its last journal record.
+        """
+        with self._session_lock:
+            for position in self._touched:
+                self._copied_cards[position] = session.cards[position].to_dict()
+            self._touched.clear()
+            if self._journal is not None and session is self._journal_session:
+                session.journal_sequence = self._journal.sequence
+            return session.progress_data(self._copied_cards)
+
+    def start_journal(
+        self,
+        file_path: Path,
+        compact_after: int = COMPACT_AFTER,
+        sync_every: int = SYNC_EVERY,
+        sync_interval: float = SYNC_INTERVAL,
+    ) -> None:
+        """Appends every later review of the session to a journal next to file_path.
+
+        The cards the strategy hands out are journaled too, so resuming the
+        session restores the strategy's cursor. The session is first saved to
+        file_path, unless it was loaded from there. Saving it there afterwards
+        only folds the journal into the snapshot, and only if records were
+        appended since the last fold.
+
+        Args:
+            file_path (Path): The JSON snapshot of the session.
+            compact_after (int): The number of journaled records after which
+                they are folded into the snapshot in the background.
+            sync_every (int): The number of records flushed to disk together.
+            sync_interval (float): Seconds after which pending records are flushed.
+        """
+        if is_sqlite_session(file_path):
+            msg = "SQLite sessions save every review already and take no journal."
+            raise ValueError(msg)
+        if self._autosaver is not None:
+            msg = "An autosaved session cannot be journaled as well."
+            raise ValueError(msg)
+        self.stop_journal()
+        if self._snapshot_path != file_path:
+            self.session.journal_sequence = 0
+            self.save_progress(file_path)
+            self._snapshot_path = file_path
+            self._folded_sequence = 0
+        self._journal = ReviewJournal(
+            journal_path(file_path),
+            self.session.cards,
+            sequence=self.session.journal_sequence,
+            sync_every=sync_every,
+            sync_interval=sync_interval,
+        )
+        self._journal_session = self.session
+        self._copy_cards()
+        self._compact_after = compact_after
+        self._compactor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="hifz-compaction"
+        )
+
+    def stop_journal(self) -> None:
+        """Folds the journaled reviews into the snapshot and closes the journal."""
+        if self._journal is None:
+            return
+        self._wait()
+        try:
+            self._fold_journal()
+        finally:
+            assert self._compactor is not None
+            self._compactor.shutdown()
+            self._journal.close()
+            self._journal = None
+            self._journal_session = None
+            self._compactor = None
+            self._compaction = None
+            self._drop_card_copy()
+
+    def _fold_journal(self) -> None:
+        """Waits until every journaled review is folded into the snapshot."""
+        assert self._journal is not None
+        if self._compaction is not None:
+            self._compaction.result()
+        if self._journal.sequence > self._folded_sequence:
+            self._compact()
+            assert self._compaction is not None
+            self._compaction.result()
+
+    def _compact(self) -> None:
+        """Snapshots the journaled session in the background."""
+        assert self._compactor is not None
+        assert self._snapshot_path is not None
+        self._compaction = self._compactor.submit(
+            self._write_snapshot, self._snapshot_path
+        )
+
+    def _write_snapshot(self, file_path: Path) -> None:
+        """Replaces the snapshot, then drops the journaled records it folds.
+
+        The session is copied between reviews, recopying only the cards
+        reviewed since the last snapshot.
+        """
+        assert self._journal is not None
+        assert self._journal_session is not None
+        data = self._copy_progress(self._journal_session)
+        sequence = data["metadata"]["journal_sequence"]
+        write_progress(data, file_path, sync=True)
+        self._folded_sequence = sequence
+        self._journal.discard_through(sequence)
+
+    def replay_reviews(self, file_path: Path, batch_size: int = 10_000) -> int:
+        """Applies the reviews of a review log to the session.
+
+        The log is streamed and applied in batches of batch_size reviews, so
+        an invalid review stops the replay after the preceding batches.
+
+        Args:
+            file_path (Path): The path of the newline-delimited JSON review log.
+            batch_size (int): The number of reviews applied per batch.
+
+        Returns:
+            int: The number of reviews applied.
+        """
+        reviews = read_review_log(file_path, self.session.cards, self.session.strategy)
+        return sum(
+            self.process_feedback_batch(batch) for batch in batched(reviews, batch_size)
+        )
 
     def get_feedback(self) -> Feedback:
         """Returns the feedback for the visualizer.
@@ -41,45 +495,151 @@ class CardEngine:
         Returns:
             Feedback: The feedback object for the visualizer.
         """
+        self._wait()
         return self.session.strategy.create_feedback()
 
     def load_cards(
-        self, file_path: str, learning_strategy: CardStrategy, reverse: bool = False
+        self,
+        file_path: str | Sequence[str],
+        learning_strategy: CardStrategy,
+        reverse: bool = False,
+        columnar: bool = False,
+        intern_text: bool = False,
+        parse_workers: int = 1,
+        timeout: float | None = None,
     ) -> bool:
         """Loads the cards at file_path to be interacted with.
 
+        Several sources are loaded concurrently and their cards combined in
+        order. If any source fails, the session is left as it was and the
+        error of every failed source is kept in load_errors. Otherwise the
+        journal of the current session is folded and closed, and its
+        autosave stopped.
+
         Args:
-            file_path (str): The file_path of the cards.
+            file_path (str | Sequence[str]): The file path or URL of the cards,
+                or several of them.
             reverse (bool): Swap the front and the back of the cards.
             learning_strategy (CardStrategy): The ordering algorithm to use.
+            columnar (bool): Keep the card statistics in a columnar store.
+            intern_text (bool): Keep the card text in a deduplicated arena
+                shared with later loads.
+            parse_workers (int): The number of processes parsing CSV, TSV and
+                NDJSON decks.
+            timeout (float | None): Seconds after which a source that is still
+                loading counts as failed.
 
         Returns:
             bool: Whether the retrieval was successful.
         """
-        data_server = DataServer()
+        self._wait()
+        sources = [file_path] if isinstance(file_path, str) else list(file_path)
+        data_server = DataServer(deck_cache=self.deck_cache)
         try:
-            new_cards = data_server.read_cards(file_path, reverse=reverse)
-            self.session = CardSession(new_cards, learning_strategy)
-            return True
-        except Exception:
+            new_cards = data_server.read_sources(
+                sources,
+                reverse=reverse,
+                arena=self._text_arena(intern_text),
+                workers=parse_workers,
+                timeout=timeout,
+            )
+        except SourceLoadError as err:
+            self.load_errors = err.errors
             return False
+        self.load_errors = {}
+        self.stop_journal()
+        self.stop_autosave()
+        self.session = CardSession(new_cards, learning_strategy, columnar=columnar)
+        self._snapshot_path = None
+        if self._worker is not None:
+            self._submit(self._refresh_upcoming)
+        return True
 
     def save_progress(self, file_path: Path) -> None:
         """Saves the current session state.
 
+        Sessions are saved as JSON, compressed if file_path ends in .gz or
+        .xz, or to an SQLite session store if it ends in .sqlite, .sqlite3
+        or .db.
+
         Args:
             file_path (Path): The file path to save the state.
         """
-        self.session.save_progress(file_path)
+        self._wait()
+        if is_sqlite_session(file_path):
+            self._session_store(file_path).save(self.session)
+        elif self._journal is not None and file_path == self._snapshot_path:
+            self._fold_journal()
+        else:
+            self.session.save_progress(file_path)
+            # The snapshot holds every review, including those of an old journal.
+            journal_path(file_path).unlink(missing_ok=True)
 
-    def load_progress(self, file_path: Path) -> None:
+    def load_progress(
+        self,
+        file_path: Path,
+        columnar: bool = False,
+        intern_text: bool = False,
+        due_before: datetime | None = None,
+        mastery_below: int | None = None,
+    ) -> None:
         """Loads progress associated with the file path.
 
+        The reviews and card hand-outs journaled since a JSON session was
+        last saved are replayed on top of it. The journal of the current session is folded
+        and closed first, and its autosave stopped.
+
         Args:
             file_path (Path): The file path to load the progress from.
+            columnar (bool): Keep the card statistics in a columnar store.
+            intern_text (bool): Keep the card text in a deduplicated arena
+                shared with later loads.
+            due_before (datetime | None): Only load the cards that are due at
+                this time. Requires an SQLite session.
+            mastery_below (int | None): Only load the cards with fewer correct
+                answers in a row than this. Requires an SQLite session.
         """
-        self.session = CardSession.load_progress(file_path)
+        self.stop_journal()
+        self.stop_autosave()
+        self._wait()
+        self._snapshot_path = None
+        if is_sqlite_session(file_path):
+            self.session = self._session_store(file_path).load(
+                columnar=columnar,
+                arena=self._text_arena(intern_text),
+                due_before=due_before,
+                mastery_below=mastery_below,
+            )
+        elif due_before is not None or mastery_below is not None:
+            msg = "Only SQLite sessions can be loaded partially."
+            raise ValueError(msg)
+        else:
+            self.session = CardSession.load_progress(
+                file_path, columnar=columnar, arena=self._text_arena(intern_text)
+            )
+            self._snapshot_path = file_path
+            self._folded_sequence = self.session.journal_sequence
+            if journal_path(file_path).exists():
+                replay_journal(self.session, journal_path(file_path))
         self.strategy = self.session.strategy  # TODO: bad hack.
+        if self._worker is not None:
+            self._submit(self._refresh_upcoming)
+
+    def _session_store(self, file_path: Path) -> SQLiteSessionStore:
+        """Returns the session store at file_path, opening it unless it is open."""
+        if self._store is None or self._store.file_path != file_path:
+            if self._store is not None:
+                self._store.close()
+            self._store = SQLiteSessionStore(file_path)
+        return self._store
+
+    def _text_arena(self, intern_text: bool) -> TextArena | None:
+        """Returns the arena shared by the loads of this engine, if text is interned."""
+        if not intern_text:
+            return None
+        if self._arena is None:
+            self._arena = TextArena()
+        return self._arena
 
     def get_statistics(self) -> dict[str, Any]:
         """Returns the associated with the session.
@@ -87,6 +647,7 @@ class CardEngine:
         Returns:
             dict[str, Any]: The statistics associated with the session.
         """
+        self._wait()
         return self.session.get_statistics()
 
     def __str__(self) -> str:
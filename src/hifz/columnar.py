@@ -0,0 +1,239 @@
+"""This module maintains a columnar, NumPy-backed store for card statistics."""
+
+from collections.abc import Iterator, MutableMapping
+from datetime import datetime
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from hifz.models import Card, as_epoch_seconds, to_epoch_seconds
+
+MISSING_COUNT = -1
+MISSING_DUE = np.iinfo(np.int64).min
+
+COUNT_COLUMNS = ("correct", "incorrect", "seen")
+FLOAT_COLUMNS = ("interval", "ease_factor")
+DUE_COLUMN = "due"
+
+
+class ColumnarStatistics:
+    """Parallel NumPy arrays holding the statistics of a deck, indexed by card position.
+
+    The built-in statistics live in one array per key: counts are int64 with
+    MISSING_COUNT marking an absent value, intervals and ease factors are
+    float64 with NaN, and due times are int64 seconds since the epoch with
+    MISSING_DUE. Any other key is kept in a per-card overflow dict.
+    """
+
+    def __init__(self, size: int) -> None:
+        """Allocates empty columns for size cards.
+
+        Args:
+            size (int): The number of cards in the deck.
+        """
+        self.size = size
+        self.columns: dict[str, npt.NDArray[Any]] = {
+            **{name: np.full(size, MISSING_COUNT, np.int64) for name in COUNT_COLUMNS},
+            **{name: np.full(size, np.nan, np.float64) for name in FLOAT_COLUMNS},
+            DUE_COLUMN: np.full(size, MISSING_DUE, np.int64),
+        }
+        self.overflow: dict[int, dict[str, Any]] = {}
+
+    @classmethod
+    def from_cards(cls, cards: list[Card]) -> "ColumnarStatistics":
+        """Moves the statistics of cards into a new store.
+
+        Each card's statistics data is replaced by a StatisticsView onto the
+        store, so code reading or updating the dict keeps working.
+
+        Args:
+            cards (list[Card]): The deck whose statistics to move.
+
+        Returns:
+            ColumnarStatistics: The store now backing the cards' statistics.
+        """
+        store = cls(len(cards))
+        for position, card in enumerate(cards):
+            view = store.view(position)
+            for key, value in card.statistics.data.items():
+                view[key] = value
+            card.statistics.data = view
+        return store
+
+    def view(self, position: int) -> "StatisticsView":
+        """Returns the dict-like view of the statistics of the card at position."""
+        return StatisticsView(self, position)
+
+    def total(self, name: str) -> int:
+        """Sums a count column, treating absent values as zero."""
+        column = self.columns[name]
+        return int(column[column != MISSING_COUNT].sum())
+
+    def count_reviewed(self) -> int:
+        """Counts the cards that have a non-zero correct, incorrect or seen count."""
+        reviewed = np.zeros(self.size, np.bool_)
+        for name in COUNT_COLUMNS:
+            reviewed |= self.columns[name] > 0
+        return int(np.count_nonzero(reviewed))
+
+    def count_at_least(self, name: str, threshold: float) -> int:
+        """Counts the cards whose count column is at least threshold, absent being zero."""
+        column = self.columns[name]
+        return int(
+            np.count_nonzero(np.where(column == MISSING_COUNT, 0, column) >= threshold)
+        )
+
+    def positions_below(self, name: str, threshold: float) -> list[int]:
+        """Returns the positions whose count column is below threshold, absent being zero."""
+        column = self.columns[name]
+        below = np.where(column == MISSING_COUNT, 0, column) < threshold
+        return [int(position) for position in np.flatnonzero(below)]
+
+    def add_counts(self, positions: list[int], correct: list[bool]) -> int:
+        """Records a batch of binary answers in the correct and incorrect columns.
+
+        Every reviewed card ends up with both counts present, as with the
+        per-card updates. Repeated positions accumulate.
+
+        Args:
+            positions (list[int]): The position of the card of each answer.
+            correct (list[bool]): Whether each answer was correct.
+
+        Returns:
+            int: The number of cards that had not been reviewed before.
+        """
+        indices = np.asarray(positions, np.int64)
+        outcomes = np.asarray(correct, np.bool_)
+        touched = np.unique(indices)
+        reviewed = np.zeros(len(touched), np.bool_)
+        for name in COUNT_COLUMNS:
+            reviewed |= self.columns[name][touched] > 0
+        for name, answers in (("correct", outcomes), ("incorrect", ~outcomes)):
+            column = self.columns[name]
+            column[touched] = np.maximum(column[touched], 0)
+            np.add.at(column, indices, answers.astype(np.int64))
+        return int(np.count_nonzero(~reviewed))
+
+    def count_due(self, now: datetime) -> int:
+        """Counts the cards due at or before now, unscheduled cards included."""
+        column = self.columns[DUE_COLUMN]
+        due = (column == MISSING_DUE) | (column <= to_epoch_seconds(now))
+        return int(np.count_nonzero(due))
+
+
+class StatisticsView(MutableMapping[str, Any]):
+    """A dict-like view of one card's statistics inside a ColumnarStatistics store."""
+
+    __slots__ = ("position", "store")
+
+    def __init__(self, store: ColumnarStatistics, position: int) -> None:
+        """Instantiates the view of the card at position.
+
+        Args:
+            store (ColumnarStatistics): The store holding the statistics.
+            position (int): The position of the card in the deck.
+        """
+        self.store = store
+        self.position = position
+
+    def _overflow(self) -> dict[str, Any]:
+        """Returns the overflow dict for the card, which may be empty."""
+        return self.store.overflow.get(self.position, {})
+
+    def __getitem__(self, key: str) -> Any:
+        """Returns the statistic key, raising KeyError if it is absent.
+
+        A column key whose value did not fit the column is read from the
+        overflow dict.
+        """
+        column = self.store.columns.get(key)
+        if column is None:
+            return self._overflow()[key]
+        value = column[self.position]
+        if key in COUNT_COLUMNS:
+            if value == MISSING_COUNT:
+                return self._overflow()[key]
+            return int(value)
+        if key == DUE_COLUMN:
+            if value == MISSING_DUE:
+                return self._overflow()[key]
+            return int(value)
+        if np.isnan(value):
+            return self._overflow()[key]
+        return float(value)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Returns the statistic key, or default if it is absent."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        """Stores the statistic key in its column, or in the overflow dict."""
+        column = self.store.columns.get(key)
+        encoded: int | float
+        try:
+            if column is None:
+                raise TypeError(key)
+            if key == DUE_COLUMN:
+                encoded = as_epoch_seconds(value)
+                if not isinstance(encoded, int):
+                    raise TypeError(key)
+            elif key in COUNT_COLUMNS:
+                encoded = int(value)
+                if encoded != value or encoded < 0:
+                    raise ValueError(key)
+            else:
+                encoded = float(value)
+        except (TypeError, ValueError):
+            self.store.overflow.setdefault(self.position, {})[key] = value
+            if column is not None:
+                self._clear_column(key)
+            return
+        column[self.position] = encoded
+        self._overflow().pop(key, None)
+
+    def _clear_column(self, key: str) -> None:
+        """Marks the column value of key as absent."""
+        column = self.store.columns[key]
+        if key in COUNT_COLUMNS:
+            column[self.position] = MISSING_COUNT
+        elif key == DUE_COLUMN:
+            column[self.position] = MISSING_DUE
+        else:
+            column[self.position] = np.nan
+
+    def __delitem__(self, key: str) -> None:
+        """Removes the statistic key."""
+        if key in self._overflow():
+            del self.store.overflow[self.position][key]
+        elif key in self.store.columns and key in self:
+            self._clear_column(key)
+        else:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterates over the statistics that are present."""
+        overflow = self._overflow()
+        for key in self.store.columns:
+            if key not in overflow and key in self:
+                yield key
+        yield from overflow
+
+    def __contains__(self, key: object) -> bool:
+        """Returns whether the statistic key is present."""
+        if not isinstance(key, str):
+            return False
+        if key in self.store.columns:
+            return self.get(key) is not None
+        return key in self._overflow()
+
+    def __len__(self) -> int:
+        """Returns the number of statistics present."""
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        """Machine-readable representation of the view."""
+        return repr(dict(self))
@@ -1,95 +1,533 @@
 """The dataserver module is responsible for serving content."""
 
 import csv
+import io
 import json
-import tempfile
-import xml.dom.minidom as xml
+import os
+import threading
+import time
+import xml.etree.ElementTree as ET
 from abc import ABC, abstractmethod
+from collections.abc import Iterator, Sequence
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    CancelledError,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import contextmanager
+from itertools import repeat
 from pathlib import Path
+from typing import Any, BinaryIO, TextIO
 from urllib.parse import urlparse
-from urllib.request import urlopen
 
+from hifz.arena import TextArena
+from hifz.binary_deck import read_binary_deck
+from hifz.deck_cache import DeckCache
 from hifz.models import Card
+from hifz.url_cache import URLCache
+from hifz.utils import paused_gc
+
+JSON_CHUNK_SIZE = 1 << 16
+PARALLEL_CHUNK_BYTES = 1 << 25
+MIN_PARALLEL_CHUNK_BYTES = 1 << 20
+SCAN_BLOCK_BYTES = 1 << 20
+MAX_CONCURRENT_SOURCES = 8
+SOURCE_START_POLL_SECONDS = 0.05
+_JSON_WHITESPACE = " \t\n\r"
+_JSON_DELIMITERS = _JSON_WHITESPACE + ",]"
+
+
+def _iter_json_array(f: TextIO, chunk_size: int = JSON_CHUNK_SIZE) -> Iterator[Any]:
+    """Yields the elements of the JSON array in f one at a time.
+
+    The file is read in chunks of chunk_size characters, so only the element
+    being decoded and the chunk holding it are kept in memory.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+    need_more = True
+    started = False
+    first = True
+    expect_value = True
+    while True:
+        if need_more:
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            need_more = False
+
+        while position < len(buffer) and buffer[position] in _JSON_WHITESPACE:
+            position += 1
+        if position == len(buffer):
+            if eof:
+                msg = "Unexpected end of JSON array"
+                raise ValueError(msg)
+            need_more = True
+            continue
+
+        char = buffer[position]
+        if not started:
+            if char != "[":
+                msg = "Expected a JSON array"
+                raise ValueError(msg)
+            started = True
+            position += 1
+        elif char == "]" and (first or not expect_value):
+            _expect_end(f, buffer[position + 1 :], chunk_size)
+            return
+        elif not expect_value:
+            if char != ",":
+                msg = f"Expected ',' or ']' in JSON array, got {char!r}"
+                raise ValueError(msg)
+            expect_value = True
+            position += 1
+        else:
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # An element whose text is all read is malformed, not cut short.
+                if eof or _element_end(buffer, position) is not None:
+                    raise
+                need_more = True
+                continue
+            # A number cut by the end of the chunk decodes early, so a value
+            # only counts once the delimiter after it has been read, or once
+            # the text left in the element cannot complete it.
+            if not eof and (
+                end == len(buffer)
+                or (
+                    buffer[end] not in _JSON_DELIMITERS
+                    and _element_end(buffer, position) is None
+                )
+            ):
+                need_more = True
+                continue
+            yield value
+            position = end
+            first = expect_value = False
+
+
+def _expect_end(f: TextIO, rest: str, chunk_size: int) -> None:
+    """Reads f to its end, raising JSONDecodeError if anything but whitespace is left.
+
+    Args:
+        f (TextIO): The file, positioned after the text already in rest.
+        rest (str): The text read after the closing bracket of the array.
+        chunk_size (int): The number of characters read at a time.
+    """
+    while True:
+        extra = rest.lstrip(_JSON_WHITESPACE)
+        if extra:
+            msg = "Extra data after the JSON array"
+            raise json.JSONDecodeError(msg, rest, len(rest) - len(extra))
+        rest = f.read(chunk_size)
+        if not rest:
+            return
+
+
+def _element_end(buffer: str, position: int) -> int | None:
+    """Returns where the array element starting at position ends, if buffer holds it all.
+
+    The element ends at the first ',' or ']' outside its strings and nested
+    brackets. Its text is not checked to be valid JSON.
+    """
+    depth = 0
+    in_string = escaped = False
+    for index in range(position, len(buffer)):
+        char = buffer[index]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "[{":
+            depth += 1
+        elif char in "]}":
+            if depth == 0:
+                return index
+            depth -= 1
+        elif char == "," and depth == 0:
+            return index
+    return None
+
+
+def _until_cancelled(
+    cards: Iterator[Card], cancelled: threading.Event
+) -> Iterator[Card]:
+    """Yields cards, raising CancelledError once cancelled is set.
+
+    A cancelled generator of cards is closed, so its file is released right
+    away rather than once the unretrieved error is collected.
+    """
+    for card in cards:
+        if cancelled.is_set():
+            close = getattr(cards, "close", None)
+            if close is not None:
+                close()
+            raise CancelledError
+        yield card
 
 
 class FileInputStrategy(ABC):
     """This ABC is an interface for the delivery independent of file types."""
 
     @abstractmethod
-    def read_cards(self, file_path: Path, reverse: bool = False) -> list[Card]:
-        """Reads the entries from file_path."""
+    def iter_cards(
+        self, file_path: Path, reverse: bool = False, arena: TextArena | None = None
+    ) -> Iterator[Card]:
+        """Yields the entries from file_path one at a time, as they are parsed."""
+
+    def read_cards(
+        self,
+        file_path: Path,
+        reverse: bool = False,
+        arena: TextArena | None = None,
+        cancelled: threading.Event | None = None,
+    ) -> list[Card]:
+        """Reads every entry from file_path.
+
+        Raises:
+            CancelledError: If cancelled is set before the last entry is read.
+        """
+        cards = self.iter_cards(file_path, reverse=reverse, arena=arena)
+        with paused_gc():
+            if cancelled is None:
+                return list(cards)
+            return list(_until_cancelled(cards, cancelled))
+
+    @staticmethod
+    def make_card(
+        front: str, back: str, reverse: bool = False, arena: TextArena | None = None
+    ) -> Card:
+        """Builds a card, storing its text in arena if one is given."""
+        if reverse:
+            front, back = back, front
+        if arena is None:
+            return Card(front, back)
+        return arena.card(front, back)
+
+
+class SplittableFileInputStrategy(FileInputStrategy):
+    """An interface for formats that can be parsed in parallel byte ranges.
+
+    The records of these formats end on newlines, so a file can be cut into
+    record-aligned byte ranges that are each parsed in their own process.
+    """
+
+    def ranges(self, file_path: Path, chunk_bytes: int) -> list[tuple[int, int]]:
+        """Cuts file_path into record-aligned byte ranges, in file order.
+
+        Args:
+            file_path (Path): The file to cut.
+            chunk_bytes (int): The size a range grows to before its record ends.
+
+        Returns:
+            list[tuple[int, int]]: The start and end offsets of each range.
+        """
+        size = file_path.stat().st_size
+        bounds = []
+        with file_path.open("rb") as f:
+            start = 0
+            while start < size:
+                f.seek(min(start + chunk_bytes, size))
+                f.readline()
+                end = f.tell()
+                bounds.append((start, end))
+                start = end
+        return bounds
+
+    @abstractmethod
+    def parse_range(self, file_path: Path, start: int, end: int) -> list[str]:
+        """Parses the records between the byte offsets start and end of file_path.
+
+        Returns:
+            list[str]: The front and back of each record, interleaved.
+        """
+
+    def read_cards_parallel(
+        self,
+        file_path: Path,
+        reverse: bool = False,
+        arena: TextArena | None = None,
+        workers: int | None = None,
+        cancelled: threading.Event | None = None,
+    ) -> list[Card]:
+        """Reads every entry from file_path, parsing its ranges across processes.
+
+        The cards are built in file order in the calling process, so reverse
+        and arena behave as in read_cards.
+
+        Args:
+            file_path (Path): The file to read.
+            reverse (bool): Swap the front and the back of the cards.
+            arena (TextArena | None): Deduplicated storage for the card text.
+            workers (int | None): The number of processes. Defaults to the number of CPUs.
+            cancelled (threading.Event | None): Stops the read between ranges once set.
+
+        Returns:
+            list[Card]: The cards read.
+
+        Raises:
+            CancelledError: If cancelled is set before the last range is read.
+        """
+        processes = workers or os.cpu_count() or 1
+        chunk_bytes = max(
+            min(file_path.stat().st_size // (4 * processes), PARALLEL_CHUNK_BYTES),
+            MIN_PARALLEL_CHUNK_BYTES,
+        )
+        bounds = self.ranges(file_path, chunk_bytes)
+        if len(bounds) < 2:
+            return self.read_cards(
+                file_path, reverse=reverse, arena=arena, cancelled=cancelled
+            )
+
+        starts, ends = zip(*bounds, strict=True)
+        build = Card if arena is None else arena.card
+        cards: list[Card] = []
+        with ProcessPoolExecutor(max_workers=workers) as pool, paused_gc():
+            for fields in pool.map(self.parse_range, repeat(file_path), starts, ends):
+                if cancelled is not None and cancelled.is_set():
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    raise CancelledError
+                fronts, backs = fields[0::2], fields[1::2]
+                if reverse:
+                    fronts, backs = backs, fronts
+                cards.extend(map(build, fronts, backs))
+        return cards
 
 
-class CSVFileInputStrategy(FileInputStrategy):
+class CSVFileInputStrategy(SplittableFileInputStrategy):
     """This class maintains the logic for reading from csv files types."""
 
-    def read_cards(self, file_path: Path, reverse: bool = False) -> list[Card]:
-        """Reads the entries from the csv at file_path."""
-        with file_path.open("r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            if reverse:
-                return [Card(e["back"], e["front"]) for e in reader]
-            return [Card(e["front"], e["back"]) for e in reader]
+    delimiter = ","
+
+    def iter_cards(
+        self, file_path: Path, reverse: bool = False, arena: TextArena | None = None
+    ) -> Iterator[Card]:
+        """Yields the entries from the csv at file_path.
+
+        The columns are located once from the header, and each row is read as
+        a plain list.
+        """
+        with file_path.open("r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f, delimiter=self.delimiter)
+            header = next(reader, None)
+            if header is None:
+                return
+            front, back = self._columns(header, file_path)
+            width = max(front, back) + 1
+            for row in reader:
+                if not row:
+                    continue
+                if len(row) < width:
+                    msg = f"Missing field on line {reader.line_num} of {file_path}"
+                    raise ValueError(msg)
+                yield self.make_card(row[front], row[back], reverse, arena)
+
+    @staticmethod
+    def _columns(header: list[str], file_path: Path) -> tuple[int, int]:
+        """Returns the indices of the front and back columns in header."""
+        if "front" not in header or "back" not in header:
+            msg = f"Missing front or back column in {file_path}"
+            raise ValueError(msg)
+        return header.index("front"), header.index("back")
+
+    @staticmethod
+    def _record_end(f: BinaryIO, quoted: bool) -> int:
+        """Reads f to the end of its current record and returns the next record start.
+
+        A newline ends a record only outside quotes. Doubled quotes inside a
+        quoted field leave the quoting unchanged, so whether a newline is
+        quoted follows from the parity of the quotes before it.
+
+        Args:
+            f (BinaryIO): The file, positioned inside or at the start of a record.
+            quoted (bool): Whether the position of f is inside a quoted field.
+
+        Returns:
+            int: The offset just past the newline ending the record.
+        """
+        while block := f.read(SCAN_BLOCK_BYTES):
+            position = 0
+            while (newline := block.find(b"\n", position)) != -1:
+                quoted ^= block.count(b'"', position, newline) % 2 == 1
+                if not quoted:
+                    return f.tell() - len(block) + newline + 1
+                position = newline + 1
+            quoted ^= block.count(b'"', position) % 2 == 1
+        return f.tell()
+
+    def ranges(self, file_path: Path, chunk_bytes: int) -> list[tuple[int, int]]:
+        """Cuts the rows of the csv at file_path into record-aligned byte ranges.
+
+        The header is left out, and newlines inside quoted fields never end
+        a range.
+        """
+        size = file_path.stat().st_size
+        bounds = []
+        with file_path.open("rb") as f:
+            start = self._record_end(f, quoted=False)
+            while start < size:
+                f.seek(start)
+                target = min(start + chunk_bytes, size)
+                quotes = 0
+                remaining = target - start
+                while remaining > 0 and (
+                    block := f.read(min(SCAN_BLOCK_BYTES, remaining))
+                ):
+                    quotes += block.count(b'"')
+                    remaining -= len(block)
+                end = self._record_end(f, quoted=quotes % 2 == 1)
+                bounds.append((start, end))
+                start = end
+        return bounds
+
+    def parse_range(self, file_path: Path, start: int, end: int) -> list[str]:
+        """Parses the csv rows between the byte offsets start and end of file_path."""
+        with file_path.open("r", encoding="utf-8", newline="") as f:
+            header = next(csv.reader(f, delimiter=self.delimiter))
+        front, back = self._columns(header, file_path)
+        width = max(front, back) + 1
+
+        with file_path.open("rb") as f:
+            f.seek(start)
+            text = f.read(end - start).decode("utf-8")
+        fields = []
+        for row in csv.reader(io.StringIO(text, newline=""), delimiter=self.delimiter):
+            if not row:
+                continue
+            if len(row) < width:
+                msg = f"Missing field in {file_path}: {row}"
+                raise ValueError(msg)
+            fields.append(row[front])
+            fields.append(row[back])
+        return fields
 
 
-class TSVFileInputStrategy(FileInputStrategy):
+class TSVFileInputStrategy(CSVFileInputStrategy):
     """This class maintains the logic for reading from tsv files types."""
 
-    def read_cards(self, file_path: Path, reverse: bool = False) -> list[Card]:
-        """Reads the entries from the tsv at file_path."""
-        with file_path.open("r", encoding="utf-8") as f:
-            reader = csv.DictReader(f, delimiter="\t")
-            if reverse:
-                return [Card(e["back"], e["front"]) for e in reader]
-            return [Card(e["front"], e["back"]) for e in reader]
+    delimiter = "\t"
 
 
 class JSONFileInputStrategy(FileInputStrategy):
     """This class maintains the logic for reading from json files types."""
 
-    def read_cards(self, file_path: Path, reverse: bool = False) -> list[Card]:
-        """Reads the entries from the json at file_path."""
+    def iter_cards(
+        self, file_path: Path, reverse: bool = False, arena: TextArena | None = None
+    ) -> Iterator[Card]:
+        """Yields the entries from the json array at file_path as they are decoded."""
         with file_path.open("r", encoding="utf-8") as f:
-            entries = json.load(f)
-            if reverse:
-                return [Card(e["back"], e["front"]) for e in entries]
-            return [Card(e["front"], e["back"]) for e in entries]
+            for e in _iter_json_array(f):
+                yield self.make_card(e["front"], e["back"], reverse, arena)
+
+
+class NDJSONFileInputStrategy(SplittableFileInputStrategy):
+    """This class maintains the logic for reading newline-delimited json files.
+
+    Each non-blank line holds one JSON object with a front and a back.
+    """
+
+    def iter_cards(
+        self, file_path: Path, reverse: bool = False, arena: TextArena | None = None
+    ) -> Iterator[Card]:
+        """Yields the entries from the ndjson at file_path, one line at a time."""
+        with file_path.open("r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    e = json.loads(line)
+                    yield self.make_card(e["front"], e["back"], reverse, arena)
+
+    def parse_range(self, file_path: Path, start: int, end: int) -> list[str]:
+        """Parses the lines between the byte offsets start and end of file_path."""
+        with file_path.open("rb") as f:
+            f.seek(start)
+            text = f.read(end - start).decode("utf-8")
+        fields = []
+        # JSON strings may hold characters that str.splitlines splits on, but
+        # never a raw newline.
+        for line in text.split("\n"):
+            if line.strip():
+                e = json.loads(line)
+                fields.append(e["front"])
+                fields.append(e["back"])
+        return fields
 
 
 class XMLFileInputStrategy(FileInputStrategy):
     """This class maintains the logic for reading from XML files types."""
 
-    def read_cards(self, file_path: Path, reverse: bool = False) -> list[Card]:
-        """Reads the entries from the XML at file_path."""
-        with file_path.open("r", encoding="utf-8") as f:
-            dom = xml.parse(f)
+    def iter_cards(
+        self, file_path: Path, reverse: bool = False, arena: TextArena | None = None
+    ) -> Iterator[Card]:
+        """Yields the entries from the XML at file_path as each card element ends.
+
+        Every card element in the document is read from its first front and
+        back descendants, then detached from the tree, so only the card
+        being parsed and its ancestors are kept in memory.
+        """
+        parents: list[ET.Element] = []
+        with file_path.open("rb") as f:
+            for event, element in ET.iterparse(f, events=("start", "end")):
+                if event == "start":
+                    parents.append(element)
+                    continue
+                parents.pop()
+                if element.tag != "card":
+                    continue
+
+                front_text = self._text(element, "front", file_path)
+                back_text = self._text(element, "back", file_path)
+                if parents:
+                    del parents[-1][-1]
+                yield self.make_card(front_text, back_text, reverse, arena)
+
+    @staticmethod
+    def _text(card: ET.Element, side: str, file_path: Path) -> str:
+        """Returns the text of the first side element of card."""
+        element = next(card.iter(side), None)
+        if element is None or (not element.text and len(element) == 0):
+            msg = f"Missing card {side} in {file_path}"
+            raise ValueError(msg)
+        if not element.text:
+            msg = f"{side.capitalize()} node is not of type Text"
+            raise ValueError(msg)
+        return element.text
 
-        cards = []
-        for card in dom.getElementsByTagName("card"):
-            front_element = card.getElementsByTagName("front")[0].firstChild
-            if not front_element:
-                msg = f"Missing card front in {file_path}"
-                raise ValueError(msg)
-            if not isinstance(front_element, xml.Text):
-                msg = "Front node is not of type Text"
-                raise ValueError(msg)
 
-            back_element = card.getElementsByTagName("back")[0].firstChild
-            if not back_element:
-                msg = f"Missing card back in {file_path}"
-                raise ValueError(msg)
-            if not isinstance(back_element, xml.Text):
-                msg = "Back node is not of type Text"
-                raise ValueError(msg)
+class BinaryFileInputStrategy(FileInputStrategy):
+    """This class maintains the logic for reading memory-mapped binary decks."""
 
-            front_text = front_element.nodeValue
-            back_text = back_element.nodeValue
+    def iter_cards(
+        self, file_path: Path, reverse: bool = False, arena: TextArena | None = None
+    ) -> Iterator[Card]:
+        """Yields the entries of the binary deck at file_path."""
+        yield from self.read_cards(file_path, reverse=reverse, arena=arena)
 
-            if reverse:
-                cards.append(Card(back_text, front_text))
-            else:
-                cards.append(Card(front_text, back_text))
-        return cards
+    def read_cards(
+        self,
+        file_path: Path,
+        reverse: bool = False,
+        arena: TextArena | None = None,
+        cancelled: threading.Event | None = None,
+    ) -> list[Card]:
+        """Maps the binary deck at file_path.
+
+        The text of a binary deck is already deduplicated in the file, so
+        arena is not used. Mapping does not parse the deck, so there is
+        nothing for cancelled to stop.
+        """
+        _ = arena, cancelled
+        return read_binary_deck(file_path, reverse=reverse)
 
 
 class FileInputReader:
@@ -102,6 +540,9 @@ class FileInputReader:
             ".json": JSONFileInputStrategy(),
             ".xml": XMLFileInputStrategy(),
             ".tsv": TSVFileInputStrategy(),
+            ".ndjson": NDJSONFileInputStrategy(),
+            ".jsonl": NDJSONFileInputStrategy(),
+            ".hifzb": BinaryFileInputStrategy(),
         }
 
     def get_strategy(self, file_extension: str) -> FileInputStrategy:
@@ -112,34 +553,258 @@ class FileInputReader:
             raise ValueError(msg)
         return strategy
 
-    def read_cards(self, file_path: str, reverse: bool = False) -> list[Card]:
-        """Reads the entries at file_path."""
+    def read_cards(
+        self,
+        file_path: str,
+        reverse: bool = False,
+        arena: TextArena | None = None,
+        workers: int = 1,
+        cancelled: threading.Event | None = None,
+    ) -> list[Card]:
+        """Reads the entries at file_path, storing their text in arena if one is given.
+
+        Formats that can be split are parsed across workers processes when
+        workers is more than one. The read stops with a CancelledError once
+        cancelled is set.
+        """
+        path = Path(file_path)
+        strategy = self.get_strategy(path.suffix.lower())
+        if workers > 1 and isinstance(strategy, SplittableFileInputStrategy):
+            return strategy.read_cards_parallel(
+                path, reverse=reverse, arena=arena, workers=workers, cancelled=cancelled
+            )
+        return strategy.read_cards(
+            path, reverse=reverse, arena=arena, cancelled=cancelled
+        )
+
+    def iter_cards(
+        self, file_path: str, reverse: bool = False, arena: TextArena | None = None
+    ) -> Iterator[Card]:
+        """Yields the entries at file_path one at a time, as they are parsed."""
         path = Path(file_path)
         strategy = self.get_strategy(path.suffix.lower())
-        return strategy.read_cards(path, reverse=reverse)
+        return strategy.iter_cards(path, reverse=reverse, arena=arena)
+
+
+class SourceLoadError(Exception):
+    """Raised when some of the sources of a deck could not be loaded.
+
+    Attributes:
+        errors (dict[str, Exception]): The error each failed source raised.
+    """
+
+    def __init__(self, errors: dict[str, Exception]) -> None:
+        """Instantiates the error from the errors of the failed sources."""
+        self.errors = errors
+        details = "; ".join(f"{source}: {error}" for source, error in errors.items())
+        super().__init__(f"Could not load {len(errors)} source(s): {details}")
 
 
 class DataServer:
     """This class serves the desired by the client."""
 
-    def __init__(self) -> None:
-        """Instantiates the DataServer."""
+    def __init__(
+        self, url_cache: URLCache | None = None, deck_cache: DeckCache | None = None
+    ) -> None:
+        """Instantiates the DataServer.
+
+        Args:
+            url_cache (URLCache | None): Where decks read from URLs are cached.
+                Defaults to a cache in the user's cache directory.
+            deck_cache (DeckCache | None): Where parsed decks are cached. Decks
+                are parsed on every read when it is None.
+        """
         self.file_reader = FileInputReader()
+        self.url_cache = url_cache or URLCache()
+        self.deck_cache = deck_cache
+
+    def read_cards(
+        self,
+        file_path: str,
+        reverse: bool = False,
+        arena: TextArena | None = None,
+        workers: int = 1,
+        timeout: float | None = None,
+        cancelled: threading.Event | None = None,
+    ) -> list[Card]:
+        """Reads the entries associated with the file at file_path.
+
+        Args:
+            file_path (str): A file path or an http(s) URL.
+            reverse (bool): Swap the front and the back of the cards.
+            arena (TextArena | None): Deduplicated storage for the card text.
+                Cards keep plain strings when it is None.
+            workers (int): The number of processes parsing CSV, TSV and NDJSON
+                decks. One parses in the calling process.
+            timeout (float | None): Seconds to wait for the server of a URL.
+            cancelled (threading.Event | None): Stops parsing with a
+                CancelledError once set.
+
+        Returns:
+            list[Card]: The cards read.
+        """
+        file_path = self._local_path(file_path, timeout)
+        with self._reading(file_path):
+            path = Path(file_path)
+            self.file_reader.get_strategy(path.suffix.lower())
+
+            def parse() -> list[Card]:
+                return self.file_reader.read_cards(
+                    file_path,
+                    reverse=reverse,
+                    arena=arena,
+                    workers=workers,
+                    cancelled=cancelled,
+                )
+
+            if self.deck_cache is None or path.suffix.lower() == ".hifzb":
+                return parse()
+            return self.deck_cache.read_cards(path, parse, reverse=reverse, arena=arena)
+
+    def iter_cards(
+        self, file_path: str, reverse: bool = False, arena: TextArena | None = None
+    ) -> Iterator[Card]:
+        """Yields the entries associated with the file at file_path as they are parsed.
+
+        Only the card being built is held by the reader, so a consumer can
+        handle a deck larger than memory and start before parsing ends.
+
+        Args:
+            file_path (str): A file path or an http(s) URL.
+            reverse (bool): Swap the front and the back of the cards.
+            arena (TextArena | None): Deduplicated storage for the card text.
+                Cards keep plain strings when it is None.
+
+        Yields:
+            Card: The cards, in file order.
+        """
+        file_path = self._local_path(file_path)
+        with self._reading(file_path):
+            yield from self.file_reader.iter_cards(
+                file_path, reverse=reverse, arena=arena
+            )
+
+    def read_sources(
+        self,
+        sources: Sequence[str],
+        reverse: bool = False,
+        arena: TextArena | None = None,
+        workers: int = 1,
+        timeout: float | None = None,
+        max_concurrency: int = MAX_CONCURRENT_SOURCES,
+    ) -> list[Card]:
+        """Reads the entries of several files and URLs concurrently.
+
+        Up to max_concurrency sources are read at once on a thread pool, so
+        the load takes about as long as the slowest source rather than the
+        sum of all of them. The cards keep the order of sources. Sources are
+        read into plain strings and only moved into arena once all of them
+        loaded, as an arena is not safe to share across threads.
+
+        Args:
+            sources (Sequence[str]): File paths and http(s) URLs.
+            reverse (bool): Swap the front and the back of the cards.
+            arena (TextArena | None): Deduplicated storage for the card text.
+            workers (int): The number of processes parsing each CSV, TSV and
+                NDJSON deck.
+            timeout (float | None): Seconds after which a source that is still
+                loading counts as failed. Its parse is cancelled, while a
+                download in progress is only bounded by timeout on each read.
+            max_concurrency (int): The number of sources read at once.
+
+        Returns:
+            list[Card]: The cards of every source, in order.
+
+        Raises:
+            SourceLoadError: If any source failed or timed out, with the error
+                of each.
+        """
+        started: dict[int, float] = {}
+        cancelled = {index: threading.Event() for index in range(len(sources))}
+
+        def read(index: int) -> list[Card]:
+            started[index] = time.monotonic()
+            return self.read_cards(
+                sources[index],
+                reverse=reverse,
+                workers=workers,
+                timeout=timeout,
+                cancelled=cancelled[index],
+            )
+
+        pool = ThreadPoolExecutor(
+            max_workers=max(min(max_concurrency, len(sources)), 1),
+            thread_name_prefix="hifz-load",
+        )
+        futures = {pool.submit(read, index): index for index in range(len(sources))}
+        loaded: dict[int, list[Card]] = {}
+        errors: dict[str, Exception] = {}
+        try:
+            pending = set(futures)
+            while pending:
+                done, pending = wait(
+                    pending,
+                    timeout=self._next_deadline(
+                        started, [futures[f] for f in pending], timeout
+                    ),
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    try:
+                        loaded[futures[future]] = future.result()
+                    except Exception as err:
+                        errors[sources[futures[future]]] = err
+                if timeout is None:
+                    continue
+                now = time.monotonic()
+                for future in list(pending):
+                    index = futures[future]
+                    if index in started and now - started[index] >= timeout:
+                        pending.discard(future)
+                        cancelled[index].set()
+                        errors[sources[index]] = TimeoutError(
+                            f"Timed out after {timeout} seconds"
+                        )
+        finally:
+            for event in cancelled.values():
+                event.set()
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        if errors:
+            raise SourceLoadError(errors)
+        cards = [card for index in range(len(sources)) for card in loaded[index]]
+        if arena is not None:
+            cards = [arena.card(card.front, card.back) for card in cards]
+        return cards
 
-    def read_cards(self, file_path: str, reverse: bool = False) -> list[Card]:
-        """Reads the entries associated with the file at file_path."""
-        uri_info = urlparse(file_path)
-
-        if uri_info.scheme in ["http", "https"]:
-            data = urlopen(file_path).read()
-            with tempfile.TemporaryDirectory(delete=False) as tempdir:
-                filepath = Path(tempdir) / "tmp.csv"
-                with filepath.open("w", encoding="utf-8") as fp:
-                    fp.write(data.decode("utf-8"))
-                file_path = fp.name
-
+    @staticmethod
+    def _next_deadline(
+        started: dict[int, float], pending: list[int], timeout: float | None
+    ) -> float | None:
+        """Returns the seconds until the first running source times out.
+
+        A source starts on a pool thread, so while one is still queued the
+        wait is cut short to pick up its start time and apply its deadline.
+        """
+        if timeout is None:
+            return None
+        deadlines = [started[index] + timeout for index in pending if index in started]
+        if len(deadlines) < len(pending):
+            deadlines.append(time.monotonic() + min(timeout, SOURCE_START_POLL_SECONDS))
+        return max(min(deadlines) - time.monotonic(), 0)
+
+    def _local_path(self, file_path: str, timeout: float | None = None) -> str:
+        """Returns a cached copy of file_path if it is an http(s) URL."""
+        if urlparse(file_path).scheme in ["http", "https"]:
+            return str(self.url_cache.fetch(file_path, timeout=timeout))
+        return file_path
+
+    @staticmethod
+    @contextmanager
+    def _reading(file_path: str) -> Iterator[None]:
+        """Rewords the errors raised while reading file_path."""
         try:
-            return self.file_reader.read_cards(file_path, reverse=reverse)
+            yield
         except FileNotFoundError as err:
             msg = f"Error: The file at path '{file_path}' was not found."
             raise FileNotFoundError(msg) from err
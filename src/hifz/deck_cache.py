@@ -0,0 +1,205 @@
+"""This module caches parsed decks in memory and on disk."""
+
+import hashlib
+import json
+import os
+import threading
+from array import array
+from collections import OrderedDict
+from collections.abc import Callable
+from contextlib import suppress
+from pathlib import Path
+
+from hifz.arena import TextArena
+from hifz.binary_deck import binary_deck_cards, open_binary_deck, write_binary_deck
+from hifz.models import Card
+from hifz.utils import cache_directory, paused_gc, replacing_file
+
+MAX_ENTRIES = 8
+MAX_BYTES = 1 << 29
+INDEX_NAME = "index.json"
+SNAPSHOT_SUFFIX = ".hifzb"
+
+DeckKey = tuple[str, int, int, bool]
+
+
+class DeckCache:
+    """A two-level cache of parsed decks.
+
+    Parsed decks are snapshotted to disk in the compact .hifzb format,
+    named after a hash of their content, their format and whether they were
+    reversed. An index maps the path, modification time and size of a deck
+    to its snapshot, so an unchanged deck is found without reading it. A
+    deck that was touched or copied is hashed, and reuses the snapshot of
+    identical content. Opened snapshots are kept in an in-process LRU, so a
+    reload only builds the card objects.
+
+    Cached cards are fresh objects that share their text with the snapshot,
+    so statistics never leak from one load to the next. The cache is best
+    effort: a deck whose snapshot cannot be read or written is parsed.
+    """
+
+    def __init__(
+        self,
+        directory: Path | None = None,
+        max_entries: int = MAX_ENTRIES,
+        max_bytes: int = MAX_BYTES,
+    ) -> None:
+        """Instantiates the cache.
+
+        Args:
+            directory (Path | None): Where to keep the snapshots. Defaults to
+                the decks directory of the hifz cache.
+            max_entries (int): The number of decks kept open in memory.
+            max_bytes (int): The size the snapshots on disk are evicted down to,
+                least recently used first.
+        """
+        self.directory = directory or cache_directory("decks")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._memory: OrderedDict[DeckKey, tuple[TextArena, array[int]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def read_cards(
+        self,
+        file_path: Path,
+        parse: Callable[[], list[Card]],
+        reverse: bool = False,
+        arena: TextArena | None = None,
+    ) -> list[Card]:
+        """Returns the cards of the deck at file_path, parsing it only on a miss.
+
+        Args:
+            file_path (Path): The deck.
+            parse (Callable[[], list[Card]]): Parses the deck, honouring reverse.
+            reverse (bool): Whether parse swaps the front and the back of the cards.
+            arena (TextArena | None): Deduplicated storage for the card text.
+                Cards decode their text from the snapshot when it is None.
+
+        Returns:
+            list[Card]: The cards of the deck.
+        """
+        status = file_path.stat()
+        key = (str(file_path.resolve()), status.st_mtime_ns, status.st_size, reverse)
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+        if entry is None:
+            try:
+                name, snapshot = self._find_snapshot(key, file_path)
+            except OSError:
+                name, snapshot = None, None
+            if snapshot is None:
+                cards = parse()
+                if name is not None:
+                    # Too many strings for the snapshot format raise ValueError.
+                    with suppress(OSError, ValueError):
+                        self._store(key, name, cards)
+                return cards
+            entry = open_binary_deck(snapshot)
+            self._remember(key, entry)
+
+        text, ids = entry
+        if arena is None:
+            return binary_deck_cards(text, ids)
+        with paused_gc():
+            return [
+                arena.card(text.get(ids[index]), text.get(ids[index + 1]))
+                for index in range(0, len(ids), 2)
+            ]
+
+    def clear(self) -> None:
+        """Forgets the decks kept in memory and removes the snapshots."""
+        with self._lock:
+            self._memory.clear()
+            for snapshot in self.directory.glob(f"*{SNAPSHOT_SUFFIX}"):
+                snapshot.unlink(missing_ok=True)
+            (self.directory / INDEX_NAME).unlink(missing_ok=True)
+
+    def _find_snapshot(self, key: DeckKey, file_path: Path) -> tuple[str, Path | None]:
+        """Returns the name of the snapshot of the deck, and its path if it exists.
+
+        The deck is hashed unless the index knows it.
+        """
+        index = self._read_index()
+        name = index.get(self._index_key(key)) or self._snapshot_name(key, file_path)
+        snapshot = self.directory / name
+        if not snapshot.exists():
+            return name, None
+        os.utime(snapshot)
+        if index.get(self._index_key(key)) != name:
+            with self._lock, suppress(OSError):
+                self._write_index({**self._read_index(), self._index_key(key): name})
+        return name, snapshot
+
+    def _store(self, key: DeckKey, name: str, cards: list[Card]) -> None:
+        """Snapshots cards as name, indexes the snapshot and evicts the oldest ones."""
+        write_binary_deck(cards, self.directory / name)
+        self._remember(key, open_binary_deck(self.directory / name))
+        with self._lock:
+            self._write_index({**self._read_index(), self._index_key(key): name})
+            self._evict(keep=name)
+
+    def _remember(self, key: DeckKey, entry: tuple[TextArena, "array[int]"]) -> None:
+        """Keeps an opened snapshot in memory, dropping the least recently used."""
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _evict(self, keep: str) -> None:
+        """Removes the least recently used snapshots beyond max_bytes."""
+        snapshots = sorted(
+            (snapshot.stat().st_mtime_ns, snapshot)
+            for snapshot in self.directory.glob(f"*{SNAPSHOT_SUFFIX}")
+        )
+        total = sum(snapshot.stat().st_size for _, snapshot in snapshots)
+        for _, snapshot in snapshots:
+            if total <= self.max_bytes:
+                break
+            if snapshot.name == keep:
+                continue
+            total -= snapshot.stat().st_size
+            # A snapshot still mapped by a session cannot be removed on Windows.
+            with suppress(OSError):
+                snapshot.unlink()
+
+        index = self._read_index()
+        live = {
+            entry: name
+            for entry, name in index.items()
+            if (self.directory / name).exists()
+        }
+        if live != index:
+            self._write_index(live)
+
+    @staticmethod
+    def _snapshot_name(key: DeckKey, file_path: Path) -> str:
+        """Names the snapshot of the deck after its content, format and orientation."""
+        digest = hashlib.sha256(f"{file_path.suffix.lower()}:{key[3]}:".encode())
+        with file_path.open("rb") as f:
+            while block := f.read(1 << 20):
+                digest.update(block)
+        return f"{digest.hexdigest()}{SNAPSHOT_SUFFIX}"
+
+    @staticmethod
+    def _index_key(key: DeckKey) -> str:
+        """Returns the key of the deck in the on-disk index."""
+        return json.dumps(key)
+
+    def _read_index(self) -> dict[str, str]:
+        """Returns the snapshot name of each indexed deck."""
+        try:
+            index: dict[str, str] = json.loads(
+                (self.directory / INDEX_NAME).read_text(encoding="utf-8")
+            )
+        except (OSError, ValueError):
+            return {}
+        return index
+
+    def _write_index(self, index: dict[str, str]) -> None:
+        """Replaces the on-disk index."""
+        with replacing_file(self.directory / INDEX_NAME) as f:
+            f.write(json.dumps(index).encode("utf-8"))
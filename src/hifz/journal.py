@@ -0,0 +1,234 @@
+"""This module keeps an append-only journal of the reviews of a session.
+
+Each line of a journal is one review, as a compact JSON array holding its
+sequence number, the position of the card in the session, the time of the
+review in epoch seconds and the feedback data, for example
+``[42,7,1700000000,{"correct":true}]``. A line without feedback data, such
+as ``[43,8,1700000005]``, records that the strategy handed out a card, which
+moves its cursor. A session snapshot records the sequence number of the last
+record folded into it, so the records after it can be replayed on top of it.
+"""
+
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from hifz.models import Card, Feedback, from_epoch_seconds
+from hifz.utils import CardSession, replacing_file
+
+JOURNAL_SUFFIX = ".journal"
+SYNC_EVERY = 64
+SYNC_INTERVAL = 1.0
+TAIL_BLOCK_BYTES = 1 << 12
+
+JournalRecord = tuple[int, int, int, dict[str, Any] | None]
+
+
+def journal_path(snapshot_path: Path) -> Path:
+    """Returns the path of the journal of the session snapshot at snapshot_path."""
+    return snapshot_path.with_name(snapshot_path.name + JOURNAL_SUFFIX)
+
+
+def read_journal(file_path: Path, after: int = 0) -> Iterator[JournalRecord]:
+    """Reads the records of a journal.
+
+    A last line cut short by a crash is ignored.
+
+    Args:
+        file_path (Path): The path of the journal.
+        after (int): Skip the records with this sequence number or lower.
+
+    Yields:
+        JournalRecord: The sequence number, card position, epoch seconds and
+        feedback data of each record, in order. The feedback data of a card
+        hand-out is None.
+    """
+    with file_path.open("rb") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.endswith(b"\n"):
+                return
+            try:
+                sequence, position, seconds, *data = json.loads(line)
+            except ValueError:
+                msg = f"Malformed journal record on line {line_number} of {file_path}"
+                raise ValueError(msg) from None
+            if sequence > after:
+                yield sequence, position, seconds, data[0] if data else None
+
+
+def replay_journal(session: CardSession, file_path: Path) -> int:
+    """Applies the records of a journal that are not folded into session.
+
+    Each record is replayed with the strategy clock set to the time it
+    happened: a review is processed, and a card hand-out asks the strategy
+    for its next card again, so strategies reach the cursor and scheduling
+    state they had. Strategies that draw cards at random may hand out other
+    cards on replay than they did.
+
+    Args:
+        session (CardSession): The session loaded from the snapshot of the journal.
+        file_path (Path): The path of the journal.
+
+    Returns:
+        int: The number of reviews applied.
+    """
+    strategy = session.strategy
+    clock = strategy.clock
+    applied = 0
+    try:
+        for sequence, position, seconds, data in read_journal(
+            file_path, after=session.journal_sequence
+        ):
+            if not 0 <= position < len(session.cards):
+                msg = f"Journal record {sequence} refers to a card outside the session: {position}"
+                raise ValueError(msg)
+            strategy.clock = partial(from_epoch_seconds, seconds)
+            if data is None:
+                strategy.get_next_card(session.cards)
+            else:
+                feedback = strategy.create_feedback()
+                feedback.data = data
+                strategy.process_feedback(session.cards[position], feedback)
+                applied += 1
+            session.journal_sequence = sequence
+    finally:
+        strategy.clock = clock
+    return applied
+
+
+class ReviewJournal:
+    """Appends the reviews and card hand-outs of a session to its journal.
+
+    Records are buffered and flushed to disk once sync_every of them are
+    pending, or when one is appended sync_interval seconds after the last
+    flush, so a crash loses at most that many reviews. Appending and
+    discarding folded reviews may happen on different threads.
+    """
+
+    def __init__(
+        self,
+        file_path: Path,
+        cards: list[Card],
+        sequence: int = 0,
+        sync_every: int = SYNC_EVERY,
+        sync_interval: float = SYNC_INTERVAL,
+    ) -> None:
+        """Opens the journal for appending.
+
+        Args:
+            file_path (Path): The path of the journal.
+            cards (list[Card]): The cards of the session, in order.
+            sequence (int): The sequence number of the last review recorded.
+            sync_every (int): The number of reviews flushed to disk together.
+            sync_interval (float): Seconds after which pending reviews are flushed.
+        """
+        self.file_path = file_path
+        self.sequence = sequence
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self._positions = {id(card): position for position, card in enumerate(cards)}
+        self._pending = 0
+        self._synced_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._file = file_path.open("a+b")
+        self._drop_torn_record()
+
+    def _drop_torn_record(self) -> None:
+        """Drops a record cut short by a crash, so the next one starts a line.
+
+        Only the end of the journal is read, back to its last newline.
+        """
+        end = self._file.seek(0, os.SEEK_END)
+        if end == 0:
+            return
+        self._file.seek(end - 1)
+        if self._file.read(1) == b"\n":
+            return
+        while end > 0:
+            start = max(end - TAIL_BLOCK_BYTES, 0)
+            self._file.seek(start)
+            newline = self._file.read(end - start).rfind(b"\n")
+            if newline >= 0:
+                self._file.truncate(start + newline + 1)
+                return
+            end = start
+        self._file.truncate(0)
+
+    def append(self, card: Card, feedback: Feedback, seconds: int) -> None:
+        """Records a review.
+
+        Args:
+            card (Card): The card reviewed.
+            feedback (Feedback): The feedback given.
+            seconds (int): The time of the review, in epoch seconds.
+        """
+        self._write(card, seconds, feedback.data)
+
+    def hand_out(self, card: Card, seconds: int) -> None:
+        """Records that the strategy handed out card.
+
+        Args:
+            card (Card): The card handed out.
+            seconds (int): The time of the hand-out, in epoch seconds.
+        """
+        self._write(card, seconds)
+
+    def _write(self, card: Card, seconds: int, *data: dict[str, Any]) -> None:
+        """Appends a record about card, flushing the pending records when due."""
+        position = self._positions[id(card)]
+        with self._lock:
+            self.sequence += 1
+            record = [self.sequence, position, seconds, *data]
+            self._file.write(
+                json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n"
+            )
+            self._pending += 1
+            if (
+                self._pending >= self.sync_every
+                or time.monotonic() - self._synced_at >= self.sync_interval
+            ):
+                self._sync()
+
+    def sync(self) -> None:
+        """Flushes the pending reviews to disk."""
+        with self._lock:
+            self._sync()
+
+    def _sync(self) -> None:
+        """Flushes the pending reviews to disk, with the lock held."""
+        if self._pending:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._pending = 0
+        self._synced_at = time.monotonic()
+
+    def discard_through(self, sequence: int) -> None:
+        """Drops the reviews up to sequence, once a snapshot holds them.
+
+        Args:
+            sequence (int): The sequence number of the last review folded.
+        """
+        with self._lock:
+            self._sync()
+            self._file.close()
+            try:
+                with (
+                    self.file_path.open("rb") as source,
+                    replacing_file(self.file_path, sync=True) as target,
+                ):
+                    for line in source:
+                        if line.endswith(b"\n") and json.loads(line)[0] > sequence:
+                            target.write(line)
+            finally:
+                self._file = self.file_path.open("a+b")
+
+    def close(self) -> None:
+        """Flushes the pending reviews and closes the journal."""
+        with self._lock:
+            self._sync()
+            self._file.close()
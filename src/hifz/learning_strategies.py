@@ -1,16 +1,49 @@
 """This module maintains the strategies associated with order of card display."""
 
+import copy
+import heapq
+import locale
 import random
+import unicodedata
 from abc import ABC, abstractmethod
-from datetime import datetime, timedelta
-from typing import Any
-
-from hifz.models import BinaryFeedback, Card, Feedback
+from collections import deque
+from collections.abc import Callable, Hashable, Iterable
+from datetime import datetime
+from itertools import islice
+from typing import TYPE_CHECKING, Any
+
+from hifz.models import (
+    SECONDS_PER_DAY,
+    BinaryFeedback,
+    Card,
+    Feedback,
+    SessionStatistics,
+    as_epoch_seconds,
+    to_epoch_seconds,
+)
+
+if TYPE_CHECKING:
+    from hifz.columnar import ColumnarStatistics
 
 STRATEGY_NAME_TO_CLASS: dict[str, type["CardStrategy"]] = {}
 STRATEGY_CLASS_TO_NAME: dict[type["CardStrategy"], str] = {}
 
 
+def _unicode_collation_key(text: str) -> str:
+    """Sorts text by its base letters, ignoring case and combining marks."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(
+        char for char in decomposed if not unicodedata.combining(char)
+    ).casefold()
+
+
+COLLATION_KEYS: dict[str, Callable[[str], Any]] = {
+    "codepoint": str,
+    "unicode": _unicode_collation_key,
+    "locale": locale.strxfrm,
+}
+
+
 def register_strategy(name: str):
     """Decorator to register a strategy with a two-way mapping."""
 
@@ -25,8 +58,238 @@ def register_strategy(name: str):
     return decorator
 
 
+class FenwickTree:
+    """A binary indexed tree over non-negative weights.
+
+    Setting a weight, computing a prefix sum and finding the position that
+    holds a given cumulative weight all cost O(log n).
+    """
+
+    def __init__(self, weights: list[float]) -> None:
+        """Builds the tree over weights in O(n).
+
+        Args:
+            weights (list[float]): The initial weight of each position.
+        """
+        self.weights = list(weights)
+        self.tree = [0.0, *self.weights]
+        for index in range(1, len(self.tree)):
+            parent = index + (index & -index)
+            if parent < len(self.tree):
+                self.tree[parent] += self.tree[index]
+        self._step = 1 << (len(self.weights).bit_length() - 1) if self.weights else 0
+
+    def __len__(self) -> int:
+        """Returns the number of positions."""
+        return len(self.weights)
+
+    def set(self, position: int, weight: float) -> None:
+        """Sets the weight at position."""
+        delta = weight - self.weights[position]
+        self.weights[position] = weight
+        index = position + 1
+        while index < len(self.tree):
+            self.tree[index] += delta
+            index += index & -index
+
+    def prefix_sum(self, end: int) -> float:
+        """Returns the sum of the weights of the positions before end."""
+        total = 0.0
+        while end > 0:
+            total += self.tree[end]
+            end -= end & -end
+        return total
+
+    def total(self) -> float:
+        """Returns the sum of all weights."""
+        return self.prefix_sum(len(self.weights))
+
+    def find(self, target: float) -> int:
+        """Returns the position whose cumulative weight range contains target.
+
+        Args:
+            target (float): A value in [0, total()).
+
+        Returns:
+            int: The smallest position whose prefix sum including itself exceeds target.
+        """
+        index = 0
+        step = self._step
+        while step:
+            following = index + step
+            if following < len(self.tree) and self.tree[following] <= target:
+                index = following
+                target -= self.tree[following]
+            step >>= 1
+        return min(index, len(self.weights) - 1)
+
+
 class CardStrategy(ABC):
-    """Interface for card memorization strategies."""
+    """Interface for card memorization strategies.
+
+    Strategies that schedule by time read it from clock, which simulations
+    replace to run on synthetic time. Strategies that draw cards at random
+    draw from rng, which simulations replace with a seeded one.
+    """
+
+    def __init__(self) -> None:
+        """Instantiates the per-deck state shared by every strategy."""
+        self.statistics = SessionStatistics()
+        self.clock: Callable[[], datetime] = datetime.now
+        self.rng = random.Random()
+        self.revision = 0
+        self._drawn: deque[int] = deque()
+        self._cards: list[Card] | None = None
+        self._columns: ColumnarStatistics | None = None
+        self._deck_size = 0
+        self._positions: dict[int, int] = {}
+
+    def prepare(
+        self, cards: list[Card], columns: "ColumnarStatistics | None" = None
+    ) -> None:
+        """Builds the per-deck state the strategy keeps between calls.
+
+        Called whenever a new deck is attached so that strategies can build
+        their indices once instead of rescanning the deck on every call.
+
+        Args:
+            cards (list[Card]): The deck the strategy will be serving.
+            columns (ColumnarStatistics | None): The columnar store backing the
+                statistics of cards, if any, for vectorized scans.
+        """
+        self._cards = cards
+        self._columns = columns
+        self._invalidate_lookahead()
+        self._deck_size = len(cards)
+        self._positions = {id(card): position for position, card in enumerate(cards)}
+        self.statistics = self._scan_statistics(cards)
+
+    def _ensure_prepared(self, cards: list[Card]) -> None:
+        """Rebuilds the per-deck state if cards is not the deck last prepared."""
+        if cards is not self._cards or len(cards) != self._deck_size:
+            self.prepare(cards)
+
+    def _position(self, card: Card) -> int | None:
+        """Returns the position of card in the prepared deck, if it is part of it."""
+        return self._positions.get(id(card))
+
+    def peek_next(self, cards: list[Card], k: int) -> list[Card]:
+        """Returns the next k cards, without advancing the strategy.
+
+        These are the cards the next k calls to get_next_card return as long
+        as no feedback bumps revision in between. The default simulates the
+        calls on a copy of the strategy; strategies override it with cheaper
+        lookups, and random strategies draw their picks ahead of time.
+
+        Args:
+            cards (list[Card]): List of all available cards.
+            k (int): The number of cards to look ahead.
+
+        Returns:
+            list[Card]: The upcoming cards, in order.
+        """
+        self._ensure_prepared(cards)
+        memo: dict[int, Any] = {id(cards): cards, id(self._columns): self._columns}
+        memo.update((id(card), card) for card in cards)
+        simulation = copy.deepcopy(self, memo)
+        return [simulation.get_next_card(cards) for _ in range(k)]
+
+    def peek_expiry(self, cards: list[Card]) -> int | None:
+        """Returns when peek_next may start returning other cards by itself.
+
+        Strategies that schedule by time override this; the others only
+        change their upcoming cards through feedback, which bumps revision.
+
+        Args:
+            cards (list[Card]): List of all available cards.
+
+        Returns:
+            int | None: The epoch second from which cards peeked now may be
+            stale even if revision is unchanged, or None if they stay current.
+        """
+        _ = cards
+        return None
+
+    def get_next_cards(self, cards: list[Card], k: int) -> list[Card]:
+        """Returns the next k cards, advancing the strategy past them.
+
+        Args:
+            cards (list[Card]): List of all available cards.
+            k (int): The number of cards to return.
+
+        Returns:
+            list[Card]: The next cards, in order.
+        """
+        return [self.get_next_card(cards) for _ in range(k)]
+
+    def _invalidate_lookahead(self) -> None:
+        """Marks previously peeked cards as stale.
+
+        Strategies call this whenever feedback changes which cards come next,
+        which also discards any picks drawn ahead of time.
+        """
+        self.revision += 1
+        self._drawn.clear()
+
+    def _draw_ahead(self, k: int, draw: Callable[[], int]) -> list[int]:
+        """Tops up the picks drawn ahead of time to k and returns the first k."""
+        while len(self._drawn) < k:
+            self._drawn.append(draw())
+        return list(islice(self._drawn, k))
+
+    def _is_reviewed(self, card: Card) -> bool:
+        """Returns whether card has received feedback before."""
+        data = card.statistics.data
+        return bool(data.get("correct") or data.get("incorrect") or data.get("seen"))
+
+    def _is_mastered(self, card: Card) -> bool:
+        """Returns whether card counts as mastered. Overridden by strategies that track mastery."""
+        _ = card
+        return False
+
+    def _scan_statistics(self, cards: list[Card]) -> SessionStatistics:
+        """Computes the running totals from the statistics stored on cards."""
+        if self._columns is not None:
+            return SessionStatistics(
+                correct=self._columns.total("correct"),
+                incorrect=self._columns.total("incorrect"),
+                seen=self._columns.count_reviewed(),
+                mastered=self._count_mastered(cards),
+            )
+        statistics = SessionStatistics()
+        for card in cards:
+            statistics.correct += card.statistics.get(key="correct", default=0)
+            statistics.incorrect += card.statistics.get(key="incorrect", default=0)
+            statistics.seen += self._is_reviewed(card)
+        statistics.mastered = self._count_mastered(cards)
+        return statistics
+
+    def _count_mastered(self, cards: list[Card]) -> int:
+        """Counts the mastered cards in cards."""
+        return sum(self._is_mastered(card) for card in cards)
+
+    def _snapshot(self, card: Card) -> tuple[bool, bool]:
+        """Captures what _record_review needs to know about card before an update."""
+        return self._is_reviewed(card), self._is_mastered(card)
+
+    def _record_review(
+        self, card: Card, correct: bool, snapshot: tuple[bool, bool]
+    ) -> None:
+        """Updates the running totals after feedback for card has been applied.
+
+        Args:
+            card (Card): The card that was reviewed.
+            correct (bool): Whether the card was answered correctly.
+            snapshot (tuple[bool, bool]): The result of _snapshot before the update.
+        """
+        was_reviewed, was_mastered = snapshot
+        if correct:
+            self.statistics.correct += 1
+        else:
+            self.statistics.incorrect += 1
+        if not was_reviewed:
+            self.statistics.seen += 1
+        self.statistics.mastered += self._is_mastered(card) - was_mastered
 
     @abstractmethod
     def get_next_card(self, cards: list[Card]) -> Card:
@@ -45,6 +308,73 @@ class CardStrategy(ABC):
             feedback (Feedback): The feedback associated with the card.
         """
 
+    def process_feedback_batch(self, reviews: Iterable[tuple[Card, Feedback]]) -> int:
+        """Processes a sequence of reviews in one pass.
+
+        Every feedback is validated while the reviews are collected, before
+        any is applied, so an invalid entry leaves the statistics untouched.
+        Feedback sharing a metadata key is checked against metadata computed
+        once for the whole batch.
+
+        Args:
+            reviews (Iterable[tuple[Card, Feedback]]): The reviews, in the order they happened.
+
+        Returns:
+            int: The number of reviews applied.
+        """
+        validated: list[tuple[Card, Feedback]] = []
+        metadata_by_key: dict[Hashable, dict[str, dict[str, Any]]] = {}
+        for card, feedback in reviews:
+            key = feedback.metadata_key()
+            if key is None:
+                feedback.validate()
+            else:
+                metadata = metadata_by_key.get(key)
+                if metadata is None:
+                    metadata = metadata_by_key[key] = feedback.get_metadata()
+                feedback.validate(metadata)
+            validated.append((card, feedback))
+        self._apply_batch(validated)
+        return len(validated)
+
+    def _apply_review(self, card: Card, feedback: Feedback) -> None:
+        """Applies already validated feedback to the card.
+
+        Strategies override this with process_feedback minus the validation;
+        the default simply defers to process_feedback.
+        """
+        self.process_feedback(card, feedback)
+
+    def _apply_batch(self, reviews: list[tuple[Card, Feedback]]) -> None:
+        """Applies validated reviews in order. Hook for vectorized implementations."""
+        for card, feedback in reviews:
+            self._apply_review(card, feedback)
+
+    def _apply_counts_vectorized(self, reviews: list[tuple[Card, Feedback]]) -> bool:
+        """Adds the correct and incorrect counts of reviews to the columnar store.
+
+        Only valid for strategies whose feedback does nothing but count correct
+        and incorrect answers.
+
+        Returns:
+            bool: False if the reviews could not be applied this way, because
+                there is no columnar store or a card is not part of the deck.
+        """
+        if self._columns is None:
+            return False
+        positions = []
+        for card, _ in reviews:
+            position = self._position(card)
+            if position is None:
+                return False
+            positions.append(position)
+        outcomes = [bool(feedback.get("correct")) for _, feedback in reviews]
+        self.statistics.seen += self._columns.add_counts(positions, outcomes)
+        correct = sum(outcomes)
+        self.statistics.correct += correct
+        self.statistics.incorrect += len(outcomes) - correct
+        return True
+
     @abstractmethod
     def create_feedback(self) -> Feedback:
         """Creates the feedback associated with the strategy.
@@ -113,7 +443,16 @@ class RandomStrategy(CardStrategy):
 
     def get_next_card(self, cards: list[Card]) -> Card:
         """Returns the next card."""
-        return random.choice(cards)
+        self._ensure_prepared(cards)
+        if self._drawn:
+            return cards[self._drawn.popleft()]
+        return self.rng.choice(cards)
+
+    def peek_next(self, cards: list[Card], k: int) -> list[Card]:
+        """Draws the next k cards ahead of time and returns them."""
+        self._ensure_prepared(cards)
+        drawn = self._draw_ahead(k, lambda: self.rng.randrange(len(cards)))
+        return [cards[position] for position in drawn]
 
     def process_feedback(self, card: Card, feedback: Feedback) -> None:
         """Processes the user feedback.
@@ -123,6 +462,11 @@ class RandomStrategy(CardStrategy):
             feedback (Feedback): The user feedback associated with the card.
         """
         feedback.validate()
+        self._apply_review(card, feedback)
+
+    def _apply_review(self, card: Card, feedback: Feedback) -> None:
+        """Applies already validated feedback to the card."""
+        snapshot = self._snapshot(card)
         card.statistics.update(
             key="correct",
             value=1 if feedback.get("correct") else 0,
@@ -133,19 +477,24 @@ class RandomStrategy(CardStrategy):
             value=0 if feedback.get("correct") else 1,
             update_function=lambda existing, new: (existing or 0) + new,
         )
+        self._record_review(card, feedback.get("correct"), snapshot)
+
+    def _apply_batch(self, reviews: list[tuple[Card, Feedback]]) -> None:
+        """Applies validated reviews, vectorized when the statistics are columnar."""
+        if not self._apply_counts_vectorized(reviews):
+            super()._apply_batch(reviews)
 
     def create_feedback(self) -> Feedback:
         """Gets the type of Feedback this strategy uses."""
         return BinaryFeedback("correct")
 
     def aggregate_statistics(self, cards: list[Card]) -> dict[str, Any]:
-        """Computes total number of correct and incorrect."""
-        total_correct = 0
-        total_incorrect = 0
-        for card in cards:
-            total_correct += card.statistics.get(key="correct", default=0)
-            total_incorrect += card.statistics.get(key="incorrect", default=0)
-        return {"Correct": total_correct, "Incorrect": total_incorrect}
+        """Returns the running totals of correct and incorrect answers."""
+        self._ensure_prepared(cards)
+        return {
+            "Correct": self.statistics.correct,
+            "Incorrect": self.statistics.incorrect,
+        }
 
 
 @register_strategy("sequential")
@@ -154,6 +503,7 @@ class SequentialStrategy(CardStrategy):
 
     def __init__(self) -> None:
         """Instantiates the Sequential Strategy."""
+        super().__init__()
         self.index = 0
 
     def get_next_card(self, cards: list[Card]) -> Card:
@@ -162,6 +512,10 @@ class SequentialStrategy(CardStrategy):
         self.index = (self.index + 1) % len(cards)
         return card
 
+    def peek_next(self, cards: list[Card], k: int) -> list[Card]:
+        """Returns the next k cards in order."""
+        return [cards[(self.index + offset) % len(cards)] for offset in range(k)]
+
     def process_feedback(self, card: Card, feedback: Feedback) -> None:
         """Processes the user feedback.
 
@@ -170,6 +524,11 @@ class SequentialStrategy(CardStrategy):
             feedback (Feedback): The user feedback associated with the card.
         """
         feedback.validate()
+        self._apply_review(card, feedback)
+
+    def _apply_review(self, card: Card, feedback: Feedback) -> None:
+        """Applies already validated feedback to the card."""
+        snapshot = self._snapshot(card)
         card.statistics.update(
             key="correct",
             value=1 if feedback.get("correct") else 0,
@@ -180,46 +539,120 @@ class SequentialStrategy(CardStrategy):
             value=0 if feedback.get("correct") else 1,
             update_function=lambda existing, new: (existing or 0) + new,
         )
+        self._record_review(card, feedback.get("correct"), snapshot)
+
+    def _apply_batch(self, reviews: list[tuple[Card, Feedback]]) -> None:
+        """Applies validated reviews, vectorized when the statistics are columnar."""
+        if not self._apply_counts_vectorized(reviews):
+            super()._apply_batch(reviews)
 
     def create_feedback(self) -> Feedback:
         """Gets the type of Feedback this strategy uses."""
         return BinaryFeedback("correct")
 
     def aggregate_statistics(self, cards: list[Card]) -> dict[str, Any]:
-        """Computes total number of correct and incorrect."""
-        total_correct = 0
-        total_incorrect = 0
-        for card in cards:
-            total_correct += card.statistics.get(key="correct", default=0)
-            total_incorrect += card.statistics.get(key="incorrect", default=0)
-        return {"Correct": total_correct, "Incorrect": total_incorrect}
+        """Returns the running totals of correct and incorrect answers."""
+        self._ensure_prepared(cards)
+        return {
+            "Correct": self.statistics.correct,
+            "Incorrect": self.statistics.incorrect,
+        }
 
 
 @register_strategy("mastery")
 class MasteryStrategy(CardStrategy):
-    """This class maintains the logic associated with a card ordering for mastery learning."""
+    """This class maintains the logic associated with a card ordering for mastery learning.
+
+    The cards below the mastery threshold are kept in an indexed set of deck
+    positions that process_feedback updates as cards cross the threshold, so
+    the next card is picked in O(1). Removal swaps the last member into the
+    freed slot, so the rotation order is not the deck order.
+    """
 
     def __init__(self, threshold: int = 5) -> None:
         """Instantiates the Mastery Strategy with a configurable mastery threshold."""
+        super().__init__()
         self.index = 0
         self.threshold = threshold
+        self._low_mastery: list[int] = []
+        self._slots: list[int] = []
+
+    def prepare(
+        self, cards: list[Card], columns: "ColumnarStatistics | None" = None
+    ) -> None:
+        """Builds the set of cards below the mastery threshold.
+
+        Args:
+            cards (list[Card]): The deck the strategy will be serving.
+            columns (ColumnarStatistics | None): The columnar store backing the
+                statistics of cards, if any.
+        """
+        super().prepare(cards, columns)
+        if columns is not None:
+            self._low_mastery = columns.positions_below("correct", self.threshold)
+        else:
+            self._low_mastery = [
+                position
+                for position, card in enumerate(cards)
+                if not self._is_mastered(card)
+            ]
+        self._slots = [-1] * len(cards)
+        for slot, position in enumerate(self._low_mastery):
+            self._slots[position] = slot
+
+    def _count_mastered(self, cards: list[Card]) -> int:
+        """Counts the cards whose correct streak has reached the threshold."""
+        if self._columns is not None:
+            return self._columns.count_at_least("correct", self.threshold)
+        return super()._count_mastered(cards)
+
+    def _is_mastered(self, card: Card) -> bool:
+        """Returns whether the card's correct streak has reached the threshold."""
+        return bool(card.statistics.data.get("correct", 0) >= self.threshold)
+
+    def _track(self, card: Card) -> None:
+        """Moves card in or out of the low mastery set after its streak changed."""
+        position = self._position(card)
+        if position is None:
+            return
+        slot = self._slots[position]
+        if not self._is_mastered(card):
+            if slot < 0:
+                self._slots[position] = len(self._low_mastery)
+                self._low_mastery.append(position)
+                self._invalidate_lookahead()
+        elif slot >= 0:
+            self._invalidate_lookahead()
+            last = self._low_mastery.pop()
+            if last != position:
+                self._low_mastery[slot] = last
+                self._slots[last] = slot
+            self._slots[position] = -1
 
     def get_next_card(self, cards: list[Card]) -> Card:
         """Returns the next card, prioritizing those below the mastery threshold."""
-        low_mastery_cards = [
-            card
-            for card in cards
-            if card.statistics.data.get("correct", 0) < self.threshold
-        ]
+        self._ensure_prepared(cards)
+        low_mastery = self._low_mastery
 
-        if low_mastery_cards:
-            card = low_mastery_cards[self.index % len(low_mastery_cards)]
-            self.index = (self.index + 1) % len(low_mastery_cards)
+        if low_mastery:
+            card = cards[low_mastery[self.index % len(low_mastery)]]
+            self.index = (self.index + 1) % len(low_mastery)
         else:
             card = cards[self.index % len(cards)]
             self.index = (self.index + 1) % len(cards)
         return card
 
+    def peek_next(self, cards: list[Card], k: int) -> list[Card]:
+        """Returns the next k cards of the rotation."""
+        self._ensure_prepared(cards)
+        low_mastery = self._low_mastery
+        if low_mastery:
+            return [
+                cards[low_mastery[(self.index + offset) % len(low_mastery)]]
+                for offset in range(k)
+            ]
+        return [cards[(self.index + offset) % len(cards)] for offset in range(k)]
+
     def process_feedback(self, card: Card, feedback: Feedback) -> None:
         """Processes the user feedback.
 
@@ -228,6 +661,12 @@ class MasteryStrategy(CardStrategy):
             feedback (Feedback): The user feedback associated with the card.
         """
         feedback.validate()
+        self._apply_review(card, feedback)
+
+    def _apply_review(self, card: Card, feedback: Feedback) -> None:
+        """Applies already validated feedback to the card."""
+        snapshot = self._snapshot(card)
+        streak = card.statistics.get(key="correct", default=0)
 
         if feedback.get("correct"):
             card.statistics.update(
@@ -241,25 +680,36 @@ class MasteryStrategy(CardStrategy):
                 value=0,
                 update_function=lambda _, new: new,
             )
+            card.statistics.update(
+                key="incorrect",
+                value=1,
+                update_function=lambda existing, new: (existing or 0) + new,
+            )
 
         card.statistics.update(
             key="seen",
             value=1,
             update_function=lambda existing, new: (existing or 0) + new,
         )
+        self._track(card)
+        self._record_review(card, feedback.get("correct"), snapshot)
+        if not feedback.get("correct"):
+            # The correct total sums the streaks, as a scan of the cards does.
+            self.statistics.correct -= streak
 
     def create_feedback(self) -> Feedback:
         """Gets the type of Feedback this strategy uses."""
         return BinaryFeedback("correct")
 
     def aggregate_statistics(self, cards: list[Card]) -> dict[str, Any]:
-        """Computes total number of correct and incorrect."""
-        total_correct = 0
-        total_incorrect = 0
-        for card in cards:
-            total_correct += card.statistics.get(key="correct", default=0)
-            total_incorrect += card.statistics.get(key="incorrect", default=0)
-        return {"Correct": total_correct, "Incorrect": total_incorrect}
+        """Returns the summed correct streaks, misses, reviewed and mastered cards."""
+        self._ensure_prepared(cards)
+        return {
+            "Correct": self.statistics.correct,
+            "Incorrect": self.statistics.incorrect,
+            "Seen": self.statistics.seen,
+            "Mastered": self.statistics.mastered,
+        }
 
     def _serialize_state(self) -> dict[str, Any]:
         """Serializes the strategy state."""
@@ -275,7 +725,133 @@ class MasteryStrategy(CardStrategy):
 
 @register_strategy("spaced_repetition")
 class SimpleSpacedRepetitionStrategy(CardStrategy):
-    """This class implements a simple spaced repetition algorithm."""
+    """This class implements a simple spaced repetition algorithm.
+
+    Due times are whole seconds since the epoch, stored in the ``due``
+    statistic and kept in a min-heap of ``(due, position, version)`` entries
+    that is built once per deck and updated as feedback is processed, so
+    picking the next card costs O(log n) rather than a sort of the deck.
+    Rescheduling a card pushes a new entry and bumps the card's version;
+    entries with an outdated version are discarded lazily.
+
+    The number of due cards is kept as a running count up to a watermark
+    time, with a second heap holding the entries due after it, so counting
+    due cards costs O(log n) per card that became due since the last count.
+    """
+
+    MAX_INTERVAL_DAYS = 36_500
+
+    def __init__(self) -> None:
+        """Instantiates the SimpleSpacedRepetitionStrategy."""
+        super().__init__()
+        self._due_heap: list[tuple[int, int, int]] = []
+        self._due_keys: list[int] = []
+        self._versions: list[int] = []
+        self._watermark = 0
+        self._due_count = 0
+        self._scheduled: list[tuple[int, int, int]] = []
+
+    def prepare(
+        self, cards: list[Card], columns: "ColumnarStatistics | None" = None
+    ) -> None:
+        """Builds the due-index for cards.
+
+        Cards that have never been scheduled are treated as due at the time
+        the index is built. Due datetimes left by older sessions are read as
+        epoch seconds.
+
+        Args:
+            cards (list[Card]): The deck the strategy will be serving.
+            columns (ColumnarStatistics | None): The columnar store backing the
+                statistics of cards, if any.
+        """
+        super().prepare(cards, columns)
+        now = to_epoch_seconds(self.clock())
+        self._due_keys = [
+            as_epoch_seconds(card.statistics.data.get("due", now)) for card in cards
+        ]
+        self._versions = [0] * len(cards)
+        self._watermark = now
+        self._rebuild_heap()
+
+    def _rebuild_heap(self) -> None:
+        """Recreates the heaps from the current due keys, dropping stale entries."""
+        self._due_heap = [
+            (due, position, self._versions[position])
+            for position, due in enumerate(self._due_keys)
+        ]
+        heapq.heapify(self._due_heap)
+        self._scheduled = [
+            entry for entry in self._due_heap if entry[0] > self._watermark
+        ]
+        heapq.heapify(self._scheduled)
+        self._due_count = len(self._due_heap) - len(self._scheduled)
+
+    def _peek_due(self) -> tuple[int, int] | None:
+        """Returns the earliest ``(due, position)`` pair, discarding stale entries."""
+        heap = self._due_heap
+        while heap:
+            due, position, version = heap[0]
+            if self._versions[position] == version:
+                return due, position
+            heapq.heappop(heap)
+        return None
+
+    def _reschedule(self, card: Card, due: int) -> None:
+        """Moves card to its new due time in the index."""
+        position = self._position(card)
+        if position is None:
+            return
+        self._invalidate_lookahead()
+        if self._due_keys[position] <= self._watermark:
+            self._due_count -= 1
+        self._versions[position] += 1
+        self._due_keys[position] = due
+        entry = (due, position, self._versions[position])
+        heapq.heappush(self._due_heap, entry)
+        if due <= self._watermark:
+            self._due_count += 1
+        else:
+            heapq.heappush(self._scheduled, entry)
+        if len(self._due_heap) + len(self._scheduled) > 3 * len(self._due_keys) + 16:
+            self._rebuild_heap()
+
+    def count_due(self, now: datetime | None = None) -> int:
+        """Counts the cards that are due at now.
+
+        Counting at or after the previous count moves the watermark forward
+        over the cards that became due in between. Counting an earlier time
+        visits the part of the heap holding entries due at or before it.
+
+        Args:
+            now (datetime | None): The reference time. Defaults to the strategy clock.
+
+        Returns:
+            int: The number of cards due for review.
+        """
+        cutoff = to_epoch_seconds(self.clock() if now is None else now)
+        if cutoff >= self._watermark:
+            scheduled = self._scheduled
+            while scheduled and scheduled[0][0] <= cutoff:
+                _, position, version = heapq.heappop(scheduled)
+                self._due_count += self._versions[position] == version
+            self._watermark = cutoff
+            return self._due_count
+
+        heap = self._due_heap
+        count = 0
+        pending = [0] if heap else []
+        while pending:
+            index = pending.pop()
+            due, position, version = heap[index]
+            if due > cutoff:
+                continue
+            if self._versions[position] == version:
+                count += 1
+            pending.extend(
+                child for child in (2 * index + 1, 2 * index + 2) if child < len(heap)
+            )
+        return count
 
     def get_next_card(self, cards: list[Card]) -> Card:
         """Returns the next card to review based on due time.
@@ -286,17 +862,35 @@ class SimpleSpacedRepetitionStrategy(CardStrategy):
         Returns:
             Card: The next card to review.
         """
-        now = datetime.now()
-        sorted_cards = sorted(
-            cards, key=lambda card: card.statistics.data.get("due", now)
-        )
-
-        for card in sorted_cards:
-            due = card.statistics.data.get("due", now)
-            if due <= now:
-                return card
-
-        return random.choice(cards)
+        self._ensure_prepared(cards)
+        earliest = self._peek_due()
+        if earliest is not None and earliest[0] <= to_epoch_seconds(self.clock()):
+            return cards[earliest[1]]
+        if self._drawn:
+            return cards[self._drawn.popleft()]
+
+        return self.rng.choice(cards)
+
+    def peek_expiry(self, cards: list[Card]) -> int | None:
+        """Returns the due time of the earliest card while it is not due yet."""
+        self._ensure_prepared(cards)
+        earliest = self._peek_due()
+        if earliest is not None and earliest[0] > to_epoch_seconds(self.clock()):
+            return earliest[0]
+        return None
+
+    def peek_next(self, cards: list[Card], k: int) -> list[Card]:
+        """Returns the next k cards.
+
+        Without feedback the earliest due card keeps coming up; when no card
+        is due the random picks are drawn ahead of time.
+        """
+        self._ensure_prepared(cards)
+        earliest = self._peek_due()
+        if earliest is not None and earliest[0] <= to_epoch_seconds(self.clock()):
+            return [cards[earliest[1]]] * k
+        drawn = self._draw_ahead(k, lambda: self.rng.randrange(len(cards)))
+        return [cards[position] for position in drawn]
 
     def process_feedback(self, card: Card, feedback: Feedback) -> None:
         """Process feedback and schedule the next review.
@@ -306,6 +900,11 @@ class SimpleSpacedRepetitionStrategy(CardStrategy):
             feedback (Feedback): The feedback provided by the user.
         """
         feedback.validate()
+        self._apply_review(card, feedback)
+
+    def _apply_review(self, card: Card, feedback: Feedback) -> None:
+        """Applies already validated feedback to the card."""
+        snapshot = self._snapshot(card)
         card.statistics.update(
             key="correct",
             value=1 if feedback.get("correct") else 0,
@@ -323,7 +922,7 @@ class SimpleSpacedRepetitionStrategy(CardStrategy):
             interval = card.statistics.data.get("interval", 1)
             card.statistics.update(
                 key="interval",
-                value=interval * ease_factor,
+                value=min(interval * ease_factor, self.MAX_INTERVAL_DAYS),
                 update_function=lambda existing, new: max(existing or 1, new),
             )
             card.statistics.update(
@@ -341,42 +940,88 @@ class SimpleSpacedRepetitionStrategy(CardStrategy):
                 update_function=lambda _, new: new,
             )
 
-        next_due = datetime.now() + timedelta(days=card.statistics.data["interval"])
+        next_due = to_epoch_seconds(self.clock()) + round(
+            card.statistics.data["interval"] * SECONDS_PER_DAY
+        )
         card.statistics.update(
             key="due", value=next_due, update_function=lambda _, new: new
         )
+        self._reschedule(card, next_due)
+        self._record_review(card, feedback.get("correct"), snapshot)
 
     def create_feedback(self) -> Feedback:
         """Defines the type of feedback this strategy uses."""
         return BinaryFeedback("correct")
 
     def aggregate_statistics(self, cards: list[Card]) -> dict[str, Any]:
-        """Computes total number of correct and incorrect."""
-        total_correct = 0
-        total_incorrect = 0
-        for card in cards:
-            total_correct += card.statistics.get(key="correct", default=0)
-            total_incorrect += card.statistics.get(key="incorrect", default=0)
-        return {"Correct": total_correct, "Incorrect": total_incorrect}
+        """Returns the running totals of answers and reviewed cards, and the due count."""
+        self._ensure_prepared(cards)
+        return {
+            "Correct": self.statistics.correct,
+            "Incorrect": self.statistics.incorrect,
+            "Seen": self.statistics.seen,
+            "Due": self.count_due(),
+        }
 
 
 @register_strategy("alphabetical")
 class AlphabeticalStrategy(CardStrategy):
-    """This class sorts cards by their front side."""
+    """This class sorts cards by their front side.
 
-    def __init__(self) -> None:
-        """Initialize the AlphabeticalStrategy."""
+    The ordering is computed once per deck from precomputed collation keys
+    and cached, so walking the deck costs O(1) per card.
+    """
+
+    def __init__(self, collation: str = "codepoint") -> None:
+        """Initialize the AlphabeticalStrategy.
+
+        Args:
+            collation (str): The name of the collation in COLLATION_KEYS used to
+                order the fronts. "unicode" ignores case and combining marks such
+                as Arabic harakat. "locale" follows the LC_COLLATE of the process,
+                which stays "C", and so codepoint order, until the program calls
+                locale.setlocale. The command line sets it from the environment.
+        """
+        super().__init__()
+        if collation not in COLLATION_KEYS:
+            msg = (
+                f"Unknown collation: {collation}. Options: {', '.join(COLLATION_KEYS)}."
+            )
+            raise ValueError(msg)
         self.index = 0
+        self.collation = collation
+        self._order: list[int] = []
+
+    def prepare(
+        self, cards: list[Card], columns: "ColumnarStatistics | None" = None
+    ) -> None:
+        """Computes the alphabetical order of cards.
+
+        Args:
+            cards (list[Card]): The deck the strategy will be serving.
+            columns (ColumnarStatistics | None): The columnar store backing the
+                statistics of cards, if any.
+        """
+        super().prepare(cards, columns)
+        collation_key = COLLATION_KEYS[self.collation]
+        keys = [collation_key(card.front) for card in cards]
+        self._order = sorted(range(len(cards)), key=keys.__getitem__)
 
     def get_next_card(self, cards: list[Card]) -> Card:
         """Returns the next card in alphabetical order."""
-        cards = sorted(cards, key=lambda card: card.front)
+        self._ensure_prepared(cards)
 
-        current_card = cards[self.index]
-        self.index = (self.index + 1) % len(cards)
+        current_card = cards[self._order[self.index % len(self._order)]]
+        self.index = (self.index + 1) % len(self._order)
 
         return current_card
 
+    def peek_next(self, cards: list[Card], k: int) -> list[Card]:
+        """Returns the next k cards in alphabetical order."""
+        self._ensure_prepared(cards)
+        order = self._order
+        return [cards[order[(self.index + offset) % len(order)]] for offset in range(k)]
+
     def process_feedback(self, card: Card, feedback: Feedback) -> None:
         """Processes the user feedback.
 
@@ -385,6 +1030,11 @@ class AlphabeticalStrategy(CardStrategy):
             feedback (Feedback): The user feedback associated with the card.
         """
         feedback.validate()
+        self._apply_review(card, feedback)
+
+    def _apply_review(self, card: Card, feedback: Feedback) -> None:
+        """Applies already validated feedback to the card."""
+        snapshot = self._snapshot(card)
         card.statistics.update(
             key="correct",
             value=1 if feedback.get("correct") else 0,
@@ -395,16 +1045,343 @@ class AlphabeticalStrategy(CardStrategy):
             value=0 if feedback.get("correct") else 1,
             update_function=lambda existing, new: (existing or 0) + new,
         )
+        self._record_review(card, feedback.get("correct"), snapshot)
+
+    def _apply_batch(self, reviews: list[tuple[Card, Feedback]]) -> None:
+        """Applies validated reviews, vectorized when the statistics are columnar."""
+        if not self._apply_counts_vectorized(reviews):
+            super()._apply_batch(reviews)
 
     def create_feedback(self) -> Feedback:
         """Gets the type of Feedback this strategy uses."""
         return BinaryFeedback("correct")
 
     def aggregate_statistics(self, cards: list[Card]) -> dict[str, Any]:
-        """Computes total number of correct and incorrect."""
-        total_correct = 0
-        total_incorrect = 0
-        for card in cards:
-            total_correct += card.statistics.get(key="correct", default=0)
-            total_incorrect += card.statistics.get(key="incorrect", default=0)
-        return {"Correct": total_correct, "Incorrect": total_incorrect}
+        """Returns the running totals of correct and incorrect answers."""
+        self._ensure_prepared(cards)
+        return {
+            "Correct": self.statistics.correct,
+            "Incorrect": self.statistics.incorrect,
+        }
+
+    def _serialize_state(self) -> dict[str, Any]:
+        """Serializes the strategy state."""
+        return {"index": self.index, "collation": self.collation}
+
+    @classmethod
+    def _deserialize_state(cls, state: dict[str, Any]) -> "AlphabeticalStrategy":
+        """Restores the strategy state."""
+        instance = cls(collation=state.get("collation", "codepoint"))
+        instance.index = state.get("index", 0)
+        return instance
+
+
+@register_strategy("weighted")
+class WeightedRandomStrategy(CardStrategy):
+    """This class draws cards at random, in proportion to how often they are missed.
+
+    With the "error_rate" weighting a card's weight is its smoothed error
+    rate, (incorrect + 1) / (correct + incorrect + 2). With "recency" it is an
+    exponentially decayed error rate, so recent mistakes count the most.
+    Weights live in a FenwickTree, so drawing a card and reweighting it after
+    feedback both cost O(log n).
+    """
+
+    WEIGHTINGS = ("error_rate", "recency")
+    MIN_WEIGHT = 0.05
+
+    def __init__(self, weighting: str = "error_rate", decay: float = 0.7) -> None:
+        """Instantiates the WeightedRandomStrategy.
+
+        Args:
+            weighting (str): Either "error_rate" or "recency".
+            decay (float): How much of the previous recent error rate each review keeps.
+        """
+        super().__init__()
+        if weighting not in self.WEIGHTINGS:
+            msg = f"Unknown weighting: {weighting}. Options: {', '.join(self.WEIGHTINGS)}."
+            raise ValueError(msg)
+        self.weighting = weighting
+        self.decay = decay
+        self._weights = FenwickTree([])
+
+    def prepare(
+        self, cards: list[Card], columns: "ColumnarStatistics | None" = None
+    ) -> None:
+        """Builds the weight tree for cards.
+
+        Args:
+            cards (list[Card]): The deck the strategy will be serving.
+            columns (ColumnarStatistics | None): The columnar store backing the
+                statistics of cards, if any.
+        """
+        super().prepare(cards, columns)
+        self._weights = FenwickTree([self._weight(card) for card in cards])
+
+    def _weight(self, card: Card) -> float:
+        """Returns the sampling weight of card."""
+        data = card.statistics.data
+        if self.weighting == "recency":
+            error_rate = data.get("recent_error", 0.5)
+        else:
+            correct = data.get("correct", 0)
+            incorrect = data.get("incorrect", 0)
+            error_rate = (incorrect + 1) / (correct + incorrect + 2)
+        return float(max(error_rate, self.MIN_WEIGHT))
+
+    def _draw(self) -> int:
+        """Draws a position in proportion to its weight."""
+        return self._weights.find(self.rng.random() * self._weights.total())
+
+    def get_next_card(self, cards: list[Card]) -> Card:
+        """Returns a card drawn in proportion to its weight."""
+        self._ensure_prepared(cards)
+        if self._drawn:
+            return cards[self._drawn.popleft()]
+        return cards[self._draw()]
+
+    def peek_next(self, cards: list[Card], k: int) -> list[Card]:
+        """Draws the next k cards ahead of time and returns them."""
+        self._ensure_prepared(cards)
+        return [cards[position] for position in self._draw_ahead(k, self._draw)]
+
+    def process_feedback(self, card: Card, feedback: Feedback) -> None:
+        """Processes the user feedback.
+
+        Args:
+            card (Card): The card associated with the feedback.
+            feedback (Feedback): The user feedback associated with the card.
+        """
+        feedback.validate()
+        self._apply_review(card, feedback)
+
+    def _apply_review(self, card: Card, feedback: Feedback) -> None:
+        """Applies already validated feedback to the card."""
+        snapshot = self._snapshot(card)
+        card.statistics.update(
+            key="correct",
+            value=1 if feedback.get("correct") else 0,
+            update_function=lambda existing, new: (existing or 0) + new,
+        )
+        card.statistics.update(
+            key="incorrect",
+            value=0 if feedback.get("correct") else 1,
+            update_function=lambda existing, new: (existing or 0) + new,
+        )
+        card.statistics.update(
+            key="recent_error",
+            value=0.0 if feedback.get("correct") else 1.0,
+            update_function=lambda existing, new: (
+                self.decay * (0.5 if existing is None else existing)
+                + (1 - self.decay) * new
+            ),
+        )
+        position = self._position(card)
+        if position is not None:
+            self._weights.set(position, self._weight(card))
+            self._invalidate_lookahead()
+        self._record_review(card, feedback.get("correct"), snapshot)
+
+    def create_feedback(self) -> Feedback:
+        """Gets the type of Feedback this strategy uses."""
+        return BinaryFeedback("correct")
+
+    def aggregate_statistics(self, cards: list[Card]) -> dict[str, Any]:
+        """Returns the running totals of correct and incorrect answers."""
+        self._ensure_prepared(cards)
+        return {
+            "Correct": self.statistics.correct,
+            "Incorrect": self.statistics.incorrect,
+        }
+
+    def _serialize_state(self) -> dict[str, Any]:
+        """Serializes the strategy state."""
+        return {"weighting": self.weighting, "decay": self.decay}
+
+    @classmethod
+    def _deserialize_state(cls, state: dict[str, Any]) -> "WeightedRandomStrategy":
+        """Restores the strategy state."""
+        return cls(
+            weighting=state.get("weighting", "error_rate"),
+            decay=state.get("decay", 0.7),
+        )
+
+
+@register_strategy("leitner")
+class LeitnerStrategy(CardStrategy):
+    """This class implements the Leitner box system.
+
+    Every card sits in one of several boxes, each a deque of deck positions.
+    A correct answer moves the card up one box and a wrong answer sends it
+    back to the first box. Boxes are visited on a ruler schedule (0, 1, 0, 2,
+    0, 1, 0, 3, ...), so box i comes up half as often as box i - 1. Picking
+    a card and moving it cost O(1) regardless of deck size.
+    """
+
+    def __init__(self, boxes: int = 5) -> None:
+        """Instantiates the LeitnerStrategy.
+
+        Args:
+            boxes (int): The number of boxes. Cards in the last box count as mastered.
+        """
+        super().__init__()
+        if boxes < 1:
+            msg = "LeitnerStrategy needs at least one box."
+            raise ValueError(msg)
+        self.step = 0
+        self._boxes: list[deque[int]] = [deque() for _ in range(boxes)]
+        self._box_of: list[int] = []
+        self._restored_boxes: list[list[int]] | None = None
+
+    def prepare(
+        self, cards: list[Card], columns: "ColumnarStatistics | None" = None
+    ) -> None:
+        """Places cards in their boxes.
+
+        Box membership restored from a saved state is used if it covers
+        exactly the positions of cards; otherwise every card starts in the
+        first box.
+
+        Args:
+            cards (list[Card]): The deck the strategy will be serving.
+            columns (ColumnarStatistics | None): The columnar store backing the
+                statistics of cards, if any.
+        """
+        restored, self._restored_boxes = self._restored_boxes, None
+        self._box_of = [-1] * len(cards)
+        if restored is not None and len(restored) == len(self._boxes):
+            for box, positions in enumerate(restored):
+                for position in positions:
+                    if 0 <= position < len(cards) and self._box_of[position] < 0:
+                        self._box_of[position] = box
+        if (
+            restored is None
+            or -1 in self._box_of
+            or sum(map(len, restored)) != len(cards)
+        ):
+            self._box_of = [0] * len(cards)
+            self._boxes = [deque(range(len(cards)))] + [
+                deque() for _ in range(len(self._boxes) - 1)
+            ]
+        else:
+            self._boxes = [deque(positions) for positions in restored]
+        super().prepare(cards, columns)
+
+    def _is_mastered(self, card: Card) -> bool:
+        """Returns whether card sits in the last box."""
+        position = self._position(card)
+        return position is not None and self._box_of[position] == len(self._boxes) - 1
+
+    def _count_mastered(self, cards: list[Card]) -> int:
+        """Counts the cards in the last box."""
+        _ = cards
+        return len(self._boxes[-1])
+
+    def _scheduled_box(self, step: int) -> int:
+        """Returns the box due at step, or the next non-empty one."""
+        ruler = ((step + 1) & -(step + 1)).bit_length() - 1
+        box = min(ruler, len(self._boxes) - 1)
+        for offset in range(len(self._boxes)):
+            candidate = (box + offset) % len(self._boxes)
+            if self._boxes[candidate]:
+                return candidate
+        return box
+
+    def get_next_card(self, cards: list[Card]) -> Card:
+        """Returns the card at the front of the scheduled box."""
+        self._ensure_prepared(cards)
+        queue = self._boxes[self._scheduled_box(self.step)]
+        self.step += 1
+        position = queue[0]
+        queue.rotate(-1)
+        return cards[position]
+
+    def peek_next(self, cards: list[Card], k: int) -> list[Card]:
+        """Returns the next k cards by walking the box schedule."""
+        self._ensure_prepared(cards)
+        served = [0] * len(self._boxes)
+        upcoming = []
+        for offset in range(k):
+            box = self._scheduled_box(self.step + offset)
+            queue = self._boxes[box]
+            upcoming.append(cards[queue[served[box] % len(queue)]])
+            served[box] += 1
+        return upcoming
+
+    def process_feedback(self, card: Card, feedback: Feedback) -> None:
+        """Processes the user feedback.
+
+        Args:
+            card (Card): The card associated with the feedback.
+            feedback (Feedback): The user feedback associated with the card.
+        """
+        feedback.validate()
+        self._apply_review(card, feedback)
+
+    def _apply_review(self, card: Card, feedback: Feedback) -> None:
+        """Applies already validated feedback to the card."""
+        snapshot = self._snapshot(card)
+        card.statistics.update(
+            key="correct",
+            value=1 if feedback.get("correct") else 0,
+            update_function=lambda existing, new: (existing or 0) + new,
+        )
+        card.statistics.update(
+            key="incorrect",
+            value=0 if feedback.get("correct") else 1,
+            update_function=lambda existing, new: (existing or 0) + new,
+        )
+        position = self._position(card)
+        if position is not None:
+            current = self._box_of[position]
+            if feedback.get("correct"):
+                target = min(current + 1, len(self._boxes) - 1)
+            else:
+                target = 0
+            if target != current:
+                self._move(position, current, target)
+        self._record_review(card, feedback.get("correct"), snapshot)
+
+    def _move(self, position: int, current: int, target: int) -> None:
+        """Moves the card at position from box current to box target.
+
+        The card that was just served sits at the back of its box, so it is
+        removed in O(1); any other card needs a scan of its box.
+        """
+        queue = self._boxes[current]
+        if queue and queue[-1] == position:
+            queue.pop()
+        else:
+            queue.remove(position)
+        self._boxes[target].append(position)
+        self._box_of[position] = target
+        self._invalidate_lookahead()
+
+    def create_feedback(self) -> Feedback:
+        """Gets the type of Feedback this strategy uses."""
+        return BinaryFeedback("correct")
+
+    def aggregate_statistics(self, cards: list[Card]) -> dict[str, Any]:
+        """Returns the running totals of answers and the cards in the last box."""
+        self._ensure_prepared(cards)
+        return {
+            "Correct": self.statistics.correct,
+            "Incorrect": self.statistics.incorrect,
+            "Mastered": self.statistics.mastered,
+        }
+
+    def _serialize_state(self) -> dict[str, Any]:
+        """Serializes the strategy state, with box membership as card indices."""
+        boxes = self._restored_boxes
+        if boxes is None:
+            boxes = [list(queue) for queue in self._boxes]
+        return {"step": self.step, "boxes": boxes}
+
+    @classmethod
+    def _deserialize_state(cls, state: dict[str, Any]) -> "LeitnerStrategy":
+        """Restores the strategy state."""
+        boxes = state.get("boxes")
+        instance = cls(boxes=len(boxes) if boxes else 5)
+        instance.step = state.get("step", 0)
+        instance._restored_boxes = boxes
+        return instance
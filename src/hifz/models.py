@@ -1,10 +1,30 @@
 """This represents data models for the application."""
 
 from abc import ABC, abstractmethod
-from collections.abc import Callable
+from collections.abc import Callable, Hashable, Iterator, Mapping, MutableMapping
 from dataclasses import dataclass, field
+from datetime import datetime, timedelta
 from typing import Any
 
+EPOCH = datetime(1970, 1, 1)
+SECONDS_PER_DAY = 86_400
+_MISSING = object()
+
+
+def to_epoch_seconds(value: datetime) -> int:
+    """Converts a naive datetime to whole seconds since the epoch."""
+    return (value - EPOCH) // timedelta(seconds=1)
+
+
+def from_epoch_seconds(value: int) -> datetime:
+    """Converts whole seconds since the epoch back to a naive datetime."""
+    return EPOCH + timedelta(seconds=value)
+
+
+def as_epoch_seconds(value: int | datetime) -> int:
+    """Returns a time statistic as epoch seconds, converting datetimes of older sessions."""
+    return to_epoch_seconds(value) if isinstance(value, datetime) else value
+
 
 @dataclass
 class Feedback(ABC):
@@ -16,9 +36,22 @@ class Feedback(ABC):
     def get_metadata(self) -> dict[str, dict[str, Any]]:
         """Returns metadata for rendering feedback UI."""
 
-    def validate(self) -> None:
-        """Ensures the feedback data matches its metadata."""
-        metadata = self.get_metadata()
+    def metadata_key(self) -> Hashable | None:
+        """Returns a key shared by feedback with identical metadata, or None if unknown.
+
+        Batches use the key to compute the metadata once for many feedbacks.
+        """
+        return None
+
+    def validate(self, metadata: Mapping[str, dict[str, Any]] | None = None) -> None:
+        """Ensures the feedback data matches its metadata.
+
+        Args:
+            metadata (Mapping[str, dict[str, Any]] | None): The metadata, if already
+                computed for feedback with the same metadata key.
+        """
+        if metadata is None:
+            metadata = self.get_metadata()
         for field_name, meta in metadata.items():
             value = self.data.get(field_name)
             if not isinstance(value, meta["type"]):
@@ -40,9 +73,13 @@ class BinaryFeedback(Feedback):
         self.field_name = field_name
         self.data = {field_name: False}
 
-    def validate(self) -> None:
+    def metadata_key(self) -> Hashable:
+        """Returns the field name, which determines the metadata."""
+        return type(self), self.field_name
+
+    def validate(self, metadata: Mapping[str, dict[str, Any]] | None = None) -> None:
         """Ensures typing is correct and the value is boolean."""
-        super().validate()
+        super().validate(metadata)
         true_count = sum(self.data.values())
         if true_count > 1:
             msg = f"{self.__class__.__name__} can only have one value (True/False)."
@@ -63,9 +100,13 @@ class SingleSelectBooleanFeedback(Feedback):
         self.options = options
         self.data = {option: False for option in self.options}
 
-    def validate(self) -> None:
+    def metadata_key(self) -> Hashable:
+        """Returns the options, which determine the metadata."""
+        return type(self), self.options
+
+    def validate(self, metadata: Mapping[str, dict[str, Any]] | None = None) -> None:
         """Ensures typing is correct and only one field is True."""
-        super().validate()
+        super().validate(metadata)
         true_count = sum(self.data.values())
         if len(self.options) == 0:
             msg = f"No options provided for {self.__class__.__name__}."
@@ -79,11 +120,122 @@ class SingleSelectBooleanFeedback(Feedback):
         return {option: {"type": bool} for option in self.options}
 
 
-@dataclass
+class CardStatistics(MutableMapping[str, Any]):
+    """The statistics of one card, as a compact dict-like object.
+
+    The statistics of the built-in strategies live in typed slots, which are
+    left unset while absent. Any other key goes to an overflow dict that is
+    only allocated once such a key is stored.
+    """
+
+    FIELDS = (
+        "correct",
+        "incorrect",
+        "seen",
+        "interval",
+        "ease_factor",
+        "due",
+        "recent_error",
+    )
+    __slots__ = (*FIELDS, "extra")
+
+    correct: int
+    incorrect: int
+    seen: int
+    interval: float
+    ease_factor: float
+    due: int
+    recent_error: float
+    extra: dict[str, Any] | None
+
+    def __init__(self, data: Mapping[str, Any] | None = None) -> None:
+        """Instantiates the statistics, copying data if given.
+
+        Args:
+            data (Mapping[str, Any] | None): The initial statistics.
+        """
+        self.extra = None
+        if data:
+            for key, value in data.items():
+                self[key] = value
+
+    def __getitem__(self, key: str) -> Any:
+        """Returns the statistic key, raising KeyError if it is absent."""
+        if key in self.FIELDS:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self.extra is None:
+            raise KeyError(key)
+        return self.extra[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Returns the statistic key, or default if it is absent, without raising."""
+        if key in self.FIELDS:
+            return getattr(self, key, default)
+        if self.extra is None:
+            return default
+        return self.extra.get(key, default)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        """Stores the statistic key in its slot, or in the overflow dict."""
+        if key in self.FIELDS:
+            setattr(self, key, value)
+        elif self.extra is None:
+            self.extra = {key: value}
+        else:
+            self.extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        """Removes the statistic key."""
+        if key in self.FIELDS:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self.extra is None:
+            raise KeyError(key)
+        else:
+            del self.extra[key]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterates over the statistics that are present."""
+        for key in self.FIELDS:
+            if hasattr(self, key):
+                yield key
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self) -> int:
+        """Returns the number of statistics present."""
+        return sum(1 for _ in self)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Copies the statistics present to a dict, reading the slots directly."""
+        statistics = {}
+        for key in self.FIELDS:
+            value = getattr(self, key, _MISSING)
+            if value is not _MISSING:
+                statistics[key] = value
+        if self.extra:
+            statistics.update(self.extra)
+        return statistics
+
+    def __repr__(self) -> str:
+        """Machine-readable representation of the statistics."""
+        return repr(dict(self))
+
+
+@dataclass(slots=True)
 class FeedbackSummary:
-    """Aggregates arbitrary feedback over time."""
+    """Aggregates arbitrary feedback over time.
 
-    data: dict[str, Any] = field(default_factory=dict)
+    The data is a CardStatistics by default, but may be any mutable mapping,
+    such as a view onto a columnar store.
+    """
+
+    data: MutableMapping[str, Any] = field(default_factory=CardStatistics)
 
     def update(
         self, key: str, value: Any, update_function: Callable[[Any, Any], Any]
@@ -104,8 +256,44 @@ class FeedbackSummary:
 
 
 @dataclass
+class SessionStatistics:
+    """Running totals that strategies update as feedback is processed."""
+
+    correct: int = 0
+    incorrect: int = 0
+    seen: int = 0
+    mastered: int = 0
+
+    def to_dict(self) -> dict[str, int]:
+        """Converts the totals to a dictionary."""
+        return {
+            "correct": self.correct,
+            "incorrect": self.incorrect,
+            "seen": self.seen,
+            "mastered": self.mastered,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, int]) -> "SessionStatistics":
+        """Creates a SessionStatistics instance from a dictionary."""
+        return cls(
+            correct=data.get("correct", 0),
+            incorrect=data.get("incorrect", 0),
+            seen=data.get("seen", 0),
+            mastered=data.get("mastered", 0),
+        )
+
+
+@dataclass(slots=True)
 class Card:
-    """This class wraps logic associated with a card."""
+    """This class wraps logic associated with a card.
+
+    Cards are slotted, so with CardStatistics a card costs 192 bytes on
+    CPython 3.12 besides its text and statistic values, whichever built-in
+    statistics it holds. With an instance __dict__ per object and a plain
+    statistics dict this was 224 bytes for a new card and 344 bytes for a
+    card scheduled by spaced repetition.
+    """
 
     front: str
     back: str
@@ -113,15 +301,18 @@ class Card:
 
     def to_dict(self) -> dict[str, Any]:
         """Converts the card and its statistics to a dictionary."""
+        data = self.statistics.data
         return {
             "front": self.front,
             "back": self.back,
-            "statistics": self.statistics.data,
+            "statistics": data.to_dict()
+            if isinstance(data, CardStatistics)
+            else dict(data),
         }
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "Card":
         """Creates a Card instance from a dictionary."""
         card = cls(front=data["front"], back=data["back"])
-        card.statistics.data = data.get("statistics", {})
+        card.statistics.data = CardStatistics(data.get("statistics"))
         return card
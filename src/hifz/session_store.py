@@ -0,0 +1,316 @@
+"""This module stores sessions in SQLite, one row per card."""
+
+import json
+import sqlite3
+import threading
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from hifz.arena import ArenaCard, TextArena
+from hifz.learning_strategies import STRATEGY_NAME_TO_CLASS
+from hifz.models import (
+    Card,
+    CardStatistics,
+    SessionStatistics,
+    as_epoch_seconds,
+    to_epoch_seconds,
+)
+from hifz.utils import CardSession, paused_gc
+
+SQLITE_SUFFIXES = {".sqlite", ".sqlite3", ".db"}
+VERSION = "1.0"
+BUSY_TIMEOUT = 30.0
+STATISTIC_TYPES = {
+    "correct": "INTEGER",
+    "incorrect": "INTEGER",
+    "seen": "INTEGER",
+    "interval": "REAL",
+    "ease_factor": "REAL",
+    "due": "INTEGER",
+    "recent_error": "REAL",
+}
+DUE = CardStatistics.FIELDS.index("due")
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cards (
+    position INTEGER PRIMARY KEY,
+    front TEXT NOT NULL,
+    back TEXT NOT NULL,
+    {", ".join(f"{name} {STATISTIC_TYPES[name]}" for name in CardStatistics.FIELDS)},
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS cards_due ON cards (due);
+CREATE INDEX IF NOT EXISTS cards_correct ON cards (correct);
+"""
+CARD_COLUMNS = ("position", "front", "back", *CardStatistics.FIELDS, "extra")
+UPSERT_CARD = (
+    f"INSERT INTO cards ({', '.join(CARD_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in CARD_COLUMNS)}) "
+    "ON CONFLICT (position) DO UPDATE SET "
+    + ", ".join(f"{name} = excluded.{name}" for name in CARD_COLUMNS[1:])
+)
+UPSERT_METADATA = (
+    "INSERT INTO metadata (key, value) VALUES (?, ?) "
+    "ON CONFLICT (key) DO UPDATE SET value = excluded.value"
+)
+
+
+def is_sqlite_session(file_path: Path) -> bool:
+    """Returns whether file_path names an SQLite session, judging by its extension."""
+    return file_path.suffix.lower() in SQLITE_SUFFIXES
+
+
+class SQLiteSessionStore:
+    """A session kept in an SQLite database.
+
+    Every card is a row holding its text and one column per built-in
+    statistic, so saving the cards touched by a review rewrites those rows
+    and the strategy state only, and a load can select the cards that are due or below a mastery
+    threshold through an index. The strategy state and the running totals
+    are rows of a metadata table. A session loaded partially adds the
+    change in its running totals to the stored totals of the whole deck.
+
+    The database is in WAL mode, so several processes can read a session
+    while one of them writes it. Writers wait up to timeout seconds for each
+    other. A store can be shared by threads.
+    """
+
+    def __init__(self, file_path: Path, timeout: float = BUSY_TIMEOUT) -> None:
+        """Opens the store, creating the database if needed.
+
+        Args:
+            file_path (Path): The path of the database.
+            timeout (float): Seconds to wait for another writer.
+        """
+        self.file_path = file_path
+        self._connection = sqlite3.connect(
+            file_path, timeout=timeout, isolation_level=None, check_same_thread=False
+        )
+        self._lock = threading.Lock()
+        self._cards: list[Card] | None = None
+        self._rows: dict[int, int] = {}
+        self._partial = False
+        self._written: dict[str, int] = {}
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode = WAL")
+            self._connection.execute("PRAGMA synchronous = NORMAL")
+            self._connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        """Closes the database."""
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self) -> "SQLiteSessionStore":
+        """Returns the store."""
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        """Closes the store."""
+        self.close()
+
+    def holds(self, session: CardSession) -> bool:
+        """Returns whether session is the one last saved to or loaded from the store."""
+        return session.cards is self._cards
+
+    def save(self, session: CardSession) -> None:
+        """Writes the whole session, replacing what the store held.
+
+        Saving the session the store last loaded or saved writes its strategy
+        state only, as its cards are written when they are reviewed.
+
+        Args:
+            session (CardSession): The session to save.
+        """
+        if self.holds(session):
+            with self._transaction() as cursor:
+                self._write_state(cursor, session, partial=self._partial)
+            return
+        rows = list(range(len(session.cards)))
+        with self._transaction() as cursor:
+            cursor.execute("DELETE FROM cards")
+            cursor.executemany(UPSERT_CARD, map(self._card_row, rows, session.cards))
+            self._write_state(cursor, session, partial=False)
+        self._track(session, rows, partial=False)
+
+    def save_cards(self, session: CardSession, cards: Iterable[Card]) -> None:
+        """Upserts the rows of cards, the running totals and the strategy state of session.
+
+        The strategy state is written in the same transaction as the cards,
+        so a session resumed after a crash schedules the reviewed cards as
+        they were before it.
+
+        Args:
+            session (CardSession): The session the cards belong to, which the
+                store last saved or loaded.
+            cards (Iterable[Card]): The cards whose statistics changed.
+        """
+        if not self.holds(session):
+            msg = "The session was not saved to or loaded from this store."
+            raise ValueError(msg)
+        rows = [(self._rows[id(card)], card) for card in cards]
+        with self._transaction() as cursor:
+            cursor.executemany(UPSERT_CARD, (self._card_row(*row) for row in rows))
+            self._write_state(cursor, session, partial=self._partial)
+
+    def load(
+        self,
+        columnar: bool = False,
+        arena: TextArena | None = None,
+        due_before: datetime | None = None,
+        mastery_below: int | None = None,
+    ) -> CardSession:
+        """Loads the session, or only the cards matching the filters given.
+
+        A session loaded partially holds the matching cards in deck order.
+        Reviews of its cards are saved to their rows and added to the running
+        totals of the whole deck, but its strategy state is not saved, so
+        that of the whole deck is kept.
+
+        Args:
+            columnar (bool): Keep the card statistics in a columnar store.
+            arena (TextArena | None): Deduplicated storage for the card text.
+            due_before (datetime | None): Only load the cards that are due at
+                this time, or were never scheduled.
+            mastery_below (int | None): Only load the cards with fewer correct
+                answers in a row than this.
+
+        Returns:
+            CardSession: The session.
+        """
+        clauses: list[str] = []
+        parameters: list[Any] = []
+        if due_before is not None:
+            clauses.append("(due IS NULL OR due <= ?)")
+            parameters.append(to_epoch_seconds(due_before))
+        if mastery_below is not None:
+            clauses.append("(correct IS NULL OR correct < ?)")
+            parameters.append(mastery_below)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._lock:
+            metadata = dict(self._connection.execute("SELECT key, value FROM metadata"))
+            if metadata.get("version") != VERSION:
+                msg = "Unsupported session version."
+                raise ValueError(msg)
+            strategy_info = json.loads(metadata["strategy"])
+            if strategy_info["type"] not in STRATEGY_NAME_TO_CLASS:
+                msg = f"Unsupported strategy type: {strategy_info['type']}"
+                raise ValueError(msg)
+            strategy = STRATEGY_NAME_TO_CLASS[strategy_info["type"]].from_dict(
+                strategy_info
+            )
+            rows = self._connection.execute(
+                f"SELECT {', '.join(CARD_COLUMNS)} FROM cards{where} ORDER BY position",
+                parameters,
+            ).fetchall()
+
+        with paused_gc():
+            cards = [self._row_card(row, arena) for row in rows]
+        session = CardSession(cards=cards, strategy=strategy, columnar=columnar)
+        if not clauses and "statistics" in metadata:
+            strategy.statistics = SessionStatistics.from_dict(
+                json.loads(metadata["statistics"])
+            )
+        self._track(session, [row[0] for row in rows], partial=bool(clauses))
+        return session
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Cursor]:
+        """Runs the statements of the block as one write transaction."""
+        with self._lock:
+            cursor = self._connection.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                yield cursor
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+            cursor.execute("COMMIT")
+
+    def _track(self, session: CardSession, rows: list[int], partial: bool) -> None:
+        """Remembers the row of each card of the session the store holds."""
+        cards = session.cards
+        self._cards = cards
+        self._rows = {id(card): row for card, row in zip(cards, rows, strict=True)}
+        self._partial = partial
+        self._written = session.strategy.statistics.to_dict()
+
+    def _write_state(
+        self,
+        cursor: sqlite3.Cursor,
+        session: CardSession,
+        partial: bool,
+    ) -> None:
+        """Writes the version, running totals and strategy state of session.
+
+        For a partial session, the change in its totals since they were last
+        written is added to the stored totals, and the strategy state is
+        never written.
+        """
+        totals = session.strategy.statistics.to_dict()
+        written = totals
+        if partial:
+            stored = cursor.execute(
+                "SELECT value FROM metadata WHERE key = 'statistics'"
+            ).fetchone()
+            base = json.loads(stored[0]) if stored else {}
+            totals = {
+                key: base.get(key, 0) + value - self._written.get(key, 0)
+                for key, value in totals.items()
+            }
+        state = {
+            "version": VERSION,
+            "timestamp": datetime.now().isoformat(),
+            "statistics": json.dumps(totals),
+        }
+        if not partial:
+            state["strategy"] = json.dumps(session.strategy.to_dict())
+        cursor.executemany(UPSERT_METADATA, state.items())
+        self._written = written
+
+    @staticmethod
+    def _card_row(position: int, card: Card) -> tuple[Any, ...]:
+        """Returns the row of card."""
+        data = card.statistics.data
+        if isinstance(data, CardStatistics):
+            # Reads the slots directly, as a lookup of an absent key raises.
+            values: list[Any] = [
+                getattr(data, name, None) for name in CardStatistics.FIELDS
+            ]
+            extra = data.extra
+        else:
+            extra = dict(data)
+            values = [extra.pop(name, None) for name in CardStatistics.FIELDS]
+        if values[DUE] is not None:
+            values[DUE] = as_epoch_seconds(values[DUE])
+        return (
+            position,
+            card.front,
+            card.back,
+            *values,
+            json.dumps(extra) if extra else None,
+        )
+
+    @staticmethod
+    def _row_card(row: tuple[Any, ...], arena: TextArena | None) -> Card:
+        """Builds the card of a row."""
+        statistics = CardStatistics()
+        for name, value in zip(CardStatistics.FIELDS, row[3:-1], strict=True):
+            if value is not None:
+                setattr(statistics, name, value)
+        if row[-1] is not None:
+            statistics.extra = json.loads(row[-1])
+        if arena is None:
+            card = Card(row[1], row[2])
+        else:
+            card = ArenaCard(arena, arena.add(row[1]), arena.add(row[2]))
+        card.statistics.data = statistics
+        return card
@@ -0,0 +1,257 @@
+"""This module simulates synthetic learners to compare strategies without humans in the loop."""
+
+import math
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from hifz.card_engine import CardEngine
+from hifz.learning_strategies import STRATEGY_NAME_TO_CLASS
+from hifz.models import Card
+from hifz.utils import CardSession
+
+SIMULATION_START = datetime(2000, 1, 1)
+
+
+@dataclass(frozen=True)
+class ForgettingModel:
+    """An exponential forgetting curve.
+
+    A card reviewed elapsed days ago is recalled with probability
+    exp(-elapsed / stability). A correct answer multiplies the stability of
+    the card by growth, and a miss resets it to initial_stability. Cards the
+    learner has never seen are always missed.
+    """
+
+    initial_stability: float = 1.0
+    growth: float = 2.5
+
+    def __post_init__(self) -> None:
+        """Validates the model parameters."""
+        if self.initial_stability <= 0:
+            msg = f"Initial stability must be positive, got {self.initial_stability}."
+            raise ValueError(msg)
+        if self.growth < 1:
+            msg = f"Growth must be at least 1, got {self.growth}."
+            raise ValueError(msg)
+
+    def recall_probability(self, elapsed_days: float, stability: float) -> float:
+        """Returns the probability of recalling a card after elapsed_days."""
+        return math.exp(-elapsed_days / stability)
+
+    def update(self, stability: float, correct: bool) -> float:
+        """Returns the stability of a card after an answer."""
+        return stability * self.growth if correct else self.initial_stability
+
+
+@dataclass(frozen=True)
+class SimulationConfig:
+    """The parameters of a simulation run for one strategy.
+
+    Attributes:
+        strategy (str): The registered name of the strategy to simulate.
+        learners (int): The number of synthetic learners.
+        deck_size (int): The number of cards each learner studies.
+        reviews (int): The number of reviews each learner does.
+        review_gap (timedelta): The synthetic time between two reviews.
+        forgetting (ForgettingModel): How learners forget.
+        checkpoints (int): The number of points on the retention curve.
+        seed (int): The seed making the run reproducible.
+    """
+
+    strategy: str
+    learners: int = 100
+    deck_size: int = 100
+    reviews: int = 500
+    review_gap: timedelta = timedelta(minutes=10)
+    forgetting: ForgettingModel = field(default_factory=ForgettingModel)
+    checkpoints: int = 10
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        """Validates the configuration."""
+        if self.strategy not in STRATEGY_NAME_TO_CLASS:
+            msg = f"Unknown strategy name: {self.strategy}"
+            raise ValueError(msg)
+        for name in ("learners", "deck_size", "reviews", "checkpoints"):
+            if getattr(self, name) < 1:
+                msg = f"{name} must be at least 1, got {getattr(self, name)}."
+                raise ValueError(msg)
+
+
+@dataclass
+class LearnerResult:
+    """What one synthetic learner measured.
+
+    Attributes:
+        latencies (list[float]): The seconds spent in the engine per review.
+        retention (list[float]): The mean recall probability over the deck at each checkpoint.
+        correct (int): The number of correct answers.
+    """
+
+    latencies: list[float]
+    retention: list[float]
+    correct: int
+
+
+@dataclass
+class SimulationReport:
+    """The aggregated results of a simulation run.
+
+    Attributes:
+        strategy (str): The simulated strategy.
+        reviews (int): The total number of reviews across learners.
+        reviews_per_second (float): The review throughput across the process pool.
+        latency_percentiles (dict[int, float]): Nearest-rank seconds per review at the
+            50th, 90th and 99th percentiles.
+        retention (list[float]): The mean retention curve across learners.
+        accuracy (float): The share of correct answers.
+    """
+
+    strategy: str
+    reviews: int
+    reviews_per_second: float
+    latency_percentiles: dict[int, float]
+    retention: list[float]
+    accuracy: float
+
+    def __str__(self) -> str:
+        """Human-readable summary of the report."""
+        latencies = ", ".join(
+            f"p{percentile} {seconds * 1e6:.1f}us"
+            for percentile, seconds in self.latency_percentiles.items()
+        )
+        curve = " ".join(f"{value:.2f}" for value in self.retention)
+        return (
+            f"{self.strategy}: {self.reviews_per_second:,.0f} reviews/s, "
+            f"latency {latencies}, accuracy {self.accuracy:.2%}, retention {curve}"
+        )
+
+
+def _retention(
+    model: ForgettingModel,
+    now: datetime,
+    last_review: list[datetime | None],
+    stability: list[float],
+) -> float:
+    """Returns the mean recall probability over the deck at now."""
+    total = 0.0
+    for reviewed, card_stability in zip(last_review, stability, strict=True):
+        if reviewed is not None:
+            elapsed = (now - reviewed) / timedelta(days=1)
+            total += model.recall_probability(elapsed, card_stability)
+    return total / len(stability)
+
+
+def simulate_learner(config: SimulationConfig, learner: int) -> LearnerResult:
+    """Runs one synthetic learner through a CardEngine session.
+
+    The strategy runs on synthetic time that advances by config.review_gap
+    per review, and both the learner and the strategy draw from RNGs seeded
+    by config.seed and learner.
+
+    Args:
+        config (SimulationConfig): The simulation parameters.
+        learner (int): The index of the learner, which picks its seed.
+
+    Returns:
+        LearnerResult: What the learner measured.
+    """
+    rng = random.Random(f"{config.seed}:{learner}:answers")
+    model = config.forgetting
+    now = SIMULATION_START
+
+    cards = [Card(f"Front{i}", f"Back{i}") for i in range(config.deck_size)]
+    positions = {id(card): position for position, card in enumerate(cards)}
+    last_review: list[datetime | None] = [None] * len(cards)
+    stability = [model.initial_stability] * len(cards)
+
+    strategy = STRATEGY_NAME_TO_CLASS[config.strategy]()
+    strategy.clock = lambda: now
+    strategy.rng = random.Random(f"{config.seed}:{learner}:strategy")
+    engine = CardEngine()
+    engine.session = CardSession(cards, strategy)
+    feedback = engine.get_feedback()
+
+    checkpoint_every = max(config.reviews // config.checkpoints, 1)
+    latencies: list[float] = []
+    retention: list[float] = []
+    correct_answers = 0
+    for review in range(1, config.reviews + 1):
+        started = time.perf_counter()
+        card = engine.get_next_card()
+        position = positions[id(card)]
+        reviewed = last_review[position]
+        recall = 0.0
+        if reviewed is not None:
+            elapsed = (now - reviewed) / timedelta(days=1)
+            recall = model.recall_probability(elapsed, stability[position])
+        correct = rng.random() < recall
+        feedback.data = {"correct": correct}
+        engine.process_feedback(card, feedback)
+        latencies.append(time.perf_counter() - started)
+
+        correct_answers += correct
+        stability[position] = (
+            model.update(stability[position], correct)
+            if reviewed is not None
+            else model.initial_stability
+        )
+        last_review[position] = now
+        now += config.review_gap
+        if review % checkpoint_every == 0 and len(retention) < config.checkpoints:
+            retention.append(_retention(model, now, last_review, stability))
+
+    return LearnerResult(latencies, retention, correct_answers)
+
+
+def run_simulation(
+    config: SimulationConfig, workers: int | None = None
+) -> SimulationReport:
+    """Runs config.learners synthetic learners across a process pool.
+
+    With a single worker the learners run in the calling process, which is
+    easier to debug and profile.
+
+    Args:
+        config (SimulationConfig): The simulation parameters.
+        workers (int | None): The number of processes. Defaults to the number of CPUs.
+
+    Returns:
+        SimulationReport: The aggregated results.
+    """
+    learners = range(config.learners)
+    started = time.perf_counter()
+    if workers is not None and workers <= 1:
+        results = [simulate_learner(config, learner) for learner in learners]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(
+                pool.map(
+                    simulate_learner,
+                    [config] * config.learners,
+                    learners,
+                    chunksize=max(config.learners // (4 * (workers or 4)), 1),
+                )
+            )
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for result in results for latency in result.latencies)
+    reviews = len(latencies)
+    return SimulationReport(
+        strategy=config.strategy,
+        reviews=reviews,
+        reviews_per_second=reviews / elapsed,
+        latency_percentiles={
+            percentile: latencies[math.ceil(percentile / 100 * reviews) - 1]
+            for percentile in (50, 90, 99)
+        },
+        retention=[
+            statistics.fmean(values)
+            for values in zip(*(result.retention for result in results), strict=True)
+        ],
+        accuracy=sum(result.correct for result in results) / reviews,
+    )
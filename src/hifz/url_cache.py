@@ -0,0 +1,125 @@
+"""This module caches decks downloaded over http(s) on disk."""
+
+import hashlib
+import json
+import shutil
+from email.message import Message
+from pathlib import Path, PurePosixPath
+from typing import Any
+from urllib.error import HTTPError
+from urllib.parse import urlparse
+from urllib.request import Request, urlopen
+
+from hifz.utils import cache_directory, replacing_file
+
+CHUNK_SIZE = 1 << 16
+DEFAULT_SUFFIX = ".csv"
+CONTENT_TYPE_SUFFIXES = {
+    "text/csv": ".csv",
+    "text/tab-separated-values": ".tsv",
+    "application/json": ".json",
+    "application/x-ndjson": ".ndjson",
+    "application/jsonl": ".jsonl",
+    "application/xml": ".xml",
+    "text/xml": ".xml",
+}
+DECK_SUFFIXES = {*CONTENT_TYPE_SUFFIXES.values(), ".hifzb"}
+NOT_MODIFIED = 304
+
+
+class URLCache:
+    """An on-disk cache of the decks served at http(s) URLs.
+
+    Each URL keeps its last body and the ETag and Last-Modified validators
+    sent with it. Later fetches send them back as a conditional request, so
+    a deck that did not change is answered with 304 Not Modified and read
+    from disk. Bodies are streamed to disk in chunks and keep the extension
+    of the URL, or one matching their content type, so every supported
+    format can be read from a URL.
+    """
+
+    def __init__(self, directory: Path | None = None) -> None:
+        """Instantiates the cache.
+
+        Args:
+            directory (Path | None): Where to keep the cached decks. Defaults
+                to the urls directory of the hifz cache.
+        """
+        self.directory = directory or cache_directory("urls")
+
+    def fetch(self, url: str, timeout: float | None = None) -> Path:
+        """Returns a local copy of the deck at url, downloading it if it changed.
+
+        Args:
+            url (str): An http(s) URL.
+            timeout (float | None): Seconds to wait for the server.
+
+        Returns:
+            Path: The cached copy of the body.
+        """
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        metadata_path = self.directory / f"{key}.meta"
+        metadata = self._read_metadata(metadata_path, url)
+
+        request = Request(url)
+        if metadata.get("etag"):
+            request.add_header("If-None-Match", metadata["etag"])
+        if metadata.get("last_modified"):
+            request.add_header("If-Modified-Since", metadata["last_modified"])
+
+        try:
+            response = urlopen(request, timeout=timeout)
+        except HTTPError as err:
+            err.close()
+            if err.code == NOT_MODIFIED and metadata:
+                return self.directory / str(metadata["file"])
+            raise
+
+        with response:
+            body_path = self.directory / f"{key}{self._suffix(url, response.headers)}"
+            with replacing_file(body_path) as f:
+                shutil.copyfileobj(response, f, CHUNK_SIZE)
+            if metadata and metadata["file"] != body_path.name:
+                (self.directory / metadata["file"]).unlink(missing_ok=True)
+            metadata = {
+                "url": url,
+                "file": body_path.name,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }
+        with replacing_file(metadata_path) as f:
+            f.write(json.dumps(metadata).encode("utf-8"))
+        return body_path
+
+    def _read_metadata(self, metadata_path: Path, url: str) -> dict[str, Any]:
+        """Returns the validators stored for url, or nothing if its body is gone.
+
+        Metadata that is not the JSON object fetch writes counts as a miss.
+        """
+        try:
+            metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(metadata, dict) or metadata.get("url") != url:
+            return {}
+        file_name = metadata.get("file")
+        if (
+            not isinstance(file_name, str)
+            or not file_name
+            or PurePosixPath(file_name).name != file_name
+            or not all(
+                isinstance(metadata.get(validator), str | None)
+                for validator in ("etag", "last_modified")
+            )
+            or not (self.directory / file_name).exists()
+        ):
+            return {}
+        return metadata
+
+    @staticmethod
+    def _suffix(url: str, headers: Message) -> str:
+        """Returns the extension of the deck at url, falling back on its content type."""
+        suffix = PurePosixPath(urlparse(url).path).suffix.lower()
+        if suffix in DECK_SUFFIXES:
+            return suffix
+        return CONTENT_TYPE_SUFFIXES.get(headers.get_content_type(), DEFAULT_SUFFIX)
@@ -1,24 +1,64 @@
 """This module maintains the utility models and methods for the program."""
 
+import gc
+import gzip
 import json
-from dataclasses import dataclass
+import lzma
+import os
+import secrets
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
+from itertools import batched, islice
 from pathlib import Path
-from typing import Any
+from typing import IO, TYPE_CHECKING, Any
 
+from hifz.arena import ArenaCard, TextArena
 from hifz.learning_strategies import (
     STRATEGY_NAME_TO_CLASS,
     CardStrategy,
 )
-from hifz.models import Card
+from hifz.models import Card, Feedback, SessionStatistics, to_epoch_seconds
+
+if TYPE_CHECKING:
+    from hifz.columnar import ColumnarStatistics
+
+COMPRESSION_SUFFIXES = {".gz": "gzip", ".xz": "lzma"}
+GZIP_LEVEL = 6
+LZMA_PRESET = 1
+WRITE_BATCH = 4096
+READ_BATCH = 4096
+_GZIP_MAGIC = b"\x1f\x8b"
+_XZ_MAGIC = b"\xfd7zXZ\x00"
+_CARDS_HEAD = b'"cards":['
 
 
 @dataclass
 class CardSession:
-    """This class maintains the logic associated with starting a Card Session."""
+    """This class maintains the logic associated with starting a Card Session.
+
+    With columnar set, the card statistics are moved into a NumPy-backed
+    ColumnarStatistics store (requires the ``columnar`` extra) and each
+    card's statistics data becomes a dict-like view onto it.
+
+    The journal sequence is the number of the last review journal record
+    folded into the session, which is saved with it.
+    """
 
     cards: list[Card]
     strategy: CardStrategy
+    columnar: bool = False
+    columns: "ColumnarStatistics | None" = field(default=None, init=False, repr=False)
+    journal_sequence: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Lets the strategy build its per-deck state for the session's cards."""
+        if self.columnar:
+            from hifz.columnar import ColumnarStatistics
+
+            self.columns = ColumnarStatistics.from_cards(self.cards)
+        self.strategy.prepare(self.cards, self.columns)
 
     def get_next_card(self) -> Card:
         """Returns the next card.
@@ -28,56 +68,101 @@ class CardSession:
         """
         return self.strategy.get_next_card(self.cards)
 
-    def save_progress(self, file_path: Path) -> None:
+    def save_progress(self, file_path: Path, compression: str | None = None) -> None:
         """Saves the current session state.
 
+        Each card is converted and written in turn, see write_progress.
+
         Args:
             file_path (Path): The file path to save the state.
+            compression (str | None): "gzip" or "lzma", or None to choose by
+                the extension of file_path.
+        """
+        card_data = (card.to_dict() for card in self.cards)
+        write_progress(
+            self.progress_data(card_data), file_path, compression=compression
+        )
+
+    def progress_data(
+        self, card_data: Iterable[dict[str, Any]] | None = None
+    ) -> dict[str, Any]:
+        """Returns a copy of the session state, as save_progress writes it.
+
+        Args:
+            card_data (Iterable[dict[str, Any]] | None): The cards, already
+                converted with Card.to_dict. They are converted here if None.
+
+        Returns:
+            dict[str, Any]: The session state, which later reviews leave as is.
         """
-        data = {
+        return {
             "metadata": {
                 "version": "1.0",
                 "timestamp": datetime.now().isoformat(),
+                "journal_sequence": self.journal_sequence,
             },
             "session": {
                 "strategy": {
                     **self.strategy.to_dict(),
                 },
-                "cards": [card.to_dict() for card in self.cards],
+                "statistics": self.strategy.statistics.to_dict(),
+                "cards": [card.to_dict() for card in self.cards]
+                if card_data is None
+                else card_data,
             },
         }
-        with file_path.open("w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4, cls=SessionEncoder)
 
     @classmethod
-    def load_progress(cls, file_path: Path) -> "CardSession":
+    def load_progress(
+        cls,
+        file_path: Path,
+        columnar: bool = False,
+        arena: TextArena | None = None,
+    ) -> "CardSession":
         """Loads progress associated with the file path.
 
         Args:
             file_path (Path): The file path to load the progress from.
+            columnar (bool): Keep the card statistics in a columnar store.
+            arena (TextArena | None): Deduplicated storage for the card text.
         """
-        with file_path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        metadata = data.get("metadata", {})
-        if metadata.get("version") != "1.0":
-            msg = "Unsupported session version."
-            raise ValueError(msg)
-
-        session_data = data["session"]
-        strategy_info = session_data["strategy"]
-        strategy_name = strategy_info["type"]
-        if strategy_name not in STRATEGY_NAME_TO_CLASS:
-            msg = f"Unsupported strategy type: {strategy_name}"
-            raise ValueError(msg)
-        strategy_class = STRATEGY_NAME_TO_CLASS[strategy_name]
-        strategy = strategy_class.from_dict(strategy_info)
-
-        cards = [Card.from_dict(card_data) for card_data in session_data["cards"]]
-        return cls(cards=cards, strategy=strategy)
+        with reading_progress(file_path) as (data, card_data):
+            metadata = data.get("metadata", {})
+            if metadata.get("version") != "1.0":
+                msg = "Unsupported session version."
+                raise ValueError(msg)
+
+            session_data = data["session"]
+            strategy_info = session_data["strategy"]
+            strategy_name = strategy_info["type"]
+            if strategy_name not in STRATEGY_NAME_TO_CLASS:
+                msg = f"Unsupported strategy type: {strategy_name}"
+                raise ValueError(msg)
+            strategy_class = STRATEGY_NAME_TO_CLASS[strategy_name]
+            strategy = strategy_class.from_dict(strategy_info)
+
+            with paused_gc():
+                cards = [Card.from_dict(card) for card in card_data]
+                if arena is not None:
+                    cards = [
+                        ArenaCard(
+                            arena,
+                            arena.add(card.front),
+                            arena.add(card.back),
+                            card.statistics,
+                        )
+                        for card in cards
+                    ]
+        session = cls(cards=cards, strategy=strategy, columnar=columnar)
+        if "statistics" in session_data:
+            strategy.statistics = SessionStatistics.from_dict(
+                session_data["statistics"]
+            )
+        session.journal_sequence = metadata.get("journal_sequence", 0)
+        return session
 
     def get_statistics(self) -> dict[str, Any]:
-        """Returns the associated with the session.
+        """Returns the running statistics associated with the session.
 
         Returns:
             dict[str, Any]: The statistics associated with the session.
@@ -105,6 +190,130 @@ class CardSession:
         )
 
 
+def write_progress(
+    data: dict[str, Any],
+    file_path: Path,
+    sync: bool = False,
+    compression: str | None = None,
+) -> None:
+    """Writes session state returned by CardSession.progress_data to file_path.
+
+    The state is written as compact JSON with one card on each line, after
+    a first line holding everything else, for example::
+
+        {"metadata":{...},"session":{"strategy":{...},"statistics":{...},"cards":[
+        {"front":"ب","back":"baa","statistics":{}},
+        {"front":"ت","back":"taa","statistics":{}}
+        ]}}
+
+    The cards are encoded a batch at a time as they are iterated, so they
+    need not all be held as dicts at once. The file is replaced only once it
+    is complete.
+
+    Args:
+        data (dict[str, Any]): The session state.
+        file_path (Path): The file path to save the state.
+        sync (bool): Flush the file to disk before it replaces file_path.
+        compression (str | None): "gzip" or "lzma", or None to choose by the
+            extension of file_path (.gz or .xz), leaving other files as is.
+    """
+    if compression is None:
+        compression = COMPRESSION_SUFFIXES.get(file_path.suffix.lower())
+    encode = SessionEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    session = data["session"]
+    head = (
+        f'{{"metadata":{encode(data["metadata"])},"session":'
+        f'{{"strategy":{encode(session["strategy"])},'
+        f'"statistics":{encode(session["statistics"])},"cards":[\n'
+    )
+    with replacing_file(file_path, sync=sync) as f, _compressing(f, compression) as out:
+        out.write(head.encode("utf-8"))
+        separator = ""
+        for batch in batched(session["cards"], WRITE_BATCH):
+            out.write((separator + ",\n".join(map(encode, batch))).encode("utf-8"))
+            separator = ",\n"
+        out.write(b"\n]}}\n")
+
+
+@contextmanager
+def reading_progress(
+    file_path: Path,
+) -> Iterator[tuple[dict[str, Any], Iterator[dict[str, Any]]]]:
+    """Opens session state written by write_progress.
+
+    Compressed files are recognized by their content. Files laid out by
+    write_progress are read a card at a time; other JSON sessions, such as
+    the indented ones of earlier versions, are read whole.
+
+    Args:
+        file_path (Path): The file path to load the state from.
+
+    Yields:
+        tuple[dict[str, Any], Iterator[dict[str, Any]]]: The session state,
+        with its cards left out, and an iterator over the cards.
+    """
+    with file_path.open("rb") as raw, _decompressing(raw) as f:
+        head = f.readline()
+        if head.rstrip().endswith(_CARDS_HEAD):
+            yield (
+                json.loads(head + b"]}}", cls=SessionDecoder),
+                _read_cards(f, file_path),
+            )
+        else:
+            data = json.loads(head + f.read(), cls=SessionDecoder)
+            yield data, iter(data["session"]["cards"])
+
+
+def _read_cards(f: IO[bytes], file_path: Path) -> Iterator[dict[str, Any]]:
+    """Yields the cards written one to a line by write_progress.
+
+    The lines are decoded READ_BATCH at a time as one JSON array.
+    """
+    while lines := list(islice(f, READ_BATCH)):
+        # Newlines in the card text are escaped, so only the line closing
+        # the cards starts with "]".
+        body, closed, _ = ("\n" + b"".join(lines).decode("utf-8")).partition("\n]")
+        cards = json.loads("[" + body.rstrip(",\r\n") + "]")
+        for card in cards:
+            _decode_due(card)
+        yield from cards
+        if closed:
+            return
+    msg = f"Session file ends before its last card: {file_path}"
+    raise ValueError(msg)
+
+
+@contextmanager
+def _compressing(f: IO[bytes], compression: str | None) -> Iterator[IO[bytes]]:
+    """Yields a stream that writes to f with the given compression."""
+    if compression == "gzip":
+        with gzip.GzipFile(fileobj=f, mode="wb", compresslevel=GZIP_LEVEL) as out:
+            yield out  # type: ignore[misc]
+    elif compression == "lzma":
+        with lzma.LZMAFile(f, "wb", preset=LZMA_PRESET) as out:
+            yield out
+    elif compression is None:
+        yield f
+    else:
+        msg = f"Unsupported compression: {compression}"
+        raise ValueError(msg)
+
+
+@contextmanager
+def _decompressing(f: IO[bytes]) -> Iterator[IO[bytes]]:
+    """Yields a stream that reads f, decompressing it if its content is compressed."""
+    magic = f.read(len(_XZ_MAGIC))
+    f.seek(0)
+    if magic.startswith(_GZIP_MAGIC):
+        with gzip.GzipFile(fileobj=f, mode="rb") as decompressed:
+            yield decompressed  # type: ignore[misc]
+    elif magic == _XZ_MAGIC:
+        with lzma.LZMAFile(f, "rb") as decompressed:
+            yield decompressed
+    else:
+        yield f
+
+
 class SessionEncoder(json.JSONEncoder):
     """This class helps encode non-serializable data."""
 
@@ -128,6 +337,112 @@ class SessionDecoder(json.JSONDecoder):
             obj["timestamp"] = datetime.fromisoformat(obj["timestamp"])
         if "cards" in obj:
             for card in obj["cards"]:
-                if "due" in card:
-                    card["due"] = datetime.fromisoformat(card["due"])
+                _decode_due(card)
         return obj
+
+
+def _decode_due(card: dict[str, Any]) -> None:
+    """Converts the ISO due date of a card saved by earlier versions to epoch seconds."""
+    statistics = card.get("statistics", {})
+    if isinstance(statistics.get("due"), str):
+        statistics["due"] = to_epoch_seconds(datetime.fromisoformat(statistics["due"]))
+
+
+def cache_directory(name: str) -> Path:
+    """Returns the directory of the hifz cache called name.
+
+    The caches live under $HIFZ_CACHE_DIR if it is set, else under hifz in
+    $XDG_CACHE_HOME or ~/.cache.
+    """
+    if root := os.environ.get("HIFZ_CACHE_DIR"):
+        return Path(root) / name
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "hifz" / name
+
+
+@contextmanager
+def replacing_file(file_path: Path, sync: bool = False) -> Iterator[IO[bytes]]:
+    """Yields a temporary file that atomically replaces file_path once written.
+
+    The temporary file is created next to file_path, creating its directory
+    if needed, and removed if writing fails. With sync set, it is flushed to
+    disk before it replaces file_path, so a crash leaves the old or the new
+    content rather than a truncated file.
+    """
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    name = file_path.with_name(f".{file_path.name}.{secrets.token_hex(8)}.tmp")
+    # Created like open would, so the umask in effect gives the file its mode.
+    descriptor = os.open(
+        name, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666
+    )
+    try:
+        with open(descriptor, "wb") as f:  # noqa: PTH123
+            yield f
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+    except BaseException:
+        name.unlink(missing_ok=True)
+        raise
+    name.replace(file_path)
+
+
+@contextmanager
+def paused_gc() -> Iterator[None]:
+    """Pauses the cyclic garbage collector while a deck's objects are built.
+
+    Every card allocates several tracked objects that are never garbage, so
+    the collections their allocations trigger only rescan a growing heap.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def read_review_log(
+    file_path: Path, cards: list[Card], strategy: CardStrategy
+) -> Iterator[tuple[Card, Feedback]]:
+    """Reads the reviews recorded in a newline-delimited JSON review log.
+
+    Each line holds one review, for example
+    ``{"front": "ب", "back": "baa", "feedback": {"correct": true}}``. The back
+    may be left out, in which case the first card with that front is used.
+
+    Args:
+        file_path (Path): The path of the review log.
+        cards (list[Card]): The cards the reviews refer to.
+        strategy (CardStrategy): The strategy whose feedback type the reviews use.
+
+    Yields:
+        tuple[Card, Feedback]: The card and feedback of each review, in file order.
+    """
+    by_sides: dict[tuple[str, str], Card] = {}
+    by_front: dict[str, Card] = {}
+    for card in cards:
+        by_sides.setdefault((card.front, card.back), card)
+        by_front.setdefault(card.front, card)
+
+    with file_path.open("r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                front = record["front"]
+                if "back" in record:
+                    reviewed = by_sides.get((front, record["back"]))
+                else:
+                    reviewed = by_front.get(front)
+                feedback = strategy.create_feedback()
+                feedback.data.update(record["feedback"])
+            except (KeyError, TypeError, ValueError) as e:
+                msg = f"Malformed review on line {line_number} of {file_path}: {e!r}"
+                raise ValueError(msg) from e
+            if reviewed is None:
+                msg = f"Unknown card on line {line_number} of {file_path}: {front}"
+                raise ValueError(msg)
+            yield reviewed, feedback
@@ -123,6 +123,8 @@ class CLIVisualizer(Visualizer):
                     self.notify(f"Successfully loaded new cards from {new_file_path}")
                 else:
                     self.notify(f"Failed to load new cards from {new_file_path}")
+                    for error in engine.load_errors.values():
+                        self.notify(f"  {error}")
                 continue
 
             self.display_card_back(card)
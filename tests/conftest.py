@@ -1,10 +1,19 @@
+import threading
+import time
 import xml.dom.minidom as xml
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 import pytest
 
 from hifz.models import Card
 
 
+@pytest.fixture(autouse=True)
+def cache_directory(tmp_path_factory, monkeypatch):
+    """Fixture that keeps the caches of every test in a temporary directory."""
+    monkeypatch.setenv("HIFZ_CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
+
+
 @pytest.fixture
 def csv_file(tmp_path_factory):
     """Fixture that creates a temporary CSV file for testing.
@@ -140,3 +149,78 @@ def cards():
         Card("Capital of Germany?", "Berlin"),
         Card("Capital of Italy?", "Rome"),
     ]
+
+
+class DeckRequestHandler(BaseHTTPRequestHandler):
+    """Serves the decks of a DeckServer, answering conditional requests."""
+
+    server: "DeckServer"
+
+    def do_GET(self) -> None:
+        """Sends the deck at the path, or 304 if the client's copy is current."""
+        if self.path not in self.server.decks:
+            self.send_error(404)
+            return
+        time.sleep(self.server.delays.get(self.path, 0))
+        body, headers = self.server.decks[self.path]
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if (etag and self.headers.get("If-None-Match") == etag) or (
+            last_modified and self.headers.get("If-Modified-Since") == last_modified
+        ):
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        self.server.downloads.append(self.path)
+        self.send_response(200)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: object) -> None:
+        """Keeps the test output quiet."""
+
+
+class DeckServer(ThreadingHTTPServer):
+    """A local stand-in for a server hosting decks.
+
+    Attributes:
+        decks (dict[str, tuple[bytes, dict[str, str]]]): The body and response
+            headers served at each path.
+        delays (dict[str, float]): Seconds to wait before answering each path.
+        downloads (list[str]): The paths whose body was sent, in order.
+    """
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        """Binds the server to a free local port."""
+        super().__init__(("127.0.0.1", 0), DeckRequestHandler)
+        self.decks: dict[str, tuple[bytes, dict[str, str]]] = {}
+        self.delays: dict[str, float] = {}
+        self.downloads: list[str] = []
+
+    def url(self, path: str) -> str:
+        """Returns the URL of path on this server."""
+        return f"http://127.0.0.1:{self.server_port}{path}"
+
+
+@pytest.fixture
+def deck_server():
+    """Fixture that serves decks over HTTP from a background thread.
+
+    Returns:
+        DeckServer: The running server.
+    """
+    server = DeckServer()
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
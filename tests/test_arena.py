@@ -0,0 +1,68 @@
+import pickle
+
+from hifz.arena import ArenaCard, TextArena
+from hifz.card_engine import CardEngine
+from hifz.dataserver import DataServer
+from hifz.learning_strategies import SequentialStrategy
+from hifz.models import Card
+
+
+def test_text_arena_deduplicates():
+    """Test equal strings share one id and one copy of their bytes."""
+    arena = TextArena()
+
+    first = arena.add("بسم الله")
+    assert arena.add("baa") != first
+    assert arena.add("بسم الله") == first
+    assert len(arena) == 2
+    assert arena.get(first) == "بسم الله"
+
+
+def test_arena_card_behaves_like_card():
+    """Test arena cards read, compare and pickle like plain cards."""
+    arena = TextArena()
+    card = arena.card("ب", "baa")
+    card.statistics.update("correct", 1, lambda existing, new: (existing or 0) + new)
+
+    assert isinstance(card, ArenaCard)
+    assert card.front == "ب"
+    assert card.to_dict() == {"front": "ب", "back": "baa", "statistics": {"correct": 1}}
+    plain = Card("ب", "baa")
+    plain.statistics.data["correct"] = 1
+    assert card == plain
+    assert plain == card
+
+    restored = pickle.loads(pickle.dumps(card))
+    assert type(restored) is Card
+    assert restored == card
+
+
+def test_dataserver_interns_text(utf8_test_file):
+    """Test reading with an arena stores each text once, reversed or not."""
+    arena = TextArena()
+    server = DataServer()
+
+    cards = server.read_cards(str(utf8_test_file), arena=arena)
+    reversed_cards = server.read_cards(str(utf8_test_file), reverse=True, arena=arena)
+
+    assert Card("ب", "baa") in cards
+    assert Card("baa", "ب") in reversed_cards
+    assert len(arena) == 2 * len(cards)
+
+
+def test_engine_reload_shares_arena(utf8_test_file, tmp_path_factory):
+    """Test reloading and resuming an interned deck reuse the engine's arena."""
+    engine = CardEngine()
+    engine.load_cards(str(utf8_test_file), SequentialStrategy(), intern_text=True)
+    arena = engine._arena
+    assert arena is not None
+    size = len(arena)
+    save_file = tmp_path_factory.mktemp("session_data") / "session.json"
+    engine.save_progress(save_file)
+
+    engine.load_cards(str(utf8_test_file), SequentialStrategy(), intern_text=True)
+    engine.load_progress(save_file, intern_text=True)
+
+    assert engine._arena is arena
+    assert len(arena) == size
+    assert all(isinstance(card, ArenaCard) for card in engine.session.cards)
@@ -0,0 +1,130 @@
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from hifz.autosave import Autosaver
+from hifz.card_engine import CardEngine
+from hifz.learning_strategies import MasteryStrategy
+from hifz.models import Card
+from hifz.utils import CardSession
+
+
+def engine_with_cards() -> CardEngine:
+    """Returns an engine holding a session of ten cards."""
+    engine = CardEngine(deck_cache=None)
+    engine.session = CardSession(
+        [Card(f"f{i}", f"b{i}") for i in range(10)], MasteryStrategy()
+    )
+    return engine
+
+
+def review(engine: CardEngine, count: int) -> None:
+    """Answers count cards correctly through the engine."""
+    for _ in range(count):
+        card = engine.get_next_card()
+        feedback = engine.get_feedback()
+        feedback.data["correct"] = True
+        engine.process_feedback(card, feedback)
+
+
+def saved_correct(file_path: Path) -> int:
+    """Returns the number of correct answers in a saved session."""
+    return int(json.loads(file_path.read_text())["session"]["statistics"]["correct"])
+
+
+def wait_for_saves(engine: CardEngine, saves: int) -> None:
+    """Waits until the engine has autosaved saves times."""
+    deadline = time.monotonic() + 10
+    while engine._autosaver is not None and engine._autosaver.saves < saves:
+        assert time.monotonic() < deadline, "Autosave did not happen."
+        time.sleep(0.01)
+
+
+def test_autosave_after_reviews(tmp_path):
+    """Tests that a save starts once enough reviews are unsaved."""
+    save_file = tmp_path / "session.json"
+    engine = engine_with_cards()
+    engine.start_autosave(save_file, every=3, interval=60)
+
+    review(engine, 3)
+    wait_for_saves(engine, 1)
+
+    assert saved_correct(save_file) == 3
+    engine.stop_autosave()
+
+
+def test_autosave_after_interval(tmp_path):
+    """Tests that a single review is saved once the interval has passed."""
+    save_file = tmp_path / "session.json"
+    engine = engine_with_cards()
+    engine.start_autosave(save_file, every=1000, interval=0.05)
+
+    review(engine, 1)
+    wait_for_saves(engine, 1)
+
+    assert saved_correct(save_file) == 1
+    engine.stop_autosave()
+
+
+def test_stop_saves_pending_reviews_only(tmp_path):
+    """Tests that stopping saves unsaved reviews and never writes an untouched session."""
+    untouched = engine_with_cards()
+    untouched.start_autosave(tmp_path / "untouched.json")
+    untouched.stop_autosave()
+
+    save_file = tmp_path / "session.json"
+    engine = engine_with_cards()
+    engine.start_lookahead(2)
+    engine.start_autosave(save_file, every=4, interval=60)
+    review(engine, 6)
+    engine.stop_autosave()
+    engine.stop_lookahead()
+
+    assert not (tmp_path / "untouched.json").exists()
+    assert saved_correct(save_file) == 6
+
+
+def test_failed_autosave_is_raised_on_stop(tmp_path):
+    """Tests that an autosave error surfaces when autosave stops."""
+    save_file = tmp_path / "session.json"
+    save_file.mkdir()
+    engine = engine_with_cards()
+    engine.start_autosave(save_file, every=1)
+    review(engine, 1)
+
+    with pytest.raises(OSError, match="session.json"):
+        engine.stop_autosave()
+
+
+def test_failed_autosave_waits_an_interval_to_retry(tmp_path):
+    """Tests that a failing save is retried once per interval rather than at once."""
+    attempts = 0
+
+    def fail() -> dict[str, Any]:
+        nonlocal attempts
+        attempts += 1
+        msg = "disk full"
+        raise OSError(msg)
+
+    autosaver = Autosaver(tmp_path / "session.json", fail, every=1, interval=0.1)
+    autosaver.record(5)
+    time.sleep(0.35)
+
+    assert 1 <= attempts <= 5
+    with pytest.raises(OSError, match="disk full"):
+        autosaver.stop()
+
+
+def test_autosave_refuses_other_save_modes(tmp_path):
+    """Tests that SQLite and journaled sessions are not autosaved."""
+    engine = engine_with_cards()
+    with pytest.raises(ValueError, match="SQLite"):
+        engine.start_autosave(tmp_path / "session.sqlite")
+
+    engine.start_journal(tmp_path / "session.json")
+    with pytest.raises(ValueError, match="journaled"):
+        engine.start_autosave(tmp_path / "session.json")
+    engine.stop_journal()
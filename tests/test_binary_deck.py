@@ -0,0 +1,64 @@
+import pytest
+
+from hifz.binary_deck import read_binary_deck, write_binary_deck
+from hifz.card_engine import CardEngine
+from hifz.dataserver import DataServer
+from hifz.learning_strategies import SequentialStrategy
+from hifz.models import Card
+
+
+def test_binary_deck_round_trip(tmp_path_factory):
+    """Test a binary deck reads back the cards it was written from."""
+    file_path = tmp_path_factory.mktemp("data") / "deck.hifzb"
+    cards = [Card("ب", "baa"), Card("漢字", "kanji"), Card("ت", "baa")]
+
+    assert write_binary_deck(iter(cards), file_path) == 3
+
+    assert read_binary_deck(file_path) == cards
+    assert read_binary_deck(file_path, reverse=True) == [
+        Card(card.back, card.front) for card in cards
+    ]
+
+
+def test_binary_deck_cards_can_be_edited(tmp_path_factory):
+    """Test editing a mapped card keeps the new text in memory."""
+    file_path = tmp_path_factory.mktemp("data") / "deck.hifzb"
+    write_binary_deck([Card("ب", "baa")], file_path)
+    card = read_binary_deck(file_path)[0]
+
+    card.back = "ba"
+
+    assert card == Card("ب", "ba")
+    assert read_binary_deck(file_path)[0] == Card("ب", "baa")
+
+
+def test_binary_deck_rejects_other_files(tmp_path_factory):
+    """Test files without the magic bytes or cut short are rejected."""
+    directory = tmp_path_factory.mktemp("data")
+    not_binary = directory / "deck.hifzb"
+    not_binary.write_text("front,back\nب,baa\n" * 3, encoding="utf-8")
+    with pytest.raises(ValueError, match="Not a hifz binary deck"):
+        read_binary_deck(not_binary)
+
+    truncated = directory / "truncated.hifzb"
+    write_binary_deck([Card("ب", "baa")], truncated)
+    truncated.write_bytes(truncated.read_bytes()[:-2])
+    with pytest.raises(ValueError, match="Truncated binary deck"):
+        read_binary_deck(truncated)
+
+
+def test_engine_loads_converted_deck(utf8_test_file, tmp_path_factory):
+    """Test a deck converted from CSV loads and saves like the original."""
+    directory = tmp_path_factory.mktemp("data")
+    binary_path = directory / "deck.hifzb"
+    server = DataServer()
+    write_binary_deck(server.read_cards(str(utf8_test_file)), binary_path)
+
+    engine = CardEngine()
+    assert engine.load_cards(str(binary_path), SequentialStrategy())
+    assert engine.session.cards == server.read_cards(str(utf8_test_file))
+
+    save_file = directory / "session.json"
+    engine.save_progress(save_file)
+    engine.load_progress(save_file)
+    assert engine.get_next_card() == Card("ب", "baa")
@@ -1,12 +1,17 @@
+from datetime import datetime, timedelta
+
 import pytest
 
 from hifz.card_engine import CardEngine
 from hifz.learning_strategies import (
+    LeitnerStrategy,
     MasteryStrategy,
     RandomStrategy,
     SequentialStrategy,
     SimpleSpacedRepetitionStrategy,
 )
+from hifz.models import Card, to_epoch_seconds
+from hifz.utils import CardSession
 
 
 def test_load_cards(utf8_test_file):
@@ -86,6 +91,20 @@ def test_engine_unsupported_file_extension(tmp_path_factory):
     assert engine.load_cards(str(unsupported_file), RandomStrategy()) is False
 
 
+def test_engine_loads_several_sources(utf8_test_file, csv_file, tmp_path):
+    """Tests that several sources make one session, and a failed load keeps it."""
+    engine = CardEngine()
+    assert engine.load_cards([str(utf8_test_file), str(csv_file)], SequentialStrategy())
+    cards = engine.session.cards
+    assert len(cards) == 3
+    assert cards[-1].front == "ب"
+
+    missing = str(tmp_path / "missing.csv")
+    assert not engine.load_cards([str(csv_file), missing], SequentialStrategy())
+    assert list(engine.load_errors) == [missing]
+    assert engine.session.cards is cards
+
+
 def test_engine_save_progress(tmp_path_factory, utf8_test_file):
     """Test saving the current session state to a file."""
     tmp_dir = tmp_path_factory.mktemp("session_data")
@@ -202,3 +221,118 @@ def test_spaced_repetition_serialization(utf8_test_file, tmp_path_factory):
     output_path = tmp_path_factory.mktemp("saves") / "save.json"
     engine.save_progress(output_path)
     engine.load_progress(output_path)
+
+
+def test_replay_reviews(utf8_test_file, tmp_path_factory):
+    """Test applying a review log to a loaded session."""
+    log_file = tmp_path_factory.mktemp("logs") / "reviews.jsonl"
+    log_file.write_text(
+        '{"front": "ب", "back": "baa", "feedback": {"correct": true}}\n'
+        '{"front": "漢字", "feedback": {"correct": false}}\n'
+        "\n"
+        '{"front": "ب", "feedback": {"correct": true}}\n',
+        encoding="utf-8",
+    )
+
+    engine = CardEngine()
+    engine.load_cards(str(utf8_test_file), RandomStrategy())
+
+    assert engine.replay_reviews(log_file, batch_size=2) == 3
+    assert engine.get_statistics() == {"Correct": 2, "Incorrect": 1}
+    assert engine.session.cards[0].statistics.get("correct") == 2
+
+
+def test_replay_reviews_unknown_card(utf8_test_file, tmp_path_factory):
+    """Test that a review of a card missing from the deck is reported."""
+    log_file = tmp_path_factory.mktemp("logs") / "reviews.jsonl"
+    log_file.write_text(
+        '{"front": "missing", "feedback": {"correct": true}}\n', encoding="utf-8"
+    )
+
+    engine = CardEngine()
+    engine.load_cards(str(utf8_test_file), RandomStrategy())
+
+    with pytest.raises(ValueError, match="Unknown card on line 1"):
+        engine.replay_reviews(log_file)
+
+
+@pytest.mark.parametrize(
+    "record",
+    [
+        '{"back": "baa", "feedback": {"correct": true}}',
+        '{"front": "ب", "back": "baa"}',
+        '{"front": "ب", "feedback": true}',
+        '{"front": "ب"',
+    ],
+)
+def test_replay_reviews_malformed_record(utf8_test_file, tmp_path_factory, record):
+    """Test that a malformed review is reported with its line number."""
+    log_file = tmp_path_factory.mktemp("logs") / "reviews.jsonl"
+    log_file.write_text(
+        '{"front": "ب", "feedback": {"correct": true}}\n' + record + "\n",
+        encoding="utf-8",
+    )
+
+    engine = CardEngine()
+    engine.load_cards(str(utf8_test_file), RandomStrategy())
+
+    with pytest.raises(ValueError, match="Malformed review on line 2"):
+        engine.replay_reviews(log_file)
+
+
+@pytest.mark.parametrize(
+    "strategy_cls", [SequentialStrategy, MasteryStrategy, LeitnerStrategy]
+)
+def test_lookahead_matches_synchronous_engine(tmp_path_factory, strategy_cls):
+    """Test the background lookahead hands out the same cards as plain calls."""
+    file_path = tmp_path_factory.mktemp("data") / "deck.csv"
+    file_path.write_text(
+        "front,back\n" + "".join(f"Front{i},Back{i}\n" for i in range(5)),
+        encoding="utf-8",
+    )
+    plain = CardEngine()
+    plain.load_cards(str(file_path), strategy_cls())
+    speculative = CardEngine()
+    speculative.load_cards(str(file_path), strategy_cls())
+    speculative.start_lookahead(3)
+
+    for step in range(20):
+        assert speculative.peek_next(3) == plain.peek_next(3)
+        for engine in (plain, speculative):
+            card = engine.get_next_card()
+            feedback = engine.get_feedback()
+            feedback.data["correct"] = step % 3 != 0
+            engine.process_feedback(card, feedback)
+        assert [card.front for card in speculative.peek_next(1)] == [
+            card.front for card in plain.peek_next(1)
+        ]
+
+    speculative.stop_lookahead()
+    assert speculative.get_statistics() == plain.get_statistics()
+
+
+def test_lookahead_hands_out_a_card_that_fell_due():
+    """Test that cards peeked before a card fell due are not handed out after it."""
+    now = datetime(2024, 1, 1)
+    strategy = SimpleSpacedRepetitionStrategy()
+    strategy.clock = lambda: now
+    cards = [Card(f"Front{i}", f"Back{i}") for i in range(20)]
+    for card in cards:
+        card.statistics.data["due"] = to_epoch_seconds(now + timedelta(days=1))
+    cards[5].statistics.data["due"] = to_epoch_seconds(now + timedelta(seconds=10))
+    engine = CardEngine(deck_cache=None)
+    engine.session = CardSession(cards, strategy)
+    engine.start_lookahead(2)
+    engine.peek_next(2)
+
+    now += timedelta(seconds=10)
+
+    assert engine.peek_next(1) == [cards[5]]
+    assert engine.get_next_card() is cards[5]
+    engine.stop_lookahead()
+
+
+def test_lookahead_requires_positive_k():
+    """Test start_lookahead rejects an empty lookahead."""
+    with pytest.raises(ValueError, match="at least 1"):
+        CardEngine().start_lookahead(0)
@@ -0,0 +1,132 @@
+from datetime import datetime, timedelta
+from typing import Any
+
+import pytest
+
+from hifz.learning_strategies import (
+    MasteryStrategy,
+    RandomStrategy,
+    SimpleSpacedRepetitionStrategy,
+)
+from hifz.models import Card, to_epoch_seconds
+from hifz.utils import CardSession
+
+np = pytest.importorskip("numpy")
+columnar = pytest.importorskip("hifz.columnar")
+
+
+def test_columnar_view_round_trips_statistics():
+    """Test that the dict view reads back what was written, including custom keys."""
+    card = Card("Front1", "Back1")
+    due = to_epoch_seconds(datetime(2024, 5, 1, 12, 30, 15))
+    card.statistics.data = {"correct": 2, "due": due, "difficulty": "hard"}
+
+    store = columnar.ColumnarStatistics.from_cards([card])
+
+    assert isinstance(card.statistics.data, columnar.StatisticsView)
+    assert card.statistics.get("correct") == 2
+    assert card.statistics.get("due") == due
+    assert card.statistics.get("difficulty") == "hard"
+    assert card.statistics.get("incorrect") is None
+    assert "interval" not in card.statistics.data
+    assert store.columns["correct"][0] == 2
+    assert card.to_dict()["statistics"] == {
+        "correct": 2,
+        "due": due,
+        "difficulty": "hard",
+    }
+
+
+def test_columnar_view_keeps_non_integral_counts():
+    """Test that a fractional count is kept as written instead of truncated."""
+    card = Card("Front1", "Back1")
+    card.statistics.data = {"correct": 1.9, "seen": 2.0}
+
+    store = columnar.ColumnarStatistics.from_cards([card])
+
+    assert card.statistics.get("correct") == 1.9
+    assert store.columns["correct"][0] == columnar.MISSING_COUNT
+    assert card.statistics.get("seen") == 2
+    assert store.columns["seen"][0] == 2
+    assert card.to_dict()["statistics"] == {"seen": 2, "correct": 1.9}
+
+
+def test_columnar_view_reads_legacy_due_datetimes():
+    """Test due datetimes of older sessions are stored as epoch seconds."""
+    card = Card("Front1", "Back1")
+    due = datetime(2024, 5, 1, 12, 30, 15)
+    card.statistics.data = {"due": due}
+
+    columnar.ColumnarStatistics.from_cards([card])
+
+    assert card.statistics.get("due") == to_epoch_seconds(due)
+
+
+def test_columnar_session_processes_feedback():
+    """Test that strategy updates go through the view into the columns."""
+    cards = [Card("Front1", "Back1"), Card("Front2", "Back2")]
+    strategy = RandomStrategy()
+    session = CardSession(cards, strategy, columnar=True)
+
+    feedback = strategy.create_feedback()
+    feedback.data["correct"] = True
+    strategy.process_feedback(cards[1], feedback)
+
+    assert session.columns is not None
+    assert session.columns.columns["correct"].tolist() == [-1, 1]
+    assert session.get_statistics() == {"Correct": 1, "Incorrect": 0}
+
+
+def test_columnar_scans_match_dict_scans():
+    """Test the vectorized deck scans agree with the per-card scans."""
+
+    def make_cards() -> list[Card]:
+        cards = [Card(f"Front{i}", f"Back{i}") for i in range(4)]
+        cards[0].statistics.data = {"correct": 6, "seen": 6}
+        cards[1].statistics.data = {"correct": 0, "incorrect": 2, "seen": 2}
+        cards[2].statistics.data = {"correct": 5, "incorrect": 1, "seen": 7}
+        return cards
+
+    dict_session = CardSession(make_cards(), MasteryStrategy())
+    columnar_session = CardSession(make_cards(), MasteryStrategy(), columnar=True)
+
+    assert columnar_session.get_statistics() == dict_session.get_statistics()
+    assert [columnar_session.get_next_card().front for _ in range(3)] == [
+        dict_session.get_next_card().front for _ in range(3)
+    ]
+
+
+def test_columnar_spaced_repetition_due_count():
+    """Test counting due cards straight from the due column."""
+    now = datetime.now()
+    cards = [Card(f"Front{i}", f"Back{i}") for i in range(3)]
+    cards[0].statistics.data = {"due": now - timedelta(days=1)}
+    cards[1].statistics.data = {"due": now + timedelta(days=1)}
+
+    session = CardSession(cards, SimpleSpacedRepetitionStrategy(), columnar=True)
+
+    assert session.columns is not None
+    assert session.columns.count_due(now) == 2
+    assert session.get_next_card() == cards[0]
+
+
+def test_columnar_batch_matches_dict_batch():
+    """Test the vectorized batch path agrees with the per-review path."""
+    outcomes = [True, False, True, True, False]
+
+    def run(use_columns: bool) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+        strategy = RandomStrategy()
+        cards = [Card(f"Front{i}", f"Back{i}") for i in range(3)]
+        session = CardSession(cards, strategy, columnar=use_columns)
+        reviews = []
+        for correct in outcomes:
+            feedback = strategy.create_feedback()
+            feedback.data["correct"] = correct
+            reviews.append((cards[0 if correct else 1], feedback))
+        strategy.process_feedback_batch(reviews)
+        return [card.to_dict() for card in cards], {
+            **session.get_statistics(),
+            "Seen": strategy.statistics.seen,
+        }
+
+    assert run(use_columns=True) == run(use_columns=False)
@@ -1,7 +1,24 @@
+import csv
+import io
+import json
+import threading
+import time
+from itertools import pairwise
+from pathlib import Path
+from urllib.error import HTTPError
+
 import pytest
 
-from hifz.dataserver import DataServer
+from hifz.arena import ArenaCard, TextArena
+from hifz.dataserver import (
+    CSVFileInputStrategy,
+    DataServer,
+    SourceLoadError,
+    TSVFileInputStrategy,
+    _iter_json_array,
+)
 from hifz.models import Card
+from hifz.url_cache import URLCache
 
 
 def test_utf8_encoding_support(utf8_test_file):
@@ -182,21 +199,319 @@ def test_dataserver_card_reversal(utf8_test_file):
     assert Card("kanji", "漢字") in cards
 
 
-def test_dataserver_reads_from_url(monkeypatch, mocker):
+def test_dataserver_reads_from_url(deck_server, tmp_path):
     """Test that DataServer correctly reads data from a URL."""
-    mock_response = mocker.MagicMock()
-    mock_response.read.return_value = b"front,back\nHello,World\nTest,Card\n"
-
-    def mock_urlopen(url):
-        _ = url
-        return mock_response
-
-    monkeypatch.setattr("hifz.dataserver.urlopen", mock_urlopen)
+    deck_server.decks["/test.csv"] = (b"front,back\nHello,World\nTest,Card\n", {})
 
-    server = DataServer()
+    server = DataServer(URLCache(tmp_path))
 
-    test_url = "http://example.com/test.csv"
+    test_url = deck_server.url("/test.csv")
     cards = server.read_cards(test_url)
 
     assert Card("Hello", "World") in cards
     assert Card("Test", "Card") in cards
+
+
+@pytest.mark.parametrize(
+    "fixture", ["csv_file", "tsv_file", "json_file", "xml_file", "utf8_test_file"]
+)
+def test_dataserver_iter_cards_matches_read_cards(request, fixture):
+    """Tests that streaming a deck yields the cards read in one go, in order."""
+    file_path = str(request.getfixturevalue(fixture))
+    server = DataServer()
+
+    assert list(server.iter_cards(file_path)) == server.read_cards(file_path)
+
+
+def test_dataserver_iter_cards_is_lazy(tmp_path_factory):
+    """Tests that the first card is yielded before a broken tail is parsed."""
+    json_file = tmp_path_factory.mktemp("data") / "broken.json"
+    json_file.write_text('[{"front": "a", "back": "b"}, {"front": ')
+    cards = DataServer().iter_cards(str(json_file))
+
+    assert next(cards) == Card("a", "b")
+    with pytest.raises(ValueError, match="Error: "):
+        next(cards)
+
+
+def test_json_array_parser_handles_chunk_boundaries():
+    """Tests that elements split across chunks decode like json.loads."""
+    entries = [
+        {"front": "漢字", "back": 'quote " and \\ and é'},
+        12345678,
+        -1.5e10,
+        True,
+        None,
+        [1, [2, {"nested": []}]],
+        "",
+    ]
+    text = " [ " + " ,\n".join(json.dumps(e) for e in entries) + " ] "
+
+    for chunk_size in (1, 2, 3, 7, 64):
+        assert list(_iter_json_array(io.StringIO(text), chunk_size)) == entries
+
+
+@pytest.mark.parametrize(
+    "text", ['{"front": "a"}', "[1, 2", "[1 2]", "[1,]", "", "[", "[1]x", "[1] \n [2]"]
+)
+def test_json_array_parser_rejects_malformed_input(text):
+    """Tests that malformed arrays raise ValueError."""
+    with pytest.raises(ValueError, match="JSON|Expecting"):
+        list(_iter_json_array(io.StringIO(text), chunk_size=2))
+
+
+@pytest.mark.parametrize(
+    "element", ['{"front": x}', '{"front": "a" "back": "b"}', '{"front": "a"}}', "tru"]
+)
+def test_json_array_parser_rejects_malformed_elements_early(element):
+    """Tests that a malformed element is reported before the rest of the file is read."""
+    text = "[" + element + "," + ", ".join(['{"front": "a", "back": "b"}'] * 1000) + "]"
+    f = io.StringIO(text)
+
+    with pytest.raises(ValueError, match="JSON|Expecting|Extra"):
+        list(_iter_json_array(f, chunk_size=64))
+
+    assert f.tell() < 256
+
+
+def test_dataserver_csv_columns_located_by_header(tmp_path_factory):
+    """Tests that CSV columns are found by name, in any order among others."""
+    csv_file = tmp_path_factory.mktemp("data") / "columns.csv"
+    csv_file.write_text('id,back,front\n1,b1,f1\n\n2,"b,2",f2\n', encoding="utf-8")
+
+    cards = DataServer().read_cards(str(csv_file))
+
+    assert cards == [Card("f1", "b1"), Card("f2", "b,2")]
+
+
+@pytest.mark.parametrize(
+    ("content", "message"),
+    [
+        ("front,answer\na,b\n", "Missing front or back column"),
+        ("front,back\na\n", "Missing field on line 2"),
+    ],
+)
+def test_dataserver_csv_malformed(tmp_path_factory, content, message):
+    """Tests that missing columns and short rows raise ValueError."""
+    csv_file = tmp_path_factory.mktemp("data") / "malformed.csv"
+    csv_file.write_text(content, encoding="utf-8")
+
+    with pytest.raises(ValueError, match=message):
+        DataServer().read_cards(str(csv_file))
+
+
+@pytest.mark.parametrize(
+    ("card", "message"),
+    [
+        ("<front></front><back>b</back>", "Missing card front in "),
+        ("<front/><back>b</back>", "Missing card front in "),
+        ("<front><b>a</b></front><back>b</back>", "Front node is not of type Text"),
+        ("<front>a</front><back></back>", "Missing card back in "),
+        ("<front>a</front><back><i>b</i></back>", "Back node is not of type Text"),
+    ],
+)
+def test_dataserver_xml_validation(tmp_path_factory, card, message):
+    """Tests that empty and non-text fronts and backs are rejected."""
+    xml_file = tmp_path_factory.mktemp("data") / "invalid.xml"
+    xml_file.write_text(
+        f"<cards><card><front>ok</front><back>ok</back></card><card>{card}</card></cards>",
+        encoding="utf-8",
+    )
+
+    with pytest.raises(ValueError, match=message):
+        DataServer().read_cards(str(xml_file))
+
+
+def test_dataserver_xml_nested_cards(tmp_path_factory):
+    """Tests that cards are found at any depth, in document order."""
+    xml_file = tmp_path_factory.mktemp("data") / "nested.xml"
+    xml_file.write_text(
+        '<?xml version="1.0" encoding="utf-8"?>'
+        "<deck><meta>ignored</meta><cards>"
+        "<card><front>ب</front><back>baa</back></card>"
+        "<group><card><note/><front>a &amp; b</front><back>c</back></card></group>"
+        "</cards></deck>",
+        encoding="utf-8",
+    )
+
+    cards = DataServer().read_cards(str(xml_file))
+
+    assert cards == [Card("ب", "baa"), Card("a & b", "c")]
+
+
+def _write_tricky_csv(file_path: Path, rows: int, delimiter: str = ",") -> None:
+    """Writes rows whose fields hold quotes, delimiters and newlines."""
+    with file_path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f, delimiter=delimiter)
+        writer.writerow(["id", "front", "back"])
+        for i in range(rows):
+            writer.writerow(
+                [i, f'line one\nline "{i}"\r\nend', f"b{delimiter}{i}"]
+                if i % 3 == 0
+                else [i, f"ب{i}", f"back {i}"]
+            )
+
+
+@pytest.mark.parametrize(
+    ("strategy", "suffix", "delimiter"),
+    [(CSVFileInputStrategy(), "csv", ","), (TSVFileInputStrategy(), "tsv", "\t")],
+)
+def test_csv_ranges_respect_quoted_newlines(
+    tmp_path_factory, strategy, suffix, delimiter
+):
+    """Tests that parsing every range gives the rows of a sequential read."""
+    file_path = tmp_path_factory.mktemp("data") / f"tricky.{suffix}"
+    _write_tricky_csv(file_path, 50, delimiter)
+    expected = [
+        text
+        for card in strategy.read_cards(file_path)
+        for text in (card.front, card.back)
+    ]
+
+    for chunk_bytes in (1, 7, 40, 1 << 20):
+        bounds = strategy.ranges(file_path, chunk_bytes)
+        fields = [
+            text
+            for start, end in bounds
+            for text in strategy.parse_range(file_path, start, end)
+        ]
+        assert fields == expected
+        assert all(end == start for (_, end), (start, _) in pairwise(bounds))
+
+
+def test_dataserver_reads_ndjson(tmp_path_factory):
+    """Tests that .ndjson and .jsonl files hold one card per non-blank line."""
+    directory = tmp_path_factory.mktemp("data")
+    lines = '{"front": "a", "back": "b"}\n\n{"front": "c\\u2028d", "back": "e"}\n'
+    for suffix in ("ndjson", "jsonl"):
+        file_path = directory / f"deck.{suffix}"
+        file_path.write_text(lines, encoding="utf-8")
+
+        cards = DataServer().read_cards(str(file_path))
+
+        assert cards == [Card("a", "b"), Card("c\u2028d", "e")]
+
+
+@pytest.mark.parametrize("suffix", ["csv", "ndjson"])
+def test_dataserver_parallel_read_keeps_order(tmp_path_factory, monkeypatch, suffix):
+    """Tests that a deck parsed across processes matches a sequential read."""
+    monkeypatch.setattr("hifz.dataserver.MIN_PARALLEL_CHUNK_BYTES", 64)
+    file_path = tmp_path_factory.mktemp("data") / f"deck.{suffix}"
+    if suffix == "csv":
+        _write_tricky_csv(file_path, 200)
+    else:
+        file_path.write_text(
+            "".join(
+                json.dumps({"front": f"f{i}", "back": f"b\n{i}"}) + "\n"
+                for i in range(200)
+            ),
+            encoding="utf-8",
+        )
+    server = DataServer()
+    arena = TextArena()
+
+    cards = server.read_cards(str(file_path), reverse=True, arena=arena, workers=2)
+
+    assert cards == server.read_cards(str(file_path), reverse=True)
+    assert all(isinstance(card, ArenaCard) for card in cards)
+
+
+def test_read_sources_loads_concurrently_in_order(deck_server, tmp_path, csv_file):
+    """Tests that slow URLs load side by side and keep the order of the sources."""
+    for i in range(4):
+        deck_server.decks[f"/{i}.csv"] = (f"front,back\nf{i},b{i}\n".encode(), {})
+        deck_server.delays[f"/{i}.csv"] = 0.4
+    sources = [deck_server.url(f"/{i}.csv") for i in range(4)]
+    server = DataServer(URLCache(tmp_path))
+
+    started = time.monotonic()
+    cards = server.read_sources([*sources, str(csv_file)], reverse=True)
+    elapsed = time.monotonic() - started
+
+    assert cards == [*(Card(f"b{i}", f"f{i}") for i in range(4)), Card("baa", "ب")]
+    assert elapsed < 1.2
+
+
+def test_read_sources_aggregates_errors(deck_server, tmp_path, csv_file):
+    """Tests that every failed source is reported with its own error."""
+    unsupported = tmp_path / "deck.unsupported"
+    unsupported.write_text("")
+    missing_url = deck_server.url("/missing.csv")
+    server = DataServer(URLCache(tmp_path / "cache"))
+
+    with pytest.raises(SourceLoadError, match="3 source") as excinfo:
+        server.read_sources(
+            [str(csv_file), "missing.csv", str(unsupported), missing_url]
+        )
+
+    errors = excinfo.value.errors
+    assert set(errors) == {"missing.csv", str(unsupported), missing_url}
+    assert isinstance(errors["missing.csv"], FileNotFoundError)
+    assert isinstance(errors[str(unsupported)], ValueError)
+    assert isinstance(errors[missing_url], HTTPError)
+
+
+def test_read_sources_times_out_slow_sources(deck_server, tmp_path, csv_file):
+    """Tests that a source still loading after the timeout fails without blocking."""
+    deck_server.decks["/slow.csv"] = (b"front,back\na,b\n", {})
+    deck_server.delays["/slow.csv"] = 3
+    server = DataServer(URLCache(tmp_path))
+
+    started = time.monotonic()
+    with pytest.raises(SourceLoadError) as excinfo:
+        server.read_sources([str(csv_file), deck_server.url("/slow.csv")], timeout=0.2)
+
+    assert time.monotonic() - started < 2
+    assert list(excinfo.value.errors) == [deck_server.url("/slow.csv")]
+    assert isinstance(excinfo.value.errors[deck_server.url("/slow.csv")], TimeoutError)
+
+
+class SlowFileInputStrategy(CSVFileInputStrategy):
+    """A reader taking about 3 seconds per deck, which sets stopped once closed."""
+
+    def __init__(self, stopped: threading.Event) -> None:
+        self.stopped = stopped
+
+    def iter_cards(self, *_args, **_kwargs):
+        try:
+            for _ in range(300):
+                time.sleep(0.01)
+                yield Card("front", "back")
+        finally:
+            self.stopped.set()
+
+
+def test_read_sources_cancels_the_parse_of_timed_out_sources(tmp_path):
+    """Tests that a local source parsing past the timeout stops parsing."""
+    stopped = threading.Event()
+
+    slow = tmp_path / "deck.slow"
+    slow.write_text("")
+    server = DataServer(URLCache(tmp_path / "urls"))
+    server.file_reader.strategies[".slow"] = SlowFileInputStrategy(stopped)
+
+    with pytest.raises(SourceLoadError) as excinfo:
+        server.read_sources([str(slow)], timeout=0.2)
+
+    assert isinstance(excinfo.value.errors[str(slow)], TimeoutError)
+    assert stopped.wait(2)
+
+
+def test_read_sources_times_out_queued_sources(tmp_path, csv_file):
+    """Tests that a source queued behind a timed-out one times out in turn."""
+    stopped = threading.Event()
+    slow = [tmp_path / f"deck{i}.slow" for i in range(2)]
+    for path in slow:
+        path.write_text("")
+    server = DataServer(URLCache(tmp_path / "urls"))
+    server.file_reader.strategies[".slow"] = SlowFileInputStrategy(stopped)
+
+    started = time.monotonic()
+    with pytest.raises(SourceLoadError) as excinfo:
+        server.read_sources(
+            [str(csv_file), *map(str, slow)], timeout=0.2, max_concurrency=1
+        )
+
+    assert time.monotonic() - started < 1.5
+    assert sorted(excinfo.value.errors) == sorted(map(str, slow))
+    assert all(isinstance(err, TimeoutError) for err in excinfo.value.errors.values())
@@ -0,0 +1,166 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from hifz.arena import ArenaCard, TextArena
+from hifz.card_engine import CardEngine
+from hifz.dataserver import FileInputReader
+from hifz.deck_cache import DeckCache
+from hifz.learning_strategies import SequentialStrategy
+from hifz.models import Card
+
+
+class CountingParser:
+    """Parses decks through FileInputReader, counting the parses."""
+
+    def __init__(self, file_path: Path, reverse: bool = False) -> None:
+        self.file_path = file_path
+        self.reverse = reverse
+        self.calls = 0
+
+    def __call__(self) -> list[Card]:
+        self.calls += 1
+        return FileInputReader().read_cards(str(self.file_path), reverse=self.reverse)
+
+
+@pytest.fixture
+def deck(tmp_path):
+    """Fixture that writes a JSON deck of 100 cards."""
+    file_path = tmp_path / "deck.json"
+    file_path.write_text(
+        json.dumps([{"front": f"f{i}", "back": f"b{i}"} for i in range(100)]),
+        encoding="utf-8",
+    )
+    return file_path
+
+
+def expected_cards(reverse: bool = False) -> list[Card]:
+    """Returns the cards of the deck fixture."""
+    return [
+        Card(f"b{i}", f"f{i}") if reverse else Card(f"f{i}", f"b{i}")
+        for i in range(100)
+    ]
+
+
+def test_unchanged_deck_is_parsed_once(deck, tmp_path):
+    """Tests that a reload and a restart both skip parsing."""
+    parse = CountingParser(deck)
+    cache = DeckCache(tmp_path / "cache")
+    first = cache.read_cards(deck, parse)
+    first[0].statistics.data["seen"] = 1
+
+    reloaded = cache.read_cards(deck, parse)
+    restarted = DeckCache(tmp_path / "cache").read_cards(deck, parse)
+
+    assert parse.calls == 1
+    assert reloaded == restarted == expected_cards()
+    assert all(isinstance(card, ArenaCard) for card in restarted)
+    assert reloaded[0] is not first[0]
+
+
+def test_deck_is_hashed_once_on_a_miss(deck, tmp_path, monkeypatch):
+    """Tests that a deck missing from the cache is read for hashing only once."""
+    hashed = []
+    snapshot_name = DeckCache._snapshot_name
+
+    def counting_name(key: tuple[str, int, int, bool], file_path: Path) -> str:
+        hashed.append(file_path)
+        return snapshot_name(key, file_path)
+
+    monkeypatch.setattr(DeckCache, "_snapshot_name", staticmethod(counting_name))
+    DeckCache(tmp_path / "cache").read_cards(deck, CountingParser(deck))
+
+    assert hashed == [deck]
+
+
+def test_unwritable_cache_still_loads_the_deck(deck, tmp_path):
+    """Tests that failing to snapshot a deck returns the parsed cards."""
+    blocker = tmp_path / "blocker"
+    blocker.write_text("")
+    parse = CountingParser(deck)
+    cache = DeckCache(blocker / "cache")
+
+    assert cache.read_cards(deck, parse) == expected_cards()
+    assert cache.read_cards(deck, parse) == expected_cards()
+    assert parse.calls == 2
+
+
+def test_changed_deck_is_parsed_again(deck, tmp_path):
+    """Tests that editing a deck invalidates its snapshot."""
+    parse = CountingParser(deck)
+    cache = DeckCache(tmp_path / "cache")
+    cache.read_cards(deck, parse)
+
+    deck.write_text('[{"front": "new", "back": "card"}]', encoding="utf-8")
+
+    assert cache.read_cards(deck, parse) == [Card("new", "card")]
+    assert parse.calls == 2
+
+
+def test_touched_deck_reuses_snapshot_by_content(deck, tmp_path):
+    """Tests that a deck whose modification time changed is matched by its hash."""
+    parse = CountingParser(deck)
+    DeckCache(tmp_path / "cache").read_cards(deck, parse)
+    status = deck.stat()
+    os.utime(deck, ns=(status.st_atime_ns, status.st_mtime_ns + 10**9))
+
+    assert DeckCache(tmp_path / "cache").read_cards(deck, parse) == expected_cards()
+    assert parse.calls == 1
+
+
+def test_reversed_deck_is_cached_separately(deck, tmp_path):
+    """Tests that the orientation of a deck is part of its key."""
+    cache = DeckCache(tmp_path / "cache")
+    cache.read_cards(deck, CountingParser(deck))
+
+    cards = cache.read_cards(deck, CountingParser(deck, reverse=True), reverse=True)
+
+    assert cards == expected_cards(reverse=True)
+    assert len(list((tmp_path / "cache").glob("*.hifzb"))) == 2
+
+
+def test_cached_cards_can_use_an_arena(deck, tmp_path):
+    """Tests that cached text is moved into the arena passed in."""
+    cache = DeckCache(tmp_path / "cache")
+    cache.read_cards(deck, CountingParser(deck))
+    arena = TextArena()
+
+    cards = cache.read_cards(deck, CountingParser(deck), arena=arena)
+
+    assert cards == expected_cards()
+    assert all(isinstance(card, ArenaCard) and card._arena is arena for card in cards)
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    """Tests that the memory and disk bounds drop the oldest decks first."""
+    cache = DeckCache(tmp_path / "cache", max_entries=2, max_bytes=1)
+    decks = []
+    for i in range(3):
+        file_path = tmp_path / f"deck{i}.csv"
+        file_path.write_text(f"front,back\nf{i},b{i}\n", encoding="utf-8")
+        cache.read_cards(file_path, CountingParser(file_path))
+        decks.append(file_path)
+
+    assert len(cache._memory) == 2
+    assert len(list((tmp_path / "cache").glob("*.hifzb"))) == 1
+    assert len(json.loads((tmp_path / "cache" / "index.json").read_text())) == 1
+
+    parse = CountingParser(decks[0])
+    assert cache.read_cards(decks[0], parse) == [Card("f0", "b0")]
+    assert parse.calls == 1
+
+
+def test_engine_reload_uses_deck_cache(deck, tmp_path, monkeypatch):
+    """Tests that reloading a deck in the engine skips parsing with fresh statistics."""
+    engine = CardEngine(deck_cache=DeckCache(tmp_path / "cache"))
+    assert engine.load_cards(str(deck), SequentialStrategy())
+    engine.session.cards[0].statistics.data["seen"] = 3
+
+    def fail(*_args, **_kwargs):
+        raise AssertionError
+
+    monkeypatch.setattr(FileInputReader, "read_cards", fail)
+    assert engine.load_cards(str(deck), SequentialStrategy())
+    assert engine.session.cards == expected_cards()
@@ -0,0 +1,229 @@
+import json
+import threading
+from datetime import datetime
+from typing import Any
+
+import pytest
+
+from hifz.card_engine import CardEngine
+from hifz.journal import ReviewJournal, journal_path, read_journal
+from hifz.learning_strategies import (
+    STRATEGY_NAME_TO_CLASS,
+    CardStrategy,
+    MasteryStrategy,
+    SimpleSpacedRepetitionStrategy,
+)
+from hifz.models import Card
+from hifz.utils import CardSession
+
+
+def engine_with(strategy: CardStrategy) -> CardEngine:
+    """Returns an engine holding a session of ten cards."""
+    engine = CardEngine(deck_cache=None)
+    engine.session = CardSession([Card(f"f{i}", f"b{i}") for i in range(10)], strategy)
+    return engine
+
+
+def review(engine: CardEngine, correct: bool = True) -> Card:
+    """Answers the next card through the engine and returns it."""
+    card = engine.get_next_card()
+    feedback = engine.get_feedback()
+    feedback.data["correct"] = correct
+    engine.process_feedback(card, feedback)
+    return card
+
+
+def test_journal_is_replayed_after_a_crash(tmp_path):
+    """Tests that journaled reviews survive without a final save."""
+    save_file = tmp_path / "session.json"
+    engine = engine_with(MasteryStrategy())
+    engine.start_journal(save_file, sync_every=1)
+    for _ in range(3):
+        review(engine)
+
+    resumed = CardEngine(deck_cache=None)
+    resumed.load_progress(save_file)
+
+    assert [card.statistics.get("correct") for card in resumed.session.cards[:4]] == [
+        1,
+        1,
+        1,
+        None,
+    ]
+    assert resumed.session.strategy.statistics.correct == 3
+    assert resumed.session.journal_sequence == 6
+    engine.stop_journal()
+
+
+@pytest.mark.parametrize("lookahead", [0, 2])
+@pytest.mark.parametrize("name", sorted(STRATEGY_NAME_TO_CLASS))
+def test_replay_restores_the_strategy_state(tmp_path, name: str, lookahead: int):
+    """Tests that resuming from the journal restores the cursor of every strategy."""
+    save_file = tmp_path / "session.json"
+    engine = engine_with(STRATEGY_NAME_TO_CLASS[name]())
+    if lookahead:
+        engine.start_lookahead(lookahead)
+    engine.start_journal(save_file, sync_every=1)
+    for i in range(13):
+        review(engine, correct=i % 3 != 0)
+    engine.get_next_card()
+    engine.stop_lookahead()
+
+    resumed = CardEngine(deck_cache=None)
+    resumed.load_progress(save_file)
+
+    assert resumed.session.strategy.to_dict() == engine.session.strategy.to_dict()
+    assert (
+        resumed.session.strategy.statistics.to_dict()
+        == engine.session.strategy.statistics.to_dict()
+    )
+    engine.stop_journal()
+
+
+def test_replay_uses_the_time_of_each_review(tmp_path):
+    """Tests that scheduling replays against the recorded review times."""
+    save_file = tmp_path / "session.json"
+    strategy = SimpleSpacedRepetitionStrategy()
+    strategy.clock = lambda: datetime(2024, 1, 1)
+    engine = engine_with(strategy)
+    engine.start_journal(save_file, sync_every=1)
+    card = review(engine)
+
+    resumed = CardEngine(deck_cache=None)
+    resumed.load_progress(save_file)
+
+    assert (
+        resumed.session.cards[0].statistics.data["due"] == card.statistics.data["due"]
+    )
+    engine.stop_journal()
+
+
+def test_untouched_session_is_not_rewritten(tmp_path):
+    """Tests that stopping a journal without reviews leaves the snapshot alone."""
+    save_file = tmp_path / "session.json"
+    engine_with(MasteryStrategy()).save_progress(save_file)
+    save_file.write_text(save_file.read_text() + "\n")
+    snapshot = save_file.read_text()
+
+    engine = CardEngine(deck_cache=None)
+    engine.load_progress(save_file)
+    engine.start_journal(save_file)
+    engine.save_progress(save_file)
+    engine.stop_journal()
+
+    assert save_file.read_text() == snapshot
+
+
+def test_journal_is_compacted_into_the_snapshot(tmp_path):
+    """Tests that the reviews folded into a new snapshot leave the journal."""
+    save_file = tmp_path / "session.json"
+    engine = engine_with(MasteryStrategy())
+    engine.start_journal(save_file, compact_after=5)
+    for position, card in enumerate(engine.session.cards[:7]):
+        feedback = engine.get_feedback()
+        feedback.data["correct"] = True
+        engine.process_feedback(card, feedback)
+        if position == 4:
+            assert engine._compaction is not None
+            engine._compaction.result()
+
+    assert engine._journal is not None
+    engine._journal.sync()
+    snapshot = json.loads(save_file.read_text())
+    assert snapshot["metadata"]["journal_sequence"] == 5
+    assert [record[0] for record in read_journal(journal_path(save_file))] == [6, 7]
+
+    engine.stop_journal()
+    assert journal_path(save_file).read_bytes() == b""
+    resumed = CardEngine(deck_cache=None)
+    resumed.load_progress(save_file)
+    assert resumed.session.strategy.statistics.correct == 7
+
+
+def test_compaction_copies_reviewed_cards_in_the_background(tmp_path, monkeypatch):
+    """Tests that compaction recopies only reviewed cards, off the reviewing thread."""
+    save_file = tmp_path / "session.json"
+    engine = engine_with(MasteryStrategy())
+    engine.start_journal(save_file, compact_after=3)
+    copied: list[tuple[str, str]] = []
+    to_dict = Card.to_dict
+
+    def tracking_to_dict(card: Card) -> dict[str, Any]:
+        copied.append((card.front, threading.current_thread().name))
+        return to_dict(card)
+
+    monkeypatch.setattr(Card, "to_dict", tracking_to_dict)
+    for card in engine.session.cards[:3]:
+        feedback = engine.get_feedback()
+        feedback.data["correct"] = True
+        engine.process_feedback(card, feedback)
+    assert engine._compaction is not None
+    engine._compaction.result()
+    engine.stop_journal()
+
+    assert sorted(front for front, _ in copied) == ["f0", "f1", "f2"]
+    assert all(name.startswith("hifz-compaction") for _, name in copied)
+
+
+def test_record_cut_short_is_dropped(tmp_path):
+    """Tests that a partial last record is ignored and overwritten."""
+    file_path = tmp_path / "session.json.journal"
+    file_path.write_bytes(b'[1,0,0,{"correct":true}]\n[2,1,0,{"corr')
+    card = Card("f", "b")
+
+    journal = ReviewJournal(file_path, [card], sequence=1)
+    feedback = MasteryStrategy().create_feedback()
+    journal.append(card, feedback, 0)
+    journal.close()
+
+    assert [record[0] for record in read_journal(file_path)] == [1, 2]
+
+
+@pytest.mark.parametrize(
+    ("recorded", "kept"),
+    [
+        (b"", b""),
+        (b'[1,0,0,{"corr', b""),
+        (b"[1,0,0]\n[2,0,0,{" + b" " * 10_000, b"[1,0,0]\n"),
+        (b"[1,0,0]\n[2,0,0]\n", b"[1,0,0]\n[2,0,0]\n"),
+    ],
+    ids=["empty", "only-torn", "torn-across-blocks", "complete"],
+)
+def test_opening_keeps_the_complete_records(tmp_path, recorded, kept):
+    """Tests that opening a journal truncates it to its last complete record."""
+    file_path = tmp_path / "session.json.journal"
+    file_path.write_bytes(recorded)
+
+    ReviewJournal(file_path, [Card("f", "b")]).close()
+
+    assert file_path.read_bytes() == kept
+
+
+def test_full_save_removes_a_stale_journal(tmp_path):
+    """Tests that a journal left by another session is not replayed."""
+    save_file = tmp_path / "session.json"
+    journal_path(save_file).write_bytes(b'[1,0,0,{"correct":true}]\n')
+
+    engine_with(MasteryStrategy()).save_progress(save_file)
+    resumed = CardEngine(deck_cache=None)
+    resumed.load_progress(save_file)
+
+    assert not journal_path(save_file).exists()
+    assert resumed.session.strategy.statistics.correct == 0
+
+
+def test_compressed_session_is_journaled(tmp_path):
+    """Tests that a compressed snapshot is folded and resumed like a plain one."""
+    save_file = tmp_path / "session.json.gz"
+    engine = engine_with(MasteryStrategy())
+    engine.start_journal(save_file)
+    for _ in range(2):
+        review(engine)
+    engine.save_progress(save_file)
+    engine.stop_journal()
+
+    resumed = CardEngine(deck_cache=None)
+    resumed.load_progress(save_file)
+
+    assert save_file.read_bytes().startswith(b"\x1f\x8b")
+    assert resumed.session.strategy.statistics.correct == 2
@@ -1,13 +1,21 @@
+import random
 from datetime import datetime, timedelta
+from typing import Any
+
+import pytest
 
 from hifz.learning_strategies import (
+    STRATEGY_NAME_TO_CLASS,
     AlphabeticalStrategy,
+    FenwickTree,
+    LeitnerStrategy,
     MasteryStrategy,
     RandomStrategy,
     SequentialStrategy,
     SimpleSpacedRepetitionStrategy,
+    WeightedRandomStrategy,
 )
-from hifz.models import Card
+from hifz.models import BinaryFeedback, Card, from_epoch_seconds, to_epoch_seconds
 from hifz.utils import CardSession
 
 
@@ -121,8 +129,8 @@ def test_spaced_repetition_schedules_next_review():
     assert (
         "due" in card.statistics.data
     ), "SimpleSpacedRepetitionStrategy did not schedule the next review."
-    assert (
-        card.statistics.data["due"] > datetime.now()
+    assert card.statistics.data["due"] > to_epoch_seconds(
+        datetime.now()
     ), "Next review is not correctly scheduled."
 
 
@@ -197,7 +205,7 @@ def test_simple_spaced_repetition_strategy_process_feedback_interval_increase(
     assert curr_interval > prev_interval
 
     next_due = mock_now + timedelta(days=curr_interval)
-    assert card.statistics.get("due") == next_due
+    assert card.statistics.get("due") == to_epoch_seconds(next_due)
 
 
 def test_simple_spaced_repetition_strategy_process_feedback_interval_decrease(
@@ -227,7 +235,7 @@ def test_simple_spaced_repetition_strategy_process_feedback_interval_decrease(
     assert curr_interval < prev_interval
 
     next_due = mock_now + timedelta(days=curr_interval)
-    assert card.statistics.get("due") == next_due
+    assert card.statistics.get("due") == to_epoch_seconds(next_due)
 
 
 def test_simple_spaced_repetition_strategy_process_feedback_compare_intervals(
@@ -345,3 +353,408 @@ def test_alphabetal_strategy_ordering():
     assert session.get_next_card() == card2
     assert session.get_next_card() == card1
     assert session.get_next_card() == card3
+
+
+def test_spaced_repetition_due_index_follows_feedback():
+    """Test the due-index moves reviewed cards behind cards that are still due."""
+    spaced_strategy = SimpleSpacedRepetitionStrategy()
+    now = datetime.now()
+    cards = [Card(f"Front{i}", f"Back{i}") for i in range(3)]
+    for offset, card in enumerate(cards):
+        card.statistics.update(
+            "due", now - timedelta(days=3 - offset), lambda _, new: new
+        )
+
+    session = CardSession(cards, spaced_strategy)
+    assert spaced_strategy.count_due() == 3
+
+    for expected in cards:
+        card = session.get_next_card()
+        assert card == expected
+        feedback = spaced_strategy.create_feedback()
+        feedback.data["correct"] = True
+        spaced_strategy.process_feedback(card, feedback)
+
+    assert spaced_strategy.count_due() == 0
+    assert spaced_strategy.count_due(now + timedelta(days=30)) == 3
+
+
+def test_spaced_repetition_due_index_rebuilt_for_new_deck():
+    """Test the due-index is rebuilt when the strategy is handed a different deck."""
+    spaced_strategy = SimpleSpacedRepetitionStrategy()
+    now = datetime.now()
+    first_deck = [Card("Front1", "Back1")]
+    second_deck = [Card("Front2", "Back2"), Card("Front3", "Back3")]
+    second_deck[1].statistics.update("due", now - timedelta(days=1), lambda _, new: new)
+
+    CardSession(first_deck, spaced_strategy).get_next_card()
+    assert spaced_strategy.get_next_card(second_deck) == second_deck[1]
+
+
+def test_alphabetical_strategy_unicode_collation():
+    """Tests that the unicode collation ignores harakat when ordering Arabic cards."""
+    alpha_strategy = AlphabeticalStrategy(collation="unicode")
+    card1 = Card("تَ", "taa")
+    card2 = Card("بِ", "baa")
+    card3 = Card("ب", "baa")
+
+    session = CardSession([card1, card2, card3], alpha_strategy)
+    assert session.get_next_card() == card2
+    assert session.get_next_card() == card3
+    assert session.get_next_card() == card1
+
+
+def test_alphabetical_strategy_order_cached_until_deck_changes():
+    """Tests that the ordering is reused for the same deck and rebuilt for a new one."""
+    alpha_strategy = AlphabeticalStrategy()
+    deck = [Card("B", "Second"), Card("A", "First")]
+    assert alpha_strategy.get_next_card(deck) == deck[1]
+    order = alpha_strategy._order
+    assert alpha_strategy.get_next_card(deck) == deck[0]
+    assert alpha_strategy._order is order
+
+    new_deck = [Card("D", "Fourth"), Card("C", "Third")]
+    assert alpha_strategy.get_next_card(new_deck) == new_deck[1]
+
+
+def test_alphabetical_strategy_serialization():
+    """Test AlphabeticalStrategy state serialization and deserialization."""
+    alpha_strategy = AlphabeticalStrategy(collation="unicode")
+    alpha_strategy.index = 2
+
+    serialized = alpha_strategy.to_dict()
+    assert serialized == {
+        "type": "alphabetical",
+        "state": {"index": 2, "collation": "unicode"},
+    }
+
+    deserialized = AlphabeticalStrategy.from_dict(serialized)
+    assert isinstance(deserialized, AlphabeticalStrategy)
+    assert deserialized.collation == "unicode"
+    assert deserialized.index == 2
+
+
+def test_mastery_strategy_working_set_follows_feedback():
+    """Test MasteryStrategy moves cards out of and back into the working set."""
+    mastery_strategy = MasteryStrategy(threshold=2)
+    card1 = Card("Front1", "Back1")
+    card2 = Card("Front2", "Back2")
+    session = CardSession([card1, card2], mastery_strategy)
+
+    def answer(card: Card, correct: bool) -> None:
+        feedback = mastery_strategy.create_feedback()
+        feedback.data["correct"] = correct
+        mastery_strategy.process_feedback(card, feedback)
+
+    answer(card1, True)
+    answer(card1, True)
+    assert [session.get_next_card() for _ in range(3)] == [card2, card2, card2]
+
+    answer(card1, False)
+    next_cards = [session.get_next_card() for _ in range(2)]
+    assert card1 in next_cards
+    assert card2 in next_cards
+
+
+def test_mastery_strategy_running_statistics():
+    """Test MasteryStrategy keeps running totals as feedback is processed."""
+    mastery_strategy = MasteryStrategy(threshold=1)
+    card1 = Card("Front1", "Back1")
+    card2 = Card("Front2", "Back2")
+    session = CardSession([card1, card2], mastery_strategy)
+
+    for card, correct in [(card1, True), (card1, False), (card2, True)]:
+        feedback = mastery_strategy.create_feedback()
+        feedback.data["correct"] = correct
+        mastery_strategy.process_feedback(card, feedback)
+
+    assert session.get_statistics() == {
+        "Correct": 1,
+        "Incorrect": 1,
+        "Seen": 2,
+        "Mastered": 1,
+    }
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_mastery_running_statistics_match_a_scan_after_a_miss(columnar: bool):
+    """Test that MasteryStrategy's running totals equal those scanned from the cards."""
+    if columnar:
+        pytest.importorskip("numpy")
+    cards = [Card("Front1", "Back1"), Card("Front2", "Back2")]
+    strategy = MasteryStrategy()
+    CardSession(cards, strategy, columnar=columnar)
+    for card, correct in [(cards[0], True), (cards[0], True), (cards[1], True)]:
+        feedback = strategy.create_feedback()
+        feedback.data["correct"] = correct
+        strategy.process_feedback(card, feedback)
+    feedback = strategy.create_feedback()
+    feedback.data["correct"] = False
+    strategy.process_feedback(cards[0], feedback)
+
+    rescanned = CardSession(cards, MasteryStrategy()).strategy.statistics
+    assert strategy.statistics == rescanned
+    assert strategy.statistics.correct == 1
+
+
+def test_running_statistics_seeded_from_card_statistics():
+    """Test the running totals are computed from existing card statistics for a new deck."""
+    card1 = Card("Front1", "Back1")
+    card2 = Card("Front2", "Back2")
+    card1.statistics.update("correct", 3, lambda _, new: new)
+    card2.statistics.update("incorrect", 2, lambda _, new: new)
+
+    session = CardSession([card1, card2], RandomStrategy())
+    assert session.get_statistics() == {"Correct": 3, "Incorrect": 2}
+    assert session.strategy.statistics.seen == 2
+
+
+def test_process_feedback_batch_matches_single_reviews():
+    """Test that a batch of reviews has the same effect as processing them one by one."""
+    outcomes = [True, False, True, True, False, True]
+
+    def run(batch: bool) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+        strategy = MasteryStrategy(threshold=2)
+        cards = [Card(f"Front{i}", f"Back{i}") for i in range(2)]
+        session = CardSession(cards, strategy)
+        reviews = []
+        for index, correct in enumerate(outcomes):
+            feedback = strategy.create_feedback()
+            feedback.data["correct"] = correct
+            reviews.append((cards[index % 2], feedback))
+        if batch:
+            assert strategy.process_feedback_batch(reviews) == len(outcomes)
+        else:
+            for card, feedback in reviews:
+                strategy.process_feedback(card, feedback)
+        return [card.to_dict() for card in cards], session.get_statistics()
+
+    assert run(batch=True) == run(batch=False)
+
+
+def test_process_feedback_batch_validates_before_applying(cards):
+    """Test that an invalid review in a batch leaves every card untouched."""
+    strategy = RandomStrategy()
+    CardSession(cards, strategy)
+    valid = strategy.create_feedback()
+    valid.data["correct"] = True
+    invalid = strategy.create_feedback()
+    invalid.data["correct"] = "yes"
+
+    with pytest.raises(TypeError):
+        strategy.process_feedback_batch([(cards[0], valid), (cards[1], invalid)])
+
+    assert all(card.statistics.data == {} for card in cards)
+
+
+def test_process_feedback_batch_computes_metadata_once(cards, monkeypatch):
+    """Test that a batch validates its feedback against metadata computed once."""
+    strategy = RandomStrategy()
+    CardSession(cards, strategy)
+    reviews = []
+    for card in cards:
+        feedback = strategy.create_feedback()
+        feedback.data["correct"] = True
+        reviews.append((card, feedback))
+    calls = 0
+    get_metadata = BinaryFeedback.get_metadata
+
+    def counting_get_metadata(self):
+        nonlocal calls
+        calls += 1
+        return get_metadata(self)
+
+    monkeypatch.setattr(BinaryFeedback, "get_metadata", counting_get_metadata)
+
+    assert strategy.process_feedback_batch(iter(reviews)) == len(cards)
+    assert calls == 1
+    assert all(card.statistics.get("correct") == 1 for card in cards)
+
+
+def test_fenwick_tree_prefix_sums_and_find():
+    """Test FenwickTree keeps prefix sums and lookups consistent with its weights."""
+    tree = FenwickTree([1.0, 0.0, 2.0, 3.0, 0.5])
+    assert tree.total() == 6.5
+    assert tree.prefix_sum(3) == 3.0
+    assert [tree.find(target) for target in [0.0, 0.99, 1.0, 2.99, 3.0, 6.4]] == [
+        0,
+        0,
+        2,
+        2,
+        3,
+        4,
+    ]
+
+    tree.set(1, 4.0)
+    assert tree.total() == 10.5
+    assert tree.find(1.0) == 1
+    assert tree.find(4.99) == 1
+    assert tree.find(5.0) == 2
+
+
+def test_weighted_strategy_favors_missed_cards(monkeypatch):
+    """Test WeightedRandomStrategy draws cards with more mistakes more often."""
+    strategy = WeightedRandomStrategy()
+    easy = Card("Easy", "Back")
+    hard = Card("Hard", "Back")
+    session = CardSession([easy, hard], strategy)
+
+    for card, correct in [(easy, True)] * 8 + [(hard, False)] * 8:
+        feedback = strategy.create_feedback()
+        feedback.data["correct"] = correct
+        strategy.process_feedback(card, feedback)
+
+    easy_weight = 1 / 10
+    hard_weight = 9 / 10
+    monkeypatch.setattr(strategy.rng, "random", lambda: 0.0)
+    assert session.get_next_card() == easy
+    boundary = easy_weight / (easy_weight + hard_weight)
+    monkeypatch.setattr(strategy.rng, "random", lambda: boundary)
+    assert session.get_next_card() == hard
+
+
+def test_weighted_strategy_recency_weighting():
+    """Test the recency weighting emphasizes the latest answers."""
+    strategy = WeightedRandomStrategy(weighting="recency", decay=0.5)
+    card = Card("Front", "Back")
+    CardSession([card], strategy)
+
+    for correct in [False, False, True]:
+        feedback = strategy.create_feedback()
+        feedback.data["correct"] = correct
+        strategy.process_feedback(card, feedback)
+
+    assert card.statistics.get("recent_error") == 0.4375
+    assert strategy._weights.total() == 0.4375
+
+
+def test_weighted_strategy_serialization():
+    """Test WeightedRandomStrategy is registered and round-trips its settings."""
+    assert STRATEGY_NAME_TO_CLASS["weighted"] is WeightedRandomStrategy
+    strategy = WeightedRandomStrategy(weighting="recency", decay=0.6)
+
+    deserialized = WeightedRandomStrategy.from_dict(strategy.to_dict())
+
+    assert isinstance(deserialized, WeightedRandomStrategy)
+    assert deserialized.weighting == "recency"
+    assert deserialized.decay == 0.6
+
+
+def test_leitner_strategy_moves_cards_between_boxes():
+    """Test LeitnerStrategy promotes correct cards and demotes missed ones."""
+    strategy = LeitnerStrategy(boxes=3)
+    cards = [Card(f"Front{i}", f"Back{i}") for i in range(3)]
+    session = CardSession(cards, strategy)
+
+    def answer(correct: bool) -> Card:
+        card = session.get_next_card()
+        feedback = strategy.create_feedback()
+        feedback.data["correct"] = correct
+        strategy.process_feedback(card, feedback)
+        return card
+
+    assert answer(True) == cards[0]
+    assert answer(True) == cards[0]
+    assert strategy.to_dict()["state"]["boxes"] == [[1, 2], [], [0]]
+    assert session.get_statistics()["Mastered"] == 1
+
+    assert answer(False) == cards[1]
+    assert strategy.to_dict()["state"]["boxes"] == [[2, 1], [], [0]]
+
+    assert answer(False) == cards[0]
+    assert strategy.to_dict()["state"]["boxes"] == [[2, 1, 0], [], []]
+    assert session.get_statistics()["Mastered"] == 0
+
+    assert answer(True) == cards[2]
+    assert strategy.to_dict()["state"]["boxes"] == [[1, 0], [2], []]
+
+
+def test_leitner_strategy_serialization_round_trip(cards):
+    """Test LeitnerStrategy restores box membership onto the same deck."""
+    strategy = LeitnerStrategy(boxes=2)
+    session = CardSession(cards, strategy)
+    card = session.get_next_card()
+    feedback = strategy.create_feedback()
+    feedback.data["correct"] = True
+    strategy.process_feedback(card, feedback)
+
+    serialized = strategy.to_dict()
+    assert serialized == {
+        "type": "leitner",
+        "state": {"step": 1, "boxes": [[1, 2], [0]]},
+    }
+
+    deserialized = LeitnerStrategy.from_dict(serialized)
+    assert isinstance(deserialized, LeitnerStrategy)
+    restored_session = CardSession(cards, deserialized)
+    assert deserialized.to_dict() == serialized
+    assert restored_session.get_statistics()["Mastered"] == 1
+
+    fresh = LeitnerStrategy.from_dict(serialized)
+    CardSession([*cards, Card("Extra", "Card")], fresh)
+    assert fresh.to_dict()["state"]["boxes"] == [[0, 1, 2, 3], []]
+
+
+@pytest.mark.parametrize("name", list(STRATEGY_NAME_TO_CLASS))
+def test_peek_next_matches_get_next_cards(name: str):
+    """Test every strategy hands out the cards peek_next predicted."""
+    cards = [Card(f"Front{i}", f"Back{i}") for i in range(7)]
+    strategy = STRATEGY_NAME_TO_CLASS[name]()
+    CardSession(cards, strategy)
+
+    upcoming = strategy.peek_next(cards, 10)
+    assert strategy.peek_next(cards, 10) == upcoming
+    assert strategy.get_next_cards(cards, 10) == upcoming
+
+
+def test_peek_next_revision_tracks_reordering_feedback():
+    """Test revision only moves when feedback changes the upcoming cards."""
+    sequential = SequentialStrategy()
+    mastery = MasteryStrategy(threshold=1)
+    for strategy in (sequential, mastery):
+        cards = [Card(f"Front{i}", f"Back{i}") for i in range(3)]
+        CardSession(cards, strategy)
+        revision = strategy.revision
+        feedback = strategy.create_feedback()
+        feedback.data["correct"] = True
+        strategy.process_feedback(strategy.get_next_card(cards), feedback)
+        assert (strategy.revision != revision) is (strategy is mastery)
+
+    assert mastery.peek_next(cards, 2) == [cards[1], cards[2]]
+
+
+def test_epoch_seconds_round_trip():
+    """Test due times convert to epoch seconds and back for display."""
+    due = datetime(2024, 5, 1, 12, 30, 15)
+
+    assert to_epoch_seconds(due) == 1714566615
+    assert from_epoch_seconds(to_epoch_seconds(due)) == due
+
+
+def test_spaced_repetition_count_due_matches_scan():
+    """Test the running due count agrees with scanning every due time."""
+    rng = random.Random(5)
+    start = datetime(2024, 1, 1)
+    now = start
+    strategy = SimpleSpacedRepetitionStrategy()
+    strategy.clock = lambda: now
+    cards = [Card(f"Front{i}", f"Back{i}") for i in range(30)]
+    for card in cards[::2]:
+        card.statistics.data["due"] = to_epoch_seconds(
+            start + timedelta(hours=rng.randint(-48, 48))
+        )
+    CardSession(cards, strategy)
+
+    for _ in range(300):
+        now += timedelta(hours=rng.randint(0, 6))
+        feedback = strategy.create_feedback()
+        feedback.data["correct"] = rng.random() < 0.7
+        strategy.process_feedback(rng.choice(cards), feedback)
+        for moment in (now, now - timedelta(days=rng.randint(0, 5))):
+            cutoff = to_epoch_seconds(moment)
+            expected = sum(card.statistics.data["due"] <= cutoff for card in cards[::2])
+            expected += sum(
+                card.statistics.data.get("due", to_epoch_seconds(start)) <= cutoff
+                for card in cards[1::2]
+            )
+            assert strategy.count_due(moment) == expected
@@ -3,6 +3,7 @@ import pytest
 from hifz.models import (
     BinaryFeedback,
     Card,
+    CardStatistics,
     SingleSelectBooleanFeedback,
 )
 
@@ -217,3 +218,30 @@ def test_feedback_summary_with_single_select_feedback():
     assert (
         card.statistics.get("difficulty") == "medium"
     ), "FeedbackSummary did not update correctly with SingleSelectBooleanFeedback."
+
+
+def test_card_statistics_slots_and_overflow():
+    """Test CardStatistics keeps built-in keys in slots and others in overflow."""
+    assert CardStatistics({"correct": 2}).extra is None
+
+    statistics = CardStatistics({"correct": 2, "due": 1714566615})
+    assert statistics == {"correct": 2, "due": 1714566615}
+    assert "interval" not in statistics
+    assert statistics.get("interval") is None
+
+    statistics["difficulty"] = "hard"
+    del statistics["correct"]
+
+    assert statistics.extra == {"difficulty": "hard"}
+    assert dict(statistics) == {"due": 1714566615, "difficulty": "hard"}
+    with pytest.raises(KeyError):
+        del statistics["correct"]
+
+
+def test_card_has_no_instance_dict():
+    """Test cards and their statistics are slotted."""
+    card = Card(front="Front text", back="Back text")
+
+    assert not hasattr(card, "__dict__")
+    assert not hasattr(card.statistics, "__dict__")
+    assert not hasattr(card.statistics.data, "__dict__")
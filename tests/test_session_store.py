@@ -0,0 +1,201 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from hifz.card_engine import CardEngine
+from hifz.learning_strategies import (
+    LeitnerStrategy,
+    MasteryStrategy,
+    SimpleSpacedRepetitionStrategy,
+)
+from hifz.models import Card, CardStatistics, to_epoch_seconds
+from hifz.session_store import SQLiteSessionStore
+from hifz.utils import CardSession
+
+NOW = datetime(2024, 1, 1)
+
+
+def deck(size: int = 10) -> list[Card]:
+    """Returns size cards without statistics."""
+    return [Card(f"f{i}", f"b{i}") for i in range(size)]
+
+
+def review(engine: CardEngine, card: Card, correct: bool) -> None:
+    """Answers card through the engine."""
+    feedback = engine.get_feedback()
+    feedback.data["correct"] = correct
+    engine.process_feedback(card, feedback)
+
+
+def test_session_round_trip(tmp_path):
+    """Tests that cards, statistics and strategy state survive a save and load."""
+    cards = deck(3)
+    cards[0].statistics.data = CardStatistics(
+        {"correct": 2, "interval": 2.0, "due": 100, "note": "hard"}
+    )
+    strategy = MasteryStrategy(threshold=3)
+    strategy.index = 2
+    with SQLiteSessionStore(tmp_path / "session.sqlite") as store:
+        store.save(CardSession(cards, strategy))
+
+    with SQLiteSessionStore(tmp_path / "session.sqlite") as store:
+        session = store.load()
+
+    assert session.cards == cards
+    assert isinstance(session.cards[0].statistics.data["interval"], float)
+    assert isinstance(session.strategy, MasteryStrategy)
+    assert session.strategy.threshold == 3
+    assert session.strategy.index == 2
+
+
+def test_reviews_are_written_as_they_happen(tmp_path):
+    """Tests that each review upserts its card without a full save."""
+    save_file = tmp_path / "session.sqlite"
+    engine = CardEngine(deck_cache=None)
+    engine.session = CardSession(deck(), MasteryStrategy())
+    engine.save_progress(save_file)
+
+    card = engine.get_next_card()
+    review(engine, card, correct=True)
+
+    with SQLiteSessionStore(save_file) as reader:
+        loaded = reader.load()
+    assert loaded.cards[0].statistics.data["correct"] == 1
+    assert loaded.strategy.statistics.correct == 1
+    with sqlite3.connect(save_file) as connection:
+        assert connection.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+
+
+def test_crashed_session_resumes_with_its_leitner_boxes(tmp_path):
+    """Tests that each review saves the strategy state without a full save."""
+    save_file = tmp_path / "session.sqlite"
+    engine = CardEngine(deck_cache=None)
+    engine.session = CardSession(deck(6), LeitnerStrategy())
+    engine.save_progress(save_file)
+    for _ in range(6):
+        review(engine, engine.get_next_card(), correct=True)
+    boxes = engine.session.strategy.to_dict()["state"]["boxes"]
+    assert any(box for box in boxes[1:])
+
+    resumed = CardEngine(deck_cache=None)
+    resumed.load_progress(save_file)
+
+    assert resumed.session.strategy.to_dict()["state"]["boxes"] == boxes
+    assert resumed.get_statistics() == engine.get_statistics()
+
+
+def test_reviews_are_written_with_lookahead(tmp_path):
+    """Tests that reviews applied on the lookahead worker reach the store."""
+    save_file = tmp_path / "session.sqlite"
+    engine = CardEngine(deck_cache=None)
+    engine.session = CardSession(deck(), MasteryStrategy())
+    engine.save_progress(save_file)
+    engine.start_lookahead(2)
+
+    review(engine, engine.get_next_card(), correct=False)
+    engine.stop_lookahead()
+
+    with SQLiteSessionStore(save_file) as reader:
+        assert reader.load().cards[0].statistics.data["incorrect"] == 1
+
+
+def test_load_only_due_cards(tmp_path):
+    """Tests that a partial load selects due cards and saves reviews to their rows."""
+    save_file = tmp_path / "session.sqlite"
+    cards = deck()
+    for i, card in enumerate(cards):
+        due = NOW + timedelta(days=1 if i % 2 else -1)
+        card.statistics.data["due"] = to_epoch_seconds(due)
+    cards[9].statistics.data = CardStatistics()
+    engine = CardEngine(deck_cache=None)
+    engine.session = CardSession(cards, SimpleSpacedRepetitionStrategy())
+    engine.save_progress(save_file)
+
+    partial = CardEngine(deck_cache=None)
+    partial.load_progress(save_file, due_before=NOW)
+    assert [card.front for card in partial.session.cards] == [
+        "f0",
+        "f2",
+        "f4",
+        "f6",
+        "f8",
+        "f9",
+    ]
+    review(partial, partial.session.cards[1], correct=True)
+    partial.save_progress(save_file)
+
+    full = CardEngine(deck_cache=None)
+    full.load_progress(save_file)
+    assert len(full.session.cards) == 10
+    assert full.session.cards[2].statistics.data["correct"] == 1
+
+
+def test_load_only_low_mastery_cards(tmp_path):
+    """Tests that a partial load keeps the strategy state of the whole deck."""
+    save_file = tmp_path / "session.sqlite"
+    cards = deck()
+    for card in cards[:7]:
+        card.statistics.data["correct"] = 5
+    engine = CardEngine(deck_cache=None)
+    engine.session = CardSession(cards, LeitnerStrategy())
+    engine.save_progress(save_file)
+    boxes = engine.session.strategy.to_dict()
+
+    partial = CardEngine(deck_cache=None)
+    partial.load_progress(save_file, mastery_below=5)
+    assert [card.front for card in partial.session.cards] == ["f7", "f8", "f9"]
+    assert partial.session.get_next_card() in partial.session.cards
+    partial.save_progress(save_file)
+
+    with SQLiteSessionStore(save_file) as store:
+        assert store.load().strategy.to_dict() == boxes
+
+
+def test_json_session_cannot_be_loaded_partially(tmp_path):
+    """Tests that the filters are refused for JSON sessions."""
+    save_file = tmp_path / "session.json"
+    engine = CardEngine(deck_cache=None)
+    engine.session = CardSession(deck(), MasteryStrategy())
+    engine.save_progress(save_file)
+
+    with pytest.raises(ValueError, match="SQLite"):
+        engine.load_progress(save_file, mastery_below=5)
+
+
+def test_cards_of_another_session_are_refused(tmp_path):
+    """Tests that only the session the store holds can upsert cards."""
+    with SQLiteSessionStore(tmp_path / "session.sqlite") as store:
+        store.save(CardSession(deck(), MasteryStrategy()))
+        other = CardSession(deck(), MasteryStrategy())
+
+        with pytest.raises(ValueError, match="not saved"):
+            store.save_cards(other, other.cards)
+
+
+@pytest.mark.parametrize("strategy_class", [MasteryStrategy, LeitnerStrategy])
+def test_partial_review_adds_to_the_deck_totals(
+    tmp_path, strategy_class: type[MasteryStrategy] | type[LeitnerStrategy]
+):
+    """Tests that reviewing a partial session keeps the totals of the whole deck."""
+    save_file = tmp_path / "session.sqlite"
+    engine = CardEngine(deck_cache=None)
+    engine.session = CardSession(deck(5), strategy_class())
+    engine.save_progress(save_file)
+    for correct in [True, True, True, True, True, True]:
+        review(engine, engine.get_next_card(), correct)
+    totals = engine.session.strategy.statistics.to_dict()
+
+    partial = CardEngine(deck_cache=None)
+    partial.load_progress(save_file, mastery_below=2)
+    before = partial.session.strategy.statistics.to_dict()
+    review(partial, partial.session.cards[0], correct=False)
+    after = partial.session.strategy.statistics.to_dict()
+    partial.save_progress(save_file)
+
+    full = CardEngine(deck_cache=None)
+    full.load_progress(save_file)
+    assert after != before
+    assert full.session.strategy.statistics.to_dict() == {
+        key: totals[key] + after[key] - before[key] for key in totals
+    }
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from hifz import simulation
+from hifz.simulation import (
+    ForgettingModel,
+    SimulationConfig,
+    run_simulation,
+    simulate_learner,
+)
+
+
+def test_simulate_learner_is_reproducible():
+    """Test a learner's answers depend only on the seed."""
+    config = SimulationConfig("spaced_repetition", deck_size=10, reviews=60, seed=3)
+
+    first = simulate_learner(config, 0)
+    second = simulate_learner(config, 0)
+
+    assert first.correct == second.correct
+    assert first.retention == second.retention
+    assert len(first.latencies) == 60
+    assert len(first.retention) == config.checkpoints
+
+
+def test_simulate_learner_leaves_the_global_rng_alone():
+    """Test a simulation in-process does not reseed the caller's random state."""
+    config = SimulationConfig("random", deck_size=10, reviews=20, seed=3)
+    random.seed(7)
+    expected = random.Random(7).random()
+
+    simulate_learner(config, 0)
+
+    assert random.random() == expected
+
+
+def test_forgetting_model_update():
+    """Test correct answers stretch the memory and misses reset it."""
+    model = ForgettingModel(initial_stability=2.0, growth=3.0)
+
+    assert model.update(2.0, correct=True) == 6.0
+    assert model.update(6.0, correct=False) == 2.0
+    assert model.recall_probability(0.0, 2.0) == 1.0
+
+
+def test_run_simulation_report():
+    """Test the report aggregates every learner of the pool."""
+    config = SimulationConfig("leitner", learners=3, deck_size=5, reviews=20)
+
+    report = run_simulation(config, workers=2)
+
+    assert report.reviews == 60
+    assert report.reviews_per_second > 0
+    assert list(report.latency_percentiles) == [50, 90, 99]
+    assert len(report.retention) == config.checkpoints
+    assert 0 <= report.accuracy <= 1
+    assert str(report).startswith("leitner: ")
+
+
+def test_run_simulation_in_process_matches_the_pool(monkeypatch):
+    """Test a single worker runs the learners in process, with the same results."""
+    config = SimulationConfig("random", learners=3, deck_size=5, reviews=20, seed=1)
+    pooled = run_simulation(config, workers=2)
+
+    def no_pool(*_args, **_kwargs):
+        msg = "A single worker should not start a pool."
+        raise AssertionError(msg)
+
+    monkeypatch.setattr(simulation, "ProcessPoolExecutor", no_pool)
+    in_process = run_simulation(config, workers=1)
+
+    assert in_process.reviews == pooled.reviews
+    assert in_process.retention == pooled.retention
+    assert in_process.accuracy == pooled.accuracy
+
+
+def test_simulation_config_validation():
+    """Test unknown strategies and empty runs are rejected."""
+    with pytest.raises(ValueError, match="Unknown strategy"):
+        SimulationConfig("unknown")
+    with pytest.raises(ValueError, match="learners"):
+        SimulationConfig("random", learners=0)
@@ -0,0 +1,128 @@
+import json
+from urllib.error import HTTPError
+
+import pytest
+
+from hifz.dataserver import DataServer
+from hifz.models import Card
+from hifz.url_cache import URLCache
+
+DECK = b"front,back\nHello,World\n"
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [{"ETag": '"v1"'}, {"Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"}],
+)
+def test_unchanged_deck_is_not_downloaded_again(deck_server, tmp_path, headers):
+    """Tests that a revalidated deck is answered with 304 and read from disk."""
+    deck_server.decks["/deck.csv"] = (DECK, headers)
+    cache = URLCache(tmp_path)
+
+    first = cache.fetch(deck_server.url("/deck.csv"))
+    second = cache.fetch(deck_server.url("/deck.csv"))
+
+    assert first == second
+    assert second.read_bytes() == DECK
+    assert deck_server.downloads == ["/deck.csv"]
+
+
+def test_changed_deck_is_downloaded_again(deck_server, tmp_path):
+    """Tests that a deck whose validator changed replaces the cached copy."""
+    deck_server.decks["/deck.csv"] = (DECK, {"ETag": '"v1"'})
+    cache = URLCache(tmp_path)
+    cache.fetch(deck_server.url("/deck.csv"))
+
+    deck_server.decks["/deck.csv"] = (b"front,back\nNew,Card\n", {"ETag": '"v2"'})
+    cached = cache.fetch(deck_server.url("/deck.csv"))
+
+    assert cached.read_bytes() == b"front,back\nNew,Card\n"
+    assert deck_server.downloads == ["/deck.csv", "/deck.csv"]
+
+
+def test_deck_without_validators_is_always_downloaded(deck_server, tmp_path):
+    """Tests that a deck served without ETag or Last-Modified is fetched each time."""
+    deck_server.decks["/deck.csv"] = (DECK, {})
+    cache = URLCache(tmp_path)
+
+    cache.fetch(deck_server.url("/deck.csv"))
+    cache.fetch(deck_server.url("/deck.csv"))
+
+    assert deck_server.downloads == ["/deck.csv", "/deck.csv"]
+
+
+def test_missing_body_is_downloaded_again(deck_server, tmp_path):
+    """Tests that validators are not sent once the cached body is gone."""
+    deck_server.decks["/deck.csv"] = (DECK, {"ETag": '"v1"'})
+    cache = URLCache(tmp_path)
+    cache.fetch(deck_server.url("/deck.csv")).unlink()
+
+    cached = cache.fetch(deck_server.url("/deck.csv"))
+
+    assert cached.read_bytes() == DECK
+    assert len(deck_server.downloads) == 2
+
+
+@pytest.mark.parametrize(
+    "corrupt",
+    [
+        lambda metadata: [metadata],
+        lambda metadata: {k: v for k, v in metadata.items() if k != "file"},
+        lambda metadata: {**metadata, "file": 1},
+        lambda metadata: {**metadata, "file": f"../{metadata['file']}"},
+        lambda metadata: {**metadata, "etag": ["v1"]},
+    ],
+    ids=["not-an-object", "no-file", "file-not-a-string", "file-in-parent", "bad-etag"],
+)
+def test_malformed_metadata_is_a_miss(deck_server, tmp_path, corrupt):
+    """Tests that malformed metadata is ignored and the deck downloaded again."""
+    deck_server.decks["/deck.csv"] = (DECK, {"ETag": '"v1"'})
+    cache = URLCache(tmp_path)
+    cached = cache.fetch(deck_server.url("/deck.csv"))
+    (metadata_path,) = tmp_path.glob("*.meta")
+    metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
+    metadata_path.write_text(json.dumps(corrupt(metadata)), encoding="utf-8")
+
+    assert cache.fetch(deck_server.url("/deck.csv")) == cached
+    assert cached.read_bytes() == DECK
+    assert deck_server.downloads == ["/deck.csv", "/deck.csv"]
+
+
+@pytest.mark.parametrize(
+    ("path", "content_type", "suffix"),
+    [
+        ("/deck.json", "text/plain", ".json"),
+        ("/deck.XML", "text/plain", ".xml"),
+        ("/export?format=json", "application/json; charset=utf-8", ".json"),
+        ("/deck.php", "text/tab-separated-values", ".tsv"),
+        ("/deck", "application/octet-stream", ".csv"),
+    ],
+)
+def test_cached_deck_keeps_its_extension(
+    deck_server, tmp_path, path, content_type, suffix
+):
+    """Tests that the extension comes from the URL, then from the content type."""
+    deck_server.decks[path] = (DECK, {"Content-Type": content_type})
+
+    assert URLCache(tmp_path).fetch(deck_server.url(path)).suffix == suffix
+
+
+def test_dataserver_reads_json_from_url(deck_server, tmp_path):
+    """Tests that a JSON deck served over HTTP is parsed as JSON."""
+    deck_server.decks["/deck.json"] = (
+        '[{"front": "ب", "back": "baa"}]'.encode(),
+        {"ETag": '"v1"'},
+    )
+    server = DataServer(URLCache(tmp_path))
+
+    assert server.read_cards(deck_server.url("/deck.json")) == [Card("ب", "baa")]
+    assert server.read_cards(deck_server.url("/deck.json")) == [Card("ب", "baa")]
+    assert deck_server.downloads == ["/deck.json"]
+
+
+def test_failed_download_leaves_nothing_behind(deck_server, tmp_path):
+    """Tests that an HTTP error is raised and no file is left in the cache."""
+    with pytest.raises(HTTPError):
+        URLCache(tmp_path).fetch(deck_server.url("/missing.csv"))
+
+    assert list(tmp_path.iterdir()) == []
@@ -1,9 +1,17 @@
 import json
+import os
+import stat
+from datetime import datetime
 
 import pytest
 
-from hifz.learning_strategies import MasteryStrategy, RandomStrategy, SequentialStrategy
-from hifz.models import Card
+from hifz.learning_strategies import (
+    MasteryStrategy,
+    RandomStrategy,
+    SequentialStrategy,
+    SimpleSpacedRepetitionStrategy,
+)
+from hifz.models import Card, to_epoch_seconds
 from hifz.utils import CardSession
 
 
@@ -148,3 +156,156 @@ def test_card_session_load_with_unsupported_strategy(tmp_path_factory):
         ValueError, match="Unsupported strategy type: NonExistentStrategy"
     ):
         CardSession.load_progress(save_file)
+
+
+def test_card_session_save_and_load_restores_due_dates(tmp_path_factory):
+    """Test that due dates are restored as epoch seconds when loading a session."""
+    tmp_dir = tmp_path_factory.mktemp("session_data")
+    save_file = tmp_dir / "session.json"
+
+    cards = [Card("Front1", "Back1"), Card("Front2", "Back2")]
+    strategy = SimpleSpacedRepetitionStrategy()
+    session = CardSession(cards, strategy)
+    card = session.get_next_card()
+    feedback = strategy.create_feedback()
+    feedback.data["correct"] = True
+    strategy.process_feedback(card, feedback)
+
+    session.save_progress(save_file)
+    loaded_session = CardSession.load_progress(save_file)
+
+    due_dates = [loaded.statistics.get("due") for loaded in loaded_session.cards]
+    assert card.statistics.get("due") in due_dates
+    assert isinstance(loaded_session.strategy, SimpleSpacedRepetitionStrategy)
+    assert loaded_session.strategy.count_due() == 1
+
+
+def test_card_session_load_reads_iso_due_dates(tmp_path_factory):
+    """Test that sessions saved with ISO due dates load as epoch seconds."""
+    save_file = tmp_path_factory.mktemp("session_data") / "session.json"
+    cards = [Card("Front1", "Back1"), Card("Front2", "Back2")]
+    CardSession(cards, SimpleSpacedRepetitionStrategy()).save_progress(save_file)
+    saved = json.loads(save_file.read_text(encoding="utf-8"))
+    saved["session"]["cards"][0]["statistics"]["due"] = "2024-05-01T12:30:15"
+    save_file.write_text(json.dumps(saved), encoding="utf-8")
+
+    loaded_session = CardSession.load_progress(save_file)
+
+    assert loaded_session.cards[0].statistics.get("due") == to_epoch_seconds(
+        datetime(2024, 5, 1, 12, 30, 15)
+    )
+    assert isinstance(loaded_session.strategy, SimpleSpacedRepetitionStrategy)
+    assert loaded_session.strategy.count_due() == 2
+
+
+def test_card_session_save_and_load_keeps_running_statistics(tmp_path_factory):
+    """Test that the running statistics survive saving and loading a session."""
+    tmp_dir = tmp_path_factory.mktemp("session_data")
+    save_file = tmp_dir / "session.json"
+
+    cards = [Card("Front1", "Back1"), Card("Front2", "Back2")]
+    strategy = MasteryStrategy(threshold=10)
+    session = CardSession(cards, strategy)
+    for correct in [True, True, False]:
+        card = session.get_next_card()
+        feedback = strategy.create_feedback()
+        feedback.data["correct"] = correct
+        strategy.process_feedback(card, feedback)
+
+    session.save_progress(save_file)
+    loaded_session = CardSession.load_progress(save_file)
+
+    assert loaded_session.get_statistics() == session.get_statistics()
+    assert loaded_session.strategy.statistics == strategy.statistics
+
+
+def test_card_session_saves_one_card_per_line(tmp_path_factory):
+    """Test that sessions are saved as compact JSON with a line per card."""
+    save_file = tmp_path_factory.mktemp("session_data") / "session.json"
+    cards = [Card("ب\n]", "baa"), Card("ت", "taa"), Card("ث", "thaa")]
+    CardSession(cards, MasteryStrategy()).save_progress(save_file)
+
+    lines = save_file.read_text(encoding="utf-8").splitlines()
+    assert lines[0].endswith('"cards":[')
+    assert lines[1:] == [
+        '{"front":"ب\\n]","back":"baa","statistics":{}},',
+        '{"front":"ت","back":"taa","statistics":{}},',
+        '{"front":"ث","back":"thaa","statistics":{}}',
+        "]}}",
+    ]
+    saved = json.loads(save_file.read_text(encoding="utf-8"))
+    assert [card["front"] for card in saved["session"]["cards"]] == ["ب\n]", "ت", "ث"]
+    assert CardSession.load_progress(save_file).cards == cards
+
+
+@pytest.mark.parametrize(
+    ("name", "compression", "magic"),
+    [
+        ("session.json.gz", None, b"\x1f\x8b"),
+        ("session.json.xz", None, b"\xfd7zXZ\x00"),
+        ("session.json", "gzip", b"\x1f\x8b"),
+        ("session.json", "lzma", b"\xfd7zXZ\x00"),
+    ],
+)
+def test_card_session_save_and_load_compressed(
+    tmp_path_factory, name: str, compression: str | None, magic: bytes
+):
+    """Test that sessions are compressed by extension or on request and load back."""
+    save_file = tmp_path_factory.mktemp("session_data") / name
+    cards = [Card(f"Front{i}", f"Back{i}") for i in range(10)]
+    strategy = MasteryStrategy(threshold=3)
+    strategy.index = 4
+    CardSession(cards, strategy).save_progress(save_file, compression=compression)
+
+    loaded_session = CardSession.load_progress(save_file)
+
+    assert save_file.read_bytes().startswith(magic)
+    assert loaded_session.cards == cards
+    assert isinstance(loaded_session.strategy, MasteryStrategy)
+    assert loaded_session.strategy.index == 4
+
+
+def test_card_session_load_reads_indented_sessions(tmp_path_factory):
+    """Test that sessions saved as indented JSON by earlier versions still load."""
+    save_file = tmp_path_factory.mktemp("session_data") / "session.json"
+    cards = [Card("Front1", "Back1"), Card("Front2", "Back2")]
+    session = CardSession(cards, SequentialStrategy())
+    save_file.write_text(json.dumps(session.progress_data(), indent=4))
+
+    assert CardSession.load_progress(save_file).cards == cards
+
+
+def test_card_session_load_refuses_truncated_sessions(tmp_path_factory):
+    """Test that a session file cut short among its cards fails to load."""
+    save_file = tmp_path_factory.mktemp("session_data") / "session.json"
+    cards = [Card(f"Front{i}", f"Back{i}") for i in range(3)]
+    CardSession(cards, SequentialStrategy()).save_progress(save_file)
+    save_file.write_text("\n".join(save_file.read_text().splitlines()[:-2]))
+
+    with pytest.raises(ValueError, match="ends before its last card"):
+        CardSession.load_progress(save_file)
+
+
+def test_card_session_save_refuses_unknown_compression(tmp_path_factory):
+    """Test that an unsupported compression is refused without writing a file."""
+    save_file = tmp_path_factory.mktemp("session_data") / "session.json"
+    session = CardSession([Card("Front1", "Back1")], SequentialStrategy())
+
+    with pytest.raises(ValueError, match="Unsupported compression: zip"):
+        session.save_progress(save_file, compression="zip")
+    assert not save_file.exists()
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX file modes")
+def test_saved_session_gets_the_mode_of_the_current_umask(tmp_path_factory):
+    """Test that a saved session is created with the umask in effect when it is saved."""
+    save_file = tmp_path_factory.mktemp("session_data") / "session.json"
+    session = CardSession([Card("Front1", "Back1")], SequentialStrategy())
+    umask = os.umask(0o027)
+    try:
+        session.save_progress(save_file)
+    finally:
+        os.umask(umask)
+
+    assert stat.S_IMODE(save_file.stat().st_mode) == 0o640
+    assert [path.name for path in save_file.parent.iterdir()] == ["session.json"]